@@ -4,7 +4,7 @@ from PyInstaller.utils.hooks import copy_metadata
 
 datas = [('D:\\Projects\\PDF_Korean_OCR\\app.py', '.')]
 binaries = []
-hiddenimports = ['datetime.datetime', 'os', 'streamlit', 'utils.ocr_processor.hybrid_extract', 'utils.ocr_processor.pdfplumber_extract']
+hiddenimports = ['datetime.datetime', 'os', 'streamlit', 'utils.ocr_processor.hybrid_extract', 'utils.ocr_processor.pdfplumber_extract', 'utils.ocr_model']
 datas += copy_metadata('streamlit')
 tmp_ret = collect_all('streamlit')
 datas += tmp_ret[0]; binaries += tmp_ret[1]; hiddenimports += tmp_ret[2]
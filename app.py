@@ -1,16 +1,30 @@
 import os
 import json
+import time
+import uuid
+import asyncio
+from contextlib import aclosing
 from datetime import datetime
 import streamlit as st
-import fitz  # PyMuPDF
-import pdfplumber
 
 # Firestore 연동
 import firebase_admin
 from firebase_admin import credentials, firestore
 
 # OpenAI (Azure)
-from openai import AzureOpenAI
+from openai import AzureOpenAI, AsyncAzureOpenAI
+
+from utils.extract_cache import ExtractionCache, bytes_sha256
+from utils.pdf_source import open_fitz, open_plumber
+from utils.render import release_plumber_page
+from utils.layout import page_layout
+from utils.ocr_processor import hybrid_extract_async
+from utils.firestore_uploader import upload_document, sync_document, delete_document
+from utils.firestore_browser import DocumentBrowser
+from utils.ai_analyzer import analyze_pages
+from utils.metrics import REGISTRY, stage, record_document
+from utils.jobs import JobManager
+from utils.search_index import SearchIndex
 
 # --- 기본 설정 ---
 st.set_page_config(page_title="PDF 텍스트 추출기", layout="wide")
@@ -18,11 +32,152 @@ st.title("📄 PDF 텍스트 추출기 (페이지별 JSON 변환)")
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+
+# --- 추출 결과 캐시 (같은 PDF 재업로드 시 재추출 생략) ---
+@st.cache_resource
+def get_extract_cache():
+    return ExtractionCache(os.path.join(BASE_DIR, "output", "cache"))
+
+
+extract_cache = get_extract_cache()
+
+
+# --- 전문 검색 색인 (Firestore에 저장한 문서를 페이지 단위로 색인) ---
+@st.cache_resource
+def get_search_index():
+    return SearchIndex(os.path.join(BASE_DIR, "output", "search"))
+
+
+search_index = get_search_index()
+
+
+# --- 백그라운드 추출 작업 (서버 프로세스 전체에서 공유, 동시 실행 수 제한) ---
+# 두 작업이 동시에 돌아도 동시 호출이 안 되는 OCR 엔진(PaddleOCR)은 ocr_images 안에서 한 번에 하나씩 실행
+@st.cache_resource
+def get_job_manager():
+    return JobManager(max_workers=2)
+
+
+job_manager = get_job_manager()
+
+
+def get_query_param(name):
+    if hasattr(st, "query_params"):  # streamlit >= 1.30
+        return st.query_params.get(name)
+    values = st.experimental_get_query_params().get(name)
+    return values[0] if values else None
+
+
+def set_query_params(**params):
+    if hasattr(st, "query_params"):
+        for key, value in params.items():
+            st.query_params[key] = value
+    else:
+        current = st.experimental_get_query_params()
+        current.update({key: [value] for key, value in params.items()})
+        st.experimental_set_query_params(**current)
+
+
+def result_doc_name(json_path):
+    """
+    결과 JSON 경로({파일명}_text_result_{타임스탬프}.json) → (파일명, 타임스탬프)
+    - 새로고침 후 URL에서 복원한 작업은 업로드 위젯 / 세션 타임스탬프가 비어 있으므로 결과 경로에서 문서 이름을 구함
+    """
+    stem = os.path.splitext(os.path.basename(json_path))[0]
+    base, _, stamp = stem.rpartition("_text_result_")
+    return (base, stamp) if base else (stem, "")
+
+
+def run_text_extraction(ctx, pdf_bytes, pdf_name, json_path, method, layout=False):
+    """
+    백그라운드 스레드에서 실행되는 텍스트 추출 작업 (Streamlit API 호출 금지)
+    - 업로드된 PDF는 임시 파일 없이 메모리에서 바로 열어서 처리
+    - 페이지마다 ctx.progress()로 진행률 보고 / 취소 요청 확인
+    - layout=True (PyMuPDF): 다단 / 표를 읽기 순서로 재구성하고 페이지별 layout 기록
+    """
+    timings = {}
+    cache_method = f"app-{method}+layout" if layout else f"app-{method}"
+    with stage(timings, "cache"):
+        pdf_hash = bytes_sha256(pdf_bytes)
+        cached = extract_cache.get_document(pdf_hash, cache_method, None, None)
+    result = {"pdf_path": pdf_name, "pages": cached["pages"] if cached else []}
+    if not cached:
+        with stage(timings, "text"):
+            if method == "PyMuPDF":
+                doc = open_fitz(pdf_bytes)
+                try:
+                    for i, page in enumerate(doc):
+                        if layout:
+                            text, page_layout_info = page_layout(page)
+                            result["pages"].append({"page_number": i+1, "char_count": len(text), "text": text,
+                                                    "layout": page_layout_info})
+                        else:
+                            text = page.get_text()
+                            result["pages"].append({"page_number": i+1, "char_count": len(text), "text": text.strip()})
+                        ctx.progress(i + 1, doc.page_count)
+                finally:
+                    doc.close()
+            else:
+                with open_plumber(pdf_bytes) as doc:
+                    for i, page in enumerate(doc.pages):
+                        text = page.extract_text() or ""
+                        result["pages"].append({"page_number": i+1, "char_count": len(text), "text": text})
+                        release_plumber_page(page)
+                        ctx.progress(i + 1, len(doc.pages))
+
+        with stage(timings, "cache"):
+            extract_cache.put_document(pdf_hash, cache_method, None, None, result)
+    else:
+        ctx.progress(len(result["pages"]), len(result["pages"]))
+
+    with stage(timings, "serialize"):
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    record_document(timings, cache_method)
+    return {"json_path": json_path, "pages": len(result["pages"]), "timings": timings, "cached": bool(cached)}
+
+
+def run_hybrid_extraction(ctx, pdf_bytes, pdf_name, json_path, layout=False):
+    """
+    백그라운드 스레드에서 실행되는 텍스트 + OCR 추출 작업 (렌더링 / OCR / 기록 단계 파이프라인)
+    - 페이지가 끝날 때마다 ctx.publish()로 올려서 화면에서 완료된 페이지부터 볼 수 있음
+    """
+    with open_fitz(pdf_bytes) as doc:
+        total = doc.page_count
+    image_dir = os.path.join(os.path.dirname(json_path), "images")
+
+    async def run():
+        done = 0
+        pages = hybrid_extract_async(pdf_bytes, image_dir, json_path, pdf_name=pdf_name, cache=extract_cache,
+                                     pipeline=True, layout=layout, triage=True, timings=True)
+        # 취소(JobCancelled)로 순회를 빠져나가면 바로 닫아서 추출 스레드도 중단
+        async with aclosing(pages):
+            async for page_info in pages:
+                done += 1
+                ctx.publish({k: page_info.get(k) for k in ("page_number", "extraction_method", "text")})
+                ctx.progress(done, total)
+
+    asyncio.run(run())
+    with open(json_path, "r", encoding="utf-8") as f:
+        timings = json.load(f).get("timings", {})
+    return {"json_path": json_path, "pages": total, "timings": timings.get("stages", {}), "cached": False}
+
+
 # --- 세션 초기화 ---
-for k, v in {"timestamp": None, "json_path": None}.items():
+for k, v in {"timestamp": None, "json_path": None, "last_timings": None,
+             "job_id": None, "job_applied": None}.items():
     if k not in st.session_state:
         st.session_state[k] = v
 
+# 새로고침 / 재접속 후에도 작업을 다시 찾을 수 있도록 클라이언트 id와 보고 있는 작업 id를 URL에 보관
+client_id = get_query_param("client")
+if not client_id:
+    client_id = uuid.uuid4().hex[:12]
+    set_query_params(client=client_id)
+if st.session_state.job_id is None:
+    st.session_state.job_id = get_query_param("job")
+
 # --- Firestore 초기화 ---
 if "firebase_app" not in st.session_state:
     try:
@@ -41,6 +196,15 @@ if "firebase_app" not in st.session_state:
 else:
     db = firestore.client()
 
+
+# --- Firestore 문서 목록 캐시 (재실행 간 공유, 업로드/삭제 시 무효화) ---
+@st.cache_resource
+def get_document_browser(_db):
+    return DocumentBrowser(_db, collection="pdf_texts", page_size=20, ttl=300)
+
+
+browser = get_document_browser(db) if db else None
+
 # --- OpenAI API 설정 ---
 try:
     openai_client = AzureOpenAI(
@@ -49,6 +213,13 @@ try:
         azure_endpoint=st.secrets["azure_openai"]["endpoint"]
     )
     openai_deployment = st.secrets["azure_openai"]["deployment"]
+
+    def make_async_openai_client():
+        return AsyncAzureOpenAI(
+            api_key=st.secrets["azure_openai"]["api_key"],
+            api_version=st.secrets["azure_openai"]["api_version"],
+            azure_endpoint=st.secrets["azure_openai"]["endpoint"]
+        )
 except Exception as e:
     openai_client = None
     openai_deployment = None
@@ -56,7 +227,8 @@ except Exception as e:
 
 # --- 파일 업로드 ---
 uploaded_file = st.file_uploader("PDF 파일을 업로드하세요", type=["pdf"])
-extract_method = st.selectbox("텍스트 추출 방식 선택", ["PyMuPDF", "pdfplumber"])
+extract_method = st.selectbox("텍스트 추출 방식 선택", ["PyMuPDF", "pdfplumber", "PyMuPDF + OCR"])
+layout_mode = extract_method != "pdfplumber" and st.checkbox("🧭 다단 / 표 읽기 순서 복원 (구조화 추출)", value=False)
 
 # --- 텍스트 추출 실행 ---
 if uploaded_file:
@@ -64,71 +236,154 @@ if uploaded_file:
         st.session_state.timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
 
     filename_base = os.path.splitext(uploaded_file.name)[0]
-    temp_pdf = os.path.join(BASE_DIR, f"temp_{st.session_state.timestamp}.pdf")
     json_path = os.path.join(BASE_DIR, "output", f"{filename_base}_text_result_{st.session_state.timestamp}.json")
     os.makedirs(os.path.dirname(json_path), exist_ok=True)
 
-    with open(temp_pdf, "wb") as f:
-        f.write(uploaded_file.getbuffer())
-
     if st.button("🚀 텍스트 추출 실행"):
-        try:
-            result = {"pdf_path": temp_pdf, "pages": []}
-            if extract_method == "PyMuPDF":
-                doc = fitz.open(temp_pdf)
-                result["pages"] = [
-                    {"page_number": i+1, "char_count": len(page.get_text()), "text": page.get_text().strip()}
-                    for i, page in enumerate(doc)
-                ]
-                doc.close()
-            else:
-                doc = pdfplumber.open(temp_pdf)
-                result["pages"] = [
-                    {"page_number": i+1, "char_count": len(text := (page.extract_text() or "")), "text": text}
-                    for i, page in enumerate(doc.pages)
-                ]
-                doc.close()
-
-            with open(json_path, "w", encoding="utf-8") as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
+        # 추출은 백그라운드 작업으로 넘기고 바로 반환 (재실행 / 다른 조작과 무관하게 계속 진행)
+        if extract_method == "PyMuPDF + OCR":
+            st.session_state.job_id = job_manager.submit(
+                uploaded_file.name, run_hybrid_extraction,
+                uploaded_file.getvalue(), uploaded_file.name, json_path, layout_mode, owner=client_id,
+            )
+        else:
+            st.session_state.job_id = job_manager.submit(
+                uploaded_file.name, run_text_extraction,
+                uploaded_file.getvalue(), uploaded_file.name, json_path, extract_method, layout_mode,
+                owner=client_id,
+            )
+        st.session_state.job_applied = None
+        set_query_params(job=st.session_state.job_id)
 
-            st.success("✅ 완료! 결과 JSON 생성됨.")
-            with open(json_path, "rb") as f:
-                st.download_button("📥 결과 JSON 다운로드", f, file_name=os.path.basename(json_path), mime="application/json")
-            st.session_state.json_path = json_path
+# --- 추출 작업 상태 (완료될 때까지 주기적으로 갱신) ---
+poll_jobs = False
+job = job_manager.status(st.session_state.job_id) if st.session_state.job_id else None
+if job:
+    if job["status"] in ("queued", "running"):
+        poll_jobs = True
+        done, total = job["done"], job["total"]
+        label = "대기 중…" if job["status"] == "queued" else f"페이지 추출 {done}/{total or '?'}"
+        st.progress(done / total if total else 0.0, text=f"⏳ {job['name']} - {label}")
+        finished_pages = job_manager.partial(job["id"])
+        if finished_pages:
+            with st.expander(f"📄 완료된 페이지 ({len(finished_pages)})", expanded=False):
+                for page in finished_pages[-5:]:
+                    st.markdown(f"**페이지 {page['page_number']}** · {page['extraction_method']}")
+                    st.text((page["text"] or "")[:300])
+        if st.button("⏹ 추출 취소"):
+            job_manager.cancel(job["id"])
+            st.experimental_rerun()
+    elif job["status"] == "done":
+        result = job_manager.result(job["id"])
+        # 완료 결과는 한 번만 세션에 반영
+        if st.session_state.job_applied != job["id"]:
+            st.session_state.job_applied = job["id"]
+            st.session_state.json_path = result["json_path"]
+            st.session_state.last_timings = {"pages": result["pages"], "stages": result["timings"]}
+        if result["cached"]:
+            st.caption("⚡ 캐시된 추출 결과 사용")
+        st.success("✅ 완료! 결과 JSON 생성됨.")
+        if os.path.exists(result["json_path"]):
+            with open(result["json_path"], "rb") as f:
+                st.download_button("📥 결과 JSON 다운로드", f, file_name=os.path.basename(result["json_path"]), mime="application/json")
+    elif job["status"] == "cancelled":
+        st.warning(f"⏹ 추출 취소됨 ({job['done']}/{job['total'] or '?'} 페이지)")
+    else:
+        st.error(f"❌ 실패: {job['error']}")
 
-        except Exception as e:
-            st.error(f"❌ 실패: {e}")
+# --- 이 클라이언트의 다른 작업 (새로고침 전에 실행한 작업으로 전환) ---
+other_jobs = [j for j in job_manager.list(owner=client_id) if j["id"] != st.session_state.job_id]
+if other_jobs:
+    with st.expander(f"🗂 이전 추출 작업 ({len(other_jobs)})", expanded=False):
+        for other in other_jobs[:10]:
+            cols = st.columns([5, 1])
+            cols[0].markdown(f"`{other['status']}` {other['name']} ({other['done']}/{other['total'] or '?'} 페이지)")
+            if cols[1].button("보기", key=f"job_{other['id']}"):
+                st.session_state.job_id = other["id"]
+                st.session_state.job_applied = None
+                set_query_params(job=other["id"])
+                st.experimental_rerun()
 
 # --- Firestore 저장 기능 ---
 if st.session_state.json_path and db:
     st.info("💾 JSON을 Firestore에 저장할 수 있습니다.")
+    # 동기화 모드: 파일 이름으로 된 문서 하나에 개정본을 덮어쓰되 바뀐 페이지만 씀
+    sync_mode = st.toggle("🔁 같은 파일명 문서에 변경된 페이지만 동기화", value=False)
     if st.button("📤 Firestore에 저장"):
         try:
             with open(st.session_state.json_path, "r", encoding="utf-8") as f:
                 json_data = json.load(f)
-            doc_name = f"{filename_base}_{st.session_state.timestamp}"
-            db.collection("pdf_texts").document(doc_name).set(json_data)
+            doc_base, doc_stamp = result_doc_name(st.session_state.json_path)
+            doc_name = doc_base if sync_mode or not doc_stamp else f"{doc_base}_{doc_stamp}"
+            progress_bar = st.progress(0.0, text="페이지 업로드 중…")
+            stats = (sync_document if sync_mode else upload_document)(
+                db, doc_name, json_data,
+                progress=lambda done, total: progress_bar.progress(done / max(total, 1), text=f"페이지 업로드 {done}/{total}"),
+            )
+            browser.invalidate(doc_name)
+            title = job["name"] if job else (uploaded_file.name if uploaded_file else None)
+            search_index.add_document(doc_name, json_data, title=title)
             st.success(f"✅ Firestore 저장 완료: {doc_name}")
+            st.caption(f"{stats['pages']}페이지 · {stats['batches']}배치 · {stats['seconds']}초 · "
+                       f"{stats['pages_per_sec']} pages/s · 재시도 {stats['retries']}회")
+            if stats.get("mode") == "sync":
+                st.caption(f"🔁 변경 {stats['pages_written']} · 삭제 {stats['pages_deleted']} · "
+                           f"유지 {stats['pages_unchanged']}페이지 → 쓰기 {stats['writes_saved']}회 / "
+                           f"{stats['bytes_saved'] / 1024:.1f} KB 절약")
+            if st.session_state.last_timings:
+                st.session_state.last_timings["stages"]["firestore"] = stats["seconds"]
         except Exception as e:
             st.error(f"Firestore 저장 실패: {e}")
 
+# --- 단계별 처리 시간 (최근 실행) ---
+if st.session_state.last_timings:
+    with st.expander("⏱ 단계별 처리 시간 (최근 실행)"):
+        stages = st.session_state.last_timings["stages"]
+        total = sum(stages.values())
+        st.markdown(f"**페이지**: `{st.session_state.last_timings['pages']}`  **합계**: `{total:.3f}초`")
+        st.bar_chart({"stage": list(stages), "seconds": list(stages.values())}, x="stage", y="seconds")
+        st.table([
+            {"단계": name, "초": round(seconds, 4), "비율": f"{seconds / total:.0%}" if total else "-"}
+            for name, seconds in stages.items()
+        ])
+        st.download_button("📈 메트릭 내보내기 (Prometheus)", data=REGISTRY.render_prometheus(),
+                           file_name="pdf_extract_metrics.prom", mime="text/plain")
+
+# --- 전문 검색 ---
+st.markdown("---")
+st.subheader("🔎 문서 검색 (페이지 단위)")
+search_query = st.text_input("검색어", placeholder="예: 공동수급체 운영협약서")
+if search_query:
+    started = time.perf_counter()
+    hits = search_index.search(search_query, limit=20)
+    st.caption(f"{len(hits)}건 · {(time.perf_counter() - started) * 1000:.0f} ms")
+    for hit in hits:
+        st.markdown(f"**{hit['doc_id']}** · {hit['page_number']}페이지 · 점수 `{hit['score']}`  \n{hit['snippet']}")
+
 # --- Firestore 문서 목록 ---
 if db:
     st.markdown("---")
     st.subheader("📂 Firestore 문서 테이블 (문서 삭제 / 저장 / AI 분석)")
+    if "list_page" not in st.session_state:
+        st.session_state.list_page = 0
     try:
-        docs = db.collection("pdf_texts").stream()
-        doc_list = [(i+1, doc.id, doc.to_dict()) for i, doc in enumerate(docs)]
+        rows, has_next = browser.list_page(st.session_state.list_page)
 
-        if doc_list:
-            for i, doc_id, data in doc_list:
-                total_chars = sum(p["char_count"] for p in data.get("pages", []))
+        if rows:
+            for doc_id, summary in rows:
+                total_chars = summary.get("total_chars", "?")
                 with st.expander(f"📄 문서 미리보기 ({doc_id})"):
-                    st.markdown(f"**글자수**: `{total_chars}`  ")
-                    for page in data.get("pages", []):
-                        st.markdown(f"**📄 Page {page['page_number']}**")
-                        st.code(page['text'][:1000] + ("..." if len(page['text']) > 1000 else ""), language="text")
+                    st.markdown(f"**글자수**: `{total_chars}`  **페이지**: `{summary.get('page_count', '?')}`")
+                    if summary.get("preview"):
+                        st.caption(summary["preview"])
+                    # 본문은 펼쳐 보기를 선택했을 때만 Firestore에서 읽어옴
+                    if st.toggle("📖 전체 페이지 보기", key=f"show_pages_{doc_id}"):
+                        pages = browser.load_pages(doc_id, summary)
+                        for page in pages:
+                            st.markdown(f"**📄 Page {page['page_number']}**")
+                            st.code(page['text'][:1000] + ("..." if len(page['text']) > 1000 else ""), language="text")
+                        json_string = json.dumps({"doc_id": doc_id, **summary, "pages": pages}, ensure_ascii=False, indent=2)
+                        st.download_button("💾 저장", data=json_string, file_name=f"{doc_id}.json", mime="application/json", key=f"download_{doc_id}")
 
                 with st.expander("🧠 AI 분석"):
                     if not openai_client:
@@ -137,36 +392,45 @@ if db:
                         prompt = st.text_area(f"✍️ 프롬프트 입력", key=f"prompt_{doc_id}")
                         if st.button("🚀 분석 실행", key=f"run_analysis_{doc_id}"):
                             try:
-                                full_text = "\n".join([p["text"] for p in data["pages"]])
-                                response = openai_client.chat.completions.create(
-                                    messages=[
-                                        {"role": "system", "content": "You are an assistant that summarizes PDF contents."},
-                                        {"role": "user", "content": f"{prompt}\n---\n{full_text[:8000]}"}
-                                    ],
-                                    model=openai_deployment,
-                                    max_tokens=1000,
-                                    temperature=0.7,
-                                    top_p=1.0
+                                pages = browser.load_pages(doc_id, summary)
+                                progress_bar = st.progress(0.0, text="부분별 분석 중…")
+                                analysis = analyze_pages(
+                                    make_async_openai_client, openai_deployment, pages, prompt,
+                                    chunk_tokens=6000, concurrency=4, max_tokens=1000, temperature=0.7,
+                                    cache=extract_cache,
+                                    progress=lambda done, total: progress_bar.progress(done / total, text=f"부분별 분석 {done}/{total}"),
                                 )
-                                summary = response.choices[0].message.content
-                                st.success("✅ 분석 완료")
-                                st.markdown(summary)
+                                st.success("✅ 분석 완료" + (" (캐시)" if analysis["cached"] else f" ({analysis['chunks']}개 부분, 요청 {analysis['calls']}회)"))
+                                st.markdown(analysis["summary"])
                             except Exception as e:
                                 st.error(f"요약 실패: {e}")
 
-                cols = st.columns([1, 1])
-                with cols[0]:
-                    if st.button("🗑 삭제", key=f"delete_{doc_id}"):
-                        db.collection("pdf_texts").document(doc_id).delete()
-                        st.success(f"❌ `{doc_id}` 삭제 완료")
-                        st.experimental_rerun()
+                if st.button("🗑 삭제", key=f"delete_{doc_id}"):
+                    delete_document(db, doc_id)
+                    browser.invalidate(doc_id)
+                    search_index.remove_document(doc_id)
+                    st.success(f"❌ `{doc_id}` 삭제 완료")
+                    st.experimental_rerun()
 
-                with cols[1]:
-                    json_string = json.dumps(data, ensure_ascii=False, indent=2)
-                    st.download_button("💾 저장", data=json_string, file_name=f"{doc_id}.json", mime="application/json", key=f"download_{doc_id}")
+            nav = st.columns([1, 1, 4])
+            with nav[0]:
+                if st.button("⬅ 이전", disabled=st.session_state.list_page == 0):
+                    st.session_state.list_page -= 1
+                    st.experimental_rerun()
+            with nav[1]:
+                if st.button("다음 ➡", disabled=not has_next):
+                    st.session_state.list_page += 1
+                    st.experimental_rerun()
+            with nav[2]:
+                st.caption(f"{st.session_state.list_page + 1} 페이지")
 
         else:
             st.info("❗ Firestore에 저장된 문서가 없습니다.")
 
     except Exception as e:
         st.error(f"문서 로딩 실패: {e}")
+
+# --- 추출 작업이 진행 중이면 잠시 후 다시 그려서 진행률 갱신 ---
+if poll_jobs:
+    time.sleep(1.0)
+    st.experimental_rerun()
@@ -0,0 +1,169 @@
+"""
+벤치마크용 합성 한글 PDF 생성기 (PyMuPDF만 사용, 같은 seed면 같은 내용)
+
+    python -m benchmarks.generate_corpus --out benchmarks/corpus --long-pages 500
+"""
+import os
+import random
+import argparse
+
+import numpy as np
+import fitz  # PyMuPDF
+
+KOREAN_FONT = "korea"  # PyMuPDF 내장 CJK 글꼴
+
+WORDS = [
+    "공동수급체", "운영협약서", "발주자", "수급인", "계약금액", "공사기간", "하자보수", "보증금",
+    "설계변경", "준공검사", "기성금", "지체상금", "안전관리", "품질관리", "현장대리인", "하도급",
+    "구성원", "출자비율", "분담내용", "대표사", "협약", "해지", "정산", "검수", "시공", "감리",
+    "가덕도신공항", "건설사업", "기본계획", "요약본", "활주로", "터미널", "접근도로", "공정표",
+    "제1조", "제2조", "제3조", "목적", "정의", "적용범위", "의무", "권리", "책임", "손해배상",
+]
+
+PAGE_WIDTH, PAGE_HEIGHT = fitz.paper_size("a4")
+MARGIN = 56
+
+
+def _sentence(rng, min_words=6, max_words=14):
+    words = rng.choices(WORDS, k=rng.randint(min_words, max_words))
+    return " ".join(words) + rng.choice([".", "다.", "한다.", "으로 한다."])
+
+
+def _write_text(page, rng, rect, fontsize):
+    """
+    rect 안에 한글 문장을 줄 단위로 채움
+    """
+    y = rect.y0 + fontsize
+    line_height = fontsize * 1.6
+    while y < rect.y1:
+        page.insert_text((rect.x0, y), _sentence(rng)[: int(rect.width / fontsize)],
+                         fontname=KOREAN_FONT, fontsize=fontsize)
+        y += line_height
+
+
+def add_text_page(doc, rng, fontsize=None):
+    page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+    fontsize = fontsize or rng.choice([9, 10, 11, 12])
+    _write_text(page, rng, fitz.Rect(MARGIN, MARGIN, PAGE_WIDTH - MARGIN, PAGE_HEIGHT - MARGIN), fontsize)
+    return page
+
+
+def _scan_image(rng, width_pt, height_pt, dpi=150, fontsize=11, angle=0.6):
+    """
+    텍스트를 그린 임시 페이지를 약간 기울여 흑백으로 렌더링하고 잡음을 넣은 '스캔' 이미지 (PNG 바이트)
+    """
+    src = fitz.open()
+    page = src.new_page(width=width_pt, height=height_pt)
+    _write_text(page, rng, fitz.Rect(12, 12, width_pt - 12, height_pt - 12), fontsize)
+    page.draw_rect(fitz.Rect(6, 6, width_pt - 6, height_pt - 6), color=(0, 0, 0), width=1)
+    pix = page.get_pixmap(matrix=fitz.Matrix(dpi / 72, dpi / 72).prerotate(angle), colorspace=fitz.csGRAY)
+    src.close()
+
+    noise_rng = np.random.default_rng(rng.randrange(2 ** 32))
+    gray = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width).astype(np.int16)
+    gray = np.clip(gray - 20 + noise_rng.normal(0, 12, gray.shape), 0, 255).astype(np.uint8)
+    noisy = fitz.Pixmap(fitz.csGRAY, pix.width, pix.height, gray.tobytes(), False)
+    return noisy.tobytes("png")
+
+
+def add_scanned_page(doc, rng):
+    page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+    page.insert_image(page.rect, stream=_scan_image(rng, PAGE_WIDTH, PAGE_HEIGHT))
+    return page
+
+
+def scanned_document(path, pages, seed=42, unique_scans=10):
+    """
+    스캔 이미지 페이지 pages장짜리 문서 (메모리 벤치마크용, 이미 있으면 재사용)
+    - 생성 시간을 줄이기 위해 스캔 이미지 unique_scans장을 돌려가며 사용
+    """
+    if os.path.exists(path):
+        return path
+    rng = random.Random(seed)
+    scans = [_scan_image(rng, PAGE_WIDTH, PAGE_HEIGHT) for _ in range(min(unique_scans, pages))]
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        page.insert_image(page.rect, stream=scans[i % len(scans)])
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    return _save(doc, path)
+
+
+def add_mixed_page(doc, rng):
+    """
+    위쪽은 텍스트 레이어, 아래쪽 절반은 스캔된 표 이미지
+    """
+    page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+    split = PAGE_HEIGHT * 0.45
+    _write_text(page, rng, fitz.Rect(MARGIN, MARGIN, PAGE_WIDTH - MARGIN, split), 11)
+    table_rect = fitz.Rect(MARGIN, split + 20, PAGE_WIDTH - MARGIN, PAGE_HEIGHT - MARGIN)
+    page.insert_image(table_rect, stream=_scan_image(rng, table_rect.width, table_rect.height))
+    return page
+
+
+def add_blank_page(doc):
+    return doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+
+
+def _save(doc, path):
+    doc.set_metadata({
+        "title": os.path.splitext(os.path.basename(path))[0],
+        "producer": "pdf-json-firestore-uploader benchmarks",
+        "creationDate": "D:20250101000000",
+        "modDate": "D:20250101000000",
+    })
+    doc.save(path, garbage=3, deflate=True, no_new_id=True)
+    doc.close()
+    return path
+
+
+def generate_corpus(out_dir, seed=42, long_pages=300):
+    """
+    코퍼스 생성 후 {이름: 경로} 반환
+    - text: 텍스트 레이어 페이지 20장
+    - scanned: 스캔 이미지 페이지 10장
+    - mixed: 텍스트 / 스캔 / 혼합 페이지 12장 + 빈 페이지 2장
+    - long: 텍스트 레이어 페이지 long_pages장
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    rng = random.Random(seed)
+    corpus = {}
+
+    doc = fitz.open()
+    for _ in range(20):
+        add_text_page(doc, rng)
+    corpus["text"] = _save(doc, os.path.join(out_dir, "text_20p.pdf"))
+
+    doc = fitz.open()
+    for _ in range(10):
+        add_scanned_page(doc, rng)
+    corpus["scanned"] = _save(doc, os.path.join(out_dir, "scanned_10p.pdf"))
+
+    doc = fitz.open()
+    for i in range(12):
+        [add_text_page, add_scanned_page, add_mixed_page][i % 3](doc, rng)
+        if i % 6 == 5:
+            add_blank_page(doc)
+    corpus["mixed"] = _save(doc, os.path.join(out_dir, "mixed_14p.pdf"))
+
+    doc = fitz.open()
+    for _ in range(long_pages):
+        add_text_page(doc, rng)
+    corpus["long"] = _save(doc, os.path.join(out_dir, f"long_{long_pages}p.pdf"))
+
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 한글 PDF 벤치마크 코퍼스 생성")
+    parser.add_argument("--out", default=os.path.join(os.path.dirname(__file__), "corpus"))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--long-pages", type=int, default=300)
+    args = parser.parse_args()
+
+    for name, path in generate_corpus(args.out, args.seed, args.long_pages).items():
+        print(f"{name}: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+문서 길이별 래스터화 메모리 벤치마크 (peak RSS가 페이지 수와 관계없이 일정한지 확인)
+
+    python -m benchmarks.memory_benchmark
+    python -m benchmarks.memory_benchmark --pages 10 100 500 --paths stream plumber --legacy
+
+- stream: pdf_to_images (페이지 단위 렌더링 → 저장 → 해제)
+- plumber: pdfplumber_extract (OCR 스텁, 페이지 캐시 해제 확인용)
+- legacy: 기존 방식 convert_from_path (전체 페이지를 한 번에 디코딩, pdf2image + poppler 필요)
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import multiprocessing
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from benchmarks.run_benchmark import _peak_rss_mb, _stub_ocr_images
+
+PATHS = ["stream", "plumber", "legacy"]
+
+
+def _run_case(path, pdf_path, dpi, queue):
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            started = time.perf_counter()
+            if path == "stream":
+                from utils.ocr_processor import pdf_to_images
+                pages = len(pdf_to_images(pdf_path, tmp, dpi=dpi))
+            elif path == "plumber":
+                from utils import ocr_processor
+                ocr_processor.ocr_images = _stub_ocr_images
+                out = os.path.join(tmp, "result.json")
+                ocr_processor.pdfplumber_extract(pdf_path, os.path.join(tmp, "images"), out, dpi=dpi)
+                with open(out, encoding="utf-8") as f:
+                    pages = json.load(f)["total_pages"]
+            else:
+                from pdf2image import convert_from_path
+                images = convert_from_path(pdf_path, dpi=dpi)
+                for idx, img in enumerate(images):
+                    img.save(os.path.join(tmp, f"page_{idx+1}.jpg"), "JPEG")
+                pages = len(images)
+            elapsed = time.perf_counter() - started
+        queue.put({"pages": pages, "seconds": round(elapsed, 3), "peak_rss_mb": _peak_rss_mb()})
+    except Exception as e:
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def run_case(path, pdf_path, dpi):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_run_case, args=(path, pdf_path, dpi, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    from benchmarks.generate_corpus import scanned_document
+
+    parser = argparse.ArgumentParser(description="문서 길이별 래스터화 peak RSS 측정")
+    parser.add_argument("--corpus-dir", default=os.path.join(BASE_DIR, "benchmarks", "corpus"))
+    parser.add_argument("--pages", nargs="+", type=int, default=[10, 50, 200])
+    parser.add_argument("--paths", nargs="+", default=["stream", "plumber"], choices=PATHS)
+    parser.add_argument("--legacy", action="store_true", help="비교용으로 convert_from_path 방식도 측정")
+    parser.add_argument("--dpi", type=int, default=200)
+    args = parser.parse_args()
+
+    paths = list(args.paths) + (["legacy"] if args.legacy and "legacy" not in args.paths else [])
+    for path in paths:
+        rss = []
+        for pages in args.pages:
+            pdf_path = scanned_document(os.path.join(args.corpus_dir, f"scanned_{pages}p.pdf"), pages)
+            result = run_case(path, pdf_path, args.dpi)
+            if "error" in result:
+                print(f"[에러] {path:<8} {pages:>5}p {result['error']}")
+                continue
+            rss.append(result["peak_rss_mb"] or 0)
+            print(f"{path:<8} {pages:>5}p {result['seconds']:8.2f}s  RSS {result['peak_rss_mb'] or 0:7.1f} MB")
+        if len(rss) > 1:
+            print(f"{path:<8} RSS 변화 (최소 → 최대): {min(rss):.1f} → {max(rss):.1f} MB ({max(rss) - min(rss):+.1f} MB)\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+OCR 엔진별 벤치마크 (같은 페이지 이미지로 엔진 / 스레드 설정 비교)
+
+    python -m benchmarks.ocr_benchmark --engines paddle onnx onnx-int8 --onnx-model-dir models/ko
+    python -m benchmarks.ocr_benchmark --engines onnx --onnx-model-dir models/ko --intra-op-threads 4 --inter-op-threads 1
+
+- 페이지는 한 번만 렌더링해 .npy로 저장하고, 엔진마다 별도 프로세스에서 같은 파일을 읽어 OCR
+- 첫 번째 엔진의 결과를 기준으로 페이지별 텍스트 일치율(difflib)을 함께 출력
+"""
+import os
+import sys
+import time
+import difflib
+import argparse
+import tempfile
+import multiprocessing
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from benchmarks.run_benchmark import _peak_rss_mb
+
+ENGINES = ["paddle", "onnx", "onnx-int8"]
+
+
+def engine_options(name, args):
+    options = {"engine": "onnx" if name.startswith("onnx") else "paddle"}
+    if options["engine"] == "onnx":
+        options["model_dir"] = args.onnx_model_dir
+        options["int8"] = name == "onnx-int8"
+    if args.intra_op_threads:
+        options["intra_op_threads"] = args.intra_op_threads
+    if args.inter_op_threads:
+        options["inter_op_threads"] = args.inter_op_threads
+    return options
+
+
+def _run_engine(options, page_files, batch_size, queue):
+    try:
+        from utils.ocr_engines import configure_engine, get_engine
+
+        configure_engine(**options)
+        started = time.perf_counter()
+        engine = get_engine()
+        warm_up = engine.warm_up()
+        load = time.perf_counter() - started - warm_up
+
+        images = [np.load(path) for path in page_files]
+        texts = []
+        lines = 0
+        started = time.perf_counter()
+        for i in range(0, len(images), batch_size):
+            for page_lines in engine.ocr_pages(images[i:i + batch_size]):
+                texts.append(" ".join(line.text for line in page_lines))
+                lines += len(page_lines)
+        elapsed = time.perf_counter() - started
+        queue.put({
+            "load": round(load, 3),
+            "warm_up": round(warm_up, 3),
+            "seconds": round(elapsed, 3),
+            "pages_per_sec": round(len(images) / elapsed, 2) if elapsed else None,
+            "lines": lines,
+            "peak_rss_mb": _peak_rss_mb(),
+            "texts": texts,
+        })
+    except Exception as e:
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def run_engine(options, page_files, batch_size):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_run_engine, args=(options, page_files, batch_size, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def render_pages(pdf_paths, out_dir, dpi, max_pages):
+    """
+    벤치마크 대상 페이지를 한 번만 렌더링해 .npy 파일 목록 반환
+    """
+    from utils.render import iter_page_images
+
+    files = []
+    for pdf_path in pdf_paths:
+        for page_number, image in iter_page_images(pdf_path, dpi):
+            if len(files) >= max_pages:
+                return files
+            path = os.path.join(out_dir, f"{os.path.basename(pdf_path)}_{page_number}.npy")
+            np.save(path, np.asarray(image))
+            files.append(path)
+    return files
+
+
+def main():
+    from benchmarks.generate_corpus import generate_corpus
+
+    parser = argparse.ArgumentParser(description="OCR 엔진 벤치마크")
+    parser.add_argument("--corpus-dir", default=os.path.join(BASE_DIR, "benchmarks", "corpus"))
+    parser.add_argument("--corpus", nargs="+", default=["scanned", "mixed"])
+    parser.add_argument("--engines", nargs="+", default=["paddle"], choices=ENGINES)
+    parser.add_argument("--onnx-model-dir", default=None, help="det.onnx / rec.onnx / dict.txt (+ cls.onnx) 디렉터리")
+    parser.add_argument("--intra-op-threads", type=int, default=None)
+    parser.add_argument("--inter-op-threads", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=4, help="ocr_pages() 한 번에 넘길 페이지 수")
+    parser.add_argument("--pages", type=int, default=20, help="최대 페이지 수")
+    parser.add_argument("--dpi", type=int, default=200)
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.corpus_dir, long_pages=10)
+    with tempfile.TemporaryDirectory() as tmp:
+        page_files = render_pages([corpus[name] for name in args.corpus], tmp, args.dpi, args.pages)
+        print(f"페이지 {len(page_files)}장 ({', '.join(args.corpus)}, {args.dpi} DPI)")
+
+        baseline = None
+        for name in args.engines:
+            result = run_engine(engine_options(name, args), page_files, args.batch_size)
+            if "error" in result:
+                print(f"[에러] {name:<10} {result['error']}")
+                continue
+            agreement = ""
+            if baseline is None:
+                baseline = result["texts"]
+            else:
+                ratio = np.mean([difflib.SequenceMatcher(None, a, b).ratio() for a, b in zip(baseline, result["texts"])])
+                agreement = f"  일치율 {ratio:.1%}"
+            print(f"{name:<10} {result['pages_per_sec']:7.2f} pages/s  로드 {result['load']:.2f}s  "
+                  f"워밍업 {result['warm_up']:.2f}s  {result['lines']}줄  RSS {result['peak_rss_mb'] or 0:7.1f} MB{agreement}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+추출 경로별 처리량 벤치마크
+
+    python -m benchmarks.run_benchmark --stub-ocr
+    python -m benchmarks.run_benchmark --paths hybrid_extract --corpus mixed scanned
+    python -m benchmarks.run_benchmark --stub-ocr --compare benchmarks/results/<이전 결과>.json
+    python -m benchmarks.run_benchmark --stub-ocr --stub-ocr-ms 150 --paths hybrid_extract hybrid_pipeline --corpus scanned
+
+- 케이스마다 별도 프로세스에서 실행해 peak RSS를 분리 측정
+- --stub-ocr는 --workers N 의 병렬 워커에도 적용 (워커 초기화 때 스텁으로 교체)
+- 결과는 커밋 해시가 들어간 JSON 파일로 저장해 커밋 간 비교
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import subprocess
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+PATHS = ["pymupdf_text", "pdfplumber_text", "hybrid_extract", "hybrid_pipeline", "pdfplumber_extract"]
+STUB_OCR_SECONDS = 0.0
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / 1024 / 1024
+        except Exception:
+            return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def _registry_stages():
+    """
+    utils.metrics 에 기록된 단계별 시간 합계 (병렬 워커의 페이지 시간도 부모 프로세스에서 집계됨)
+    """
+    from utils.metrics import REGISTRY
+
+    stages = {}
+    for series in REGISTRY.snapshot()["histograms"].get("pdf_stage_seconds", []):
+        name = series["labels"]["stage"]
+        stages[name] = stages.get(name, 0.0) + series["sum"]
+    return stages
+
+
+def _stub_ocr_images(images):
+    # OCR 엔진 대신 이미지마다 고정된 한 줄을 반환 (STUB_OCR_SECONDS만큼 GIL을 놓고 대기해 OCR 지연을 흉내)
+    from utils.ocr_engines import OcrLine
+
+    time.sleep(STUB_OCR_SECONDS * len(images))
+    return [[OcrLine([[0, 0], [10, 0], [10, 10], [0, 10]], "스텁", 0.99)] for _ in images]
+
+
+def _init_stub_worker(ocr_options, engine_options, stub_seconds):
+    # 병렬 워커도 스텁 OCR을 쓰도록 워커 초기화 때 교체 (spawn 워커는 모듈을 새로 임포트하므로)
+    global STUB_OCR_SECONDS
+    from utils import ocr_processor
+
+    ocr_processor._init_worker(ocr_options, engine_options)
+    ocr_processor.ocr_images = _stub_ocr_images
+    STUB_OCR_SECONDS = stub_seconds
+
+
+def _stub_pool(workers):
+    """
+    --stub-ocr --workers N 용 프로세스 풀 (ocr_processor.make_process_pool과 같되 워커에서 스텁 OCR 사용)
+    """
+    from utils.ocr_model import current_config
+    from utils.ocr_engines import current_engine_config
+
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=_init_stub_worker,
+                               initargs=(current_config(), current_engine_config(), STUB_OCR_SECONDS))
+
+
+def _run_text_only(path, pdf_path, stages):
+    """
+    app.py의 텍스트 전용 추출 경로와 같은 방식
+    """
+    import fitz
+    import pdfplumber
+
+    pages = 0
+    started = time.perf_counter()
+    if path == "pymupdf_text":
+        doc = fitz.open(pdf_path)
+        result = [{"page_number": i + 1, "text": page.get_text().strip()} for i, page in enumerate(doc)]
+        doc.close()
+    else:
+        doc = pdfplumber.open(pdf_path)
+        result = [{"page_number": i + 1, "text": page.extract_text() or ""} for i, page in enumerate(doc.pages)]
+        doc.close()
+    stages["text"] = time.perf_counter() - started
+    pages = len(result)
+
+    started = time.perf_counter()
+    json.dumps(result, ensure_ascii=False, indent=2)
+    stages["serialize"] = time.perf_counter() - started
+    return pages, 0
+
+
+def _run_case(path, pdf_path, options, queue):
+    global STUB_OCR_SECONDS
+    stages = {}
+    try:
+        if path in ("pymupdf_text", "pdfplumber_text"):
+            started = time.perf_counter()
+            pages, ocr_pages = _run_text_only(path, pdf_path, stages)
+        else:
+            from utils import ocr_processor
+
+            if options["stub_ocr"]:
+                ocr_processor.ocr_images = _stub_ocr_images
+                STUB_OCR_SECONDS = options["stub_ocr_ms"] / 1000
+
+            extra = {}
+            if path == "hybrid_pipeline":
+                path, extra = "hybrid_extract", {"pipeline": True, "ocr_workers": options["ocr_workers"]}
+            extract = getattr(ocr_processor, path)
+            executor = _stub_pool(options["workers"]) if options["stub_ocr"] and options["workers"] > 1 else None
+            try:
+                with tempfile.TemporaryDirectory() as tmp:
+                    started = time.perf_counter()
+                    _, ocr_pages = extract(
+                        pdf_path, os.path.join(tmp, "images"), os.path.join(tmp, "result.json"),
+                        min_chars=options["min_chars"], dpi=options["dpi"], workers=options["workers"],
+                        executor=executor, **extra,
+                    )
+                    with open(os.path.join(tmp, "result.json"), encoding="utf-8") as f:
+                        pages = json.load(f)["total_pages"]
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+            stages = _registry_stages()
+
+        elapsed = time.perf_counter() - started
+        queue.put({
+            "pages": pages,
+            "ocr_pages": ocr_pages,
+            "seconds": round(elapsed, 4),
+            "pages_per_sec": round(pages / elapsed, 2) if elapsed else None,
+            "peak_rss_mb": _peak_rss_mb(),
+            "stages": {k: round(v, 4) for k, v in stages.items()},
+        })
+    except Exception as e:
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def run_case(path, pdf_path, options):
+    """
+    새 프로세스에서 한 케이스 실행 (peak RSS가 다른 케이스에 섞이지 않도록)
+    """
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_run_case, args=(path, pdf_path, options, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(baseline, current):
+    """
+    두 결과 파일의 같은 케이스끼리 pages/sec와 peak RSS 변화 출력
+    """
+    old = {(c["corpus"], c["path"]): c for c in baseline["cases"]}
+    print(f"\n비교: {baseline['commit']} → {current['commit']}")
+    for case in current["cases"]:
+        prev = old.get((case["corpus"], case["path"]))
+        if not prev or "error" in prev or "error" in case:
+            continue
+        speed = case["pages_per_sec"] / prev["pages_per_sec"] if prev["pages_per_sec"] else float("nan")
+        rss = (case["peak_rss_mb"] or 0) - (prev["peak_rss_mb"] or 0)
+        print(f"  {case['corpus']:>8} {case['path']:<20} x{speed:5.2f} pages/s, RSS {rss:+.1f} MB")
+
+
+def main():
+    from benchmarks.generate_corpus import generate_corpus
+
+    parser = argparse.ArgumentParser(description="PDF 추출 벤치마크")
+    parser.add_argument("--corpus-dir", default=os.path.join(BASE_DIR, "benchmarks", "corpus"))
+    parser.add_argument("--corpus", nargs="+", default=["text", "scanned", "mixed", "long"])
+    parser.add_argument("--paths", nargs="+", default=PATHS, choices=PATHS)
+    parser.add_argument("--long-pages", type=int, default=300)
+    parser.add_argument("--stub-ocr", action="store_true", help="OCR 엔진 대신 고정 결과 사용 (모델 없이 파이프라인만 측정)")
+    parser.add_argument("--stub-ocr-ms", type=float, default=0.0, help="--stub-ocr 사용 시 페이지당 OCR 지연(ms)")
+    parser.add_argument("--ocr-workers", type=int, default=1, help="hybrid_pipeline의 OCR 단계 스레드 수")
+    parser.add_argument("--min-chars", type=int, default=20)
+    parser.add_argument("--dpi", default="200")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.corpus_dir, long_pages=args.long_pages)
+    options = {
+        "stub_ocr": args.stub_ocr,
+        "stub_ocr_ms": args.stub_ocr_ms,
+        "ocr_workers": args.ocr_workers,
+        "min_chars": args.min_chars,
+        "dpi": args.dpi if args.dpi == "auto" else int(args.dpi),
+        "workers": args.workers,
+    }
+
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now().strftime("%Y%m%d%H%M%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "options": options,
+        "cases": [],
+    }
+
+    for name in args.corpus:
+        for path in args.paths:
+            result = run_case(path, corpus[name], options)
+            report["cases"].append({"corpus": name, "path": path, **result})
+            if "error" in result:
+                print(f"[에러] {name:>8} {path:<20} {result['error']}")
+            else:
+                stages = ", ".join(f"{k} {v:.2f}s" for k, v in result["stages"].items())
+                print(f"{name:>8} {path:<20} {result['pages_per_sec']:8.1f} pages/s  "
+                      f"RSS {result['peak_rss_mb'] or 0:7.1f} MB  ({stages})")
+
+    output = args.output or os.path.join(BASE_DIR, "benchmarks", "results", f"{report['timestamp']}_{commit}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""
+PDF 일괄 추출 CLI (Streamlit 없이 디렉터리 / glob 단위로 처리)
+
+    python main.py archive/ --out output/batch --method hybrid --workers 8
+    python main.py "archive/**/*.pdf" --method text
+    python main.py inbox/ --out output/batch --watch --interval 10
+"""
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils.ocr_processor import hybrid_extract, pdfplumber_extract, text_extract, make_process_pool
+from utils.ocr_engines import ENGINES, configure_engine
+from utils.extract_cache import ExtractionCache
+from utils.search_index import SearchIndex
+
+METHODS = ["hybrid", "pdfplumber", "text", "text-pdfplumber"]
+
+
+def find_pdfs(inputs):
+    """
+    입력(파일 / 디렉터리 / glob 패턴)에서 PDF 목록을 (pdf 경로, 기준 디렉터리) 로 반환
+    - 기준 디렉터리는 출력 경로에서 하위 폴더 구조를 유지하는 데 사용
+    """
+    found = {}
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                for name in files:
+                    if name.lower().endswith(".pdf"):
+                        found.setdefault(os.path.join(root, name), item)
+        elif os.path.isfile(item):
+            found.setdefault(item, os.path.dirname(item))
+        else:
+            base = item.split("*", 1)[0]
+            base = base if os.path.isdir(base) else os.path.dirname(base)
+            for path in glob.glob(item, recursive=True):
+                if path.lower().endswith(".pdf") and os.path.isfile(path):
+                    found.setdefault(path, base)
+    return sorted(found.items())
+
+
+def output_path_for(pdf_path, base_dir, out_dir, method):
+    rel = os.path.relpath(pdf_path, base_dir or ".")
+    stem = os.path.splitext(rel)[0]
+    return os.path.join(out_dir, f"{stem}.{method}.json")
+
+
+def is_up_to_date(pdf_path, json_path):
+    return os.path.exists(json_path) and os.path.getmtime(json_path) >= os.path.getmtime(pdf_path)
+
+
+def count_result_pages(json_path):
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data.get("total_pages", len(data.get("pages", [])))
+
+
+def process_file(pdf_path, json_path, args, executor, cache):
+    """
+    한 문서 추출 후 (페이지 수, OCR 페이지 수) 반환
+    """
+    os.makedirs(os.path.dirname(json_path) or ".", exist_ok=True)
+    if args.method in ("text", "text-pdfplumber"):
+        text_extract(pdf_path, json_path, engine="PyMuPDF" if args.method == "text" else "pdfplumber",
+                     layout=args.layout)
+        return count_result_pages(json_path), 0
+
+    image_dir = os.path.join(os.path.dirname(json_path), "images", os.path.splitext(os.path.basename(json_path))[0])
+    common = dict(
+        min_chars=args.min_chars,
+        dpi=args.dpi,
+        workers=args.workers,
+        save_images=args.save_images,
+        cache=cache,
+        stream=args.stream,
+        executor=executor,
+        compact_ocr=args.compact_ocr,
+    )
+    if args.method == "hybrid":
+        _, ocr_pages = hybrid_extract(pdf_path, image_dir, json_path, ocr_mode=args.ocr_mode, layout=args.layout,
+                                      triage=args.triage, pipeline=args.pipeline, ocr_workers=args.ocr_workers,
+                                      queue_size=args.queue_size, **common)
+    else:
+        _, ocr_pages = pdfplumber_extract(pdf_path, image_dir, json_path, **common)
+    return count_result_pages(json_path), ocr_pages
+
+
+class BatchRunner:
+    """
+    문서 여러 개를 동시에 진행하면서 페이지 작업은 하나의 프로세스 풀을 공유
+    (각 문서의 페이지 순서는 hybrid_extract가 유지)
+    - 풀이 없으면(--workers 1) 문서 스레드들이 이 프로세스의 OCR 엔진을 공유하고,
+      동시 호출이 안 되는 엔진(PaddleOCR)은 ocr_images가 한 번에 하나씩 실행
+    """
+
+    def __init__(self, args):
+        self.args = args
+        self.executor = make_process_pool(args.workers) if args.workers > 1 and not args.method.startswith("text") else None
+        self.cache = ExtractionCache(args.cache_dir) if args.cache_dir else None
+        self.index = SearchIndex(args.index_dir) if args.index_dir else None
+        self.lock = threading.Lock()
+        self.stats = {"files": 0, "skipped": 0, "failed": 0, "pages": 0, "ocr_pages": 0}
+        self.failures = []
+        self.failed_mtimes = {}  # 실패한 PDF → 실패 당시 수정 시각 (watch에서 파일이 바뀔 때까지 재시도 안 함)
+        self.started = time.perf_counter()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+        if self.cache is not None:
+            self.cache.close()
+        if self.index is not None:
+            self.index.close()
+
+    def _run_one(self, index, total, pdf_path, json_path):
+        started = time.perf_counter()
+        try:
+            pages, ocr_pages = process_file(pdf_path, json_path, self.args, self.executor, self.cache)
+            if self.index is not None:
+                self.index.add_file(json_path, doc_id=os.path.splitext(os.path.relpath(json_path, self.args.out))[0])
+        except Exception as e:
+            with self.lock:
+                self.stats["failed"] += 1
+                self.failures.append((pdf_path, str(e)))
+                try:
+                    self.failed_mtimes[pdf_path] = os.path.getmtime(pdf_path)
+                except OSError:
+                    pass
+            print(f"[에러] [{index}/{total}] {pdf_path}: {e}", flush=True)
+            return
+
+        elapsed = time.perf_counter() - started
+        with self.lock:
+            self.failed_mtimes.pop(pdf_path, None)
+            self.stats["files"] += 1
+            self.stats["pages"] += pages
+            self.stats["ocr_pages"] += ocr_pages
+        print(f"[✅ {index}/{total}] {pdf_path} → {json_path} "
+              f"({pages}페이지, OCR {ocr_pages}, {elapsed:.1f}s, {pages / elapsed if elapsed else 0:.1f} pages/s)",
+              flush=True)
+
+    def run(self, pdfs):
+        """
+        (pdf 경로, 기준 디렉터리) 목록 처리 - 출력이 최신인 문서는 건너뜀
+        """
+        jobs = []
+        for pdf_path, base_dir in pdfs:
+            json_path = output_path_for(pdf_path, base_dir, self.args.out, self.args.method)
+            if not self.args.force and is_up_to_date(pdf_path, json_path):
+                self.stats["skipped"] += 1
+                continue
+            jobs.append((pdf_path, json_path))
+
+        total = len(jobs)
+        with ThreadPoolExecutor(max_workers=max(1, self.args.files_in_flight)) as threads:
+            futures = [
+                threads.submit(self._run_one, i + 1, total, pdf_path, json_path)
+                for i, (pdf_path, json_path) in enumerate(jobs)
+            ]
+            for future in as_completed(futures):
+                future.result()
+        return total
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        s = self.stats
+        print(f"\n처리 {s['files']}건 · 건너뜀 {s['skipped']}건 · 실패 {s['failed']}건 · "
+              f"{s['pages']}페이지 (OCR {s['ocr_pages']}) · {elapsed:.1f}s · "
+              f"{s['pages'] / elapsed if elapsed else 0:.1f} pages/s")
+        for pdf_path, error in self.failures:
+            print(f"  - {pdf_path}: {error}")
+
+
+def watch(runner, args):
+    """
+    입력 위치를 주기적으로 확인해 새로 들어온(또는 수정된) PDF 처리
+    - 크기가 두 번 연속 같을 때만 처리해서 복사 중인 파일은 건너뜀
+    - 처리에 실패한 파일은 수정 시각이 바뀔 때까지 다시 시도하지 않음
+    """
+    sizes = {}
+    print(f"👀 폴더 감시 중 ({args.interval}s 간격, Ctrl+C로 종료)", flush=True)
+    try:
+        while True:
+            ready = []
+            for pdf_path, base_dir in find_pdfs(args.inputs):
+                json_path = output_path_for(pdf_path, base_dir, args.out, args.method)
+                if is_up_to_date(pdf_path, json_path):
+                    continue
+                if runner.failed_mtimes.get(pdf_path) == os.path.getmtime(pdf_path):
+                    continue
+                size = os.path.getsize(pdf_path)
+                if sizes.get(pdf_path) == size:
+                    ready.append((pdf_path, base_dir))
+                sizes[pdf_path] = size
+            if ready:
+                runner.run(ready)
+                for pdf_path, _ in ready:
+                    sizes.pop(pdf_path, None)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\n감시 종료", flush=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="PDF 일괄 텍스트 / OCR 추출")
+    parser.add_argument("inputs", nargs="+", help="PDF 파일, 디렉터리 또는 glob 패턴 (예: 'archive/**/*.pdf')")
+    parser.add_argument("--out", default=os.path.join("output", "batch"), help="결과 JSON 디렉터리 (입력 폴더 구조 유지)")
+    parser.add_argument("--method", choices=METHODS, default="hybrid",
+                        help="hybrid: PyMuPDF+OCR, pdfplumber: pdfplumber+OCR, text / text-pdfplumber: 내장 텍스트만")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="페이지 처리 프로세스 수 (모든 문서가 공유)")
+    parser.add_argument("--files-in-flight", type=int, default=2, help="동시에 진행할 문서 수")
+    parser.add_argument("--min-chars", type=int, default=20)
+    parser.add_argument("--dpi", default="200", help="OCR 렌더링 DPI 또는 auto")
+    parser.add_argument("--ocr-mode", choices=["page", "region"], default="page")
+    parser.add_argument("--layout", action="store_true",
+                        help="구조화 추출: 다단 / 표를 읽기 순서로 재구성하고 줄 / 단 bbox 기록 (hybrid, text)")
+    parser.add_argument("--triage", action="store_true",
+                        help="렌더링 전 페이지 분류: 빈 페이지는 OCR 생략, 깨진 텍스트 레이어는 OCR (hybrid)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="렌더링 / OCR / 기록 단계를 겹쳐서 실행 (hybrid, 문서 하나에서도 OCR이 렌더링을 기다리지 않음)")
+    parser.add_argument("--ocr-workers", type=int, default=1, help="--pipeline OCR 단계 스레드 수 (onnx 엔진만 2 이상 적용)")
+    parser.add_argument("--queue-size", type=int, default=4, help="--pipeline 단계 사이 큐 크기 (앞서 렌더링해 둘 최대 페이지 수)")
+    parser.add_argument("--ocr-engine", choices=list(ENGINES), default="paddle")
+    parser.add_argument("--onnx-model-dir", default=None, help="--ocr-engine onnx: det.onnx / rec.onnx / dict.txt (+ cls.onnx) 디렉터리")
+    parser.add_argument("--int8", action="store_true", help="--ocr-engine onnx: 동적 int8 양자화 모델 사용")
+    parser.add_argument("--intra-op-threads", type=int, default=None, help="OCR 연산자 내부 스레드 수 (기본: 코어 수 / workers)")
+    parser.add_argument("--inter-op-threads", type=int, default=None, help="OCR 연산자 간 병렬 스레드 수 (onnx)")
+    parser.add_argument("--save-images", action="store_true", help="OCR 페이지 이미지를 디버깅용으로 저장")
+    parser.add_argument("--compact-ocr", action="store_true", help="OCR 박스 / 신뢰도를 압축 배열로 기록 (결과 JSON 크기 감소)")
+    parser.add_argument("--stream", action="store_true", help="페이지 단위 기록 (중단 후 재실행 시 이어서 처리)")
+    parser.add_argument("--cache-dir", default=None, help="추출 캐시 디렉터리")
+    parser.add_argument("--index-dir", default=None, help="처리한 결과를 전문 검색 색인에 추가 (utils.search_index)")
+    parser.add_argument("--force", action="store_true", help="출력이 최신이어도 다시 처리")
+    parser.add_argument("--watch", action="store_true", help="새 PDF가 들어올 때마다 처리")
+    parser.add_argument("--interval", type=float, default=5.0, help="--watch 확인 간격(초)")
+    args = parser.parse_args(argv)
+    if args.layout and args.method in ("pdfplumber", "text-pdfplumber"):
+        parser.error("--layout 은 PyMuPDF 방식(hybrid, text)에서만 사용할 수 있습니다")
+    if args.ocr_engine == "onnx" and not args.onnx_model_dir:
+        parser.error("--ocr-engine onnx 는 --onnx-model-dir 가 필요합니다")
+    if args.dpi != "auto":
+        try:
+            args.dpi = int(args.dpi)
+        except ValueError:
+            parser.error("--dpi 는 정수 또는 auto 여야 합니다")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    engine_options = {"intra_op_threads": args.intra_op_threads, "inter_op_threads": args.inter_op_threads}
+    if args.ocr_engine == "onnx":
+        engine_options.update(model_dir=args.onnx_model_dir, int8=args.int8)
+    configure_engine(args.ocr_engine, **{k: v for k, v in engine_options.items() if v is not None})
+    runner = BatchRunner(args)
+    try:
+        if args.watch:
+            watch(runner, args)
+        else:
+            pdfs = find_pdfs(args.inputs)
+            if not pdfs:
+                print("❗ 처리할 PDF가 없습니다.")
+                return 1
+            runner.run(pdfs)
+    finally:
+        runner.close()
+        runner.summary()
+    return 1 if runner.stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+import pytest
+
+from utils import ocr_processor
+from utils.ocr_engines import ENGINES, configure_engine
+from tests.helpers import CountingEngine, StubOcr
+
+
+@pytest.fixture
+def stub_ocr(monkeypatch):
+    stub = StubOcr()
+    monkeypatch.setattr(ocr_processor, "ocr_images", stub)
+    yield stub
+    configure_engine("paddle")
+
+
+@pytest.fixture
+def counting_engine(monkeypatch):
+    # 동시 호출이 안 되는 엔진으로 실제 ocr_images(엔진 잠금 포함) 경로를 그대로 사용
+    monkeypatch.setitem(ENGINES, "counting", CountingEngine)
+    CountingEngine.reset()
+    configure_engine("counting")
+    yield CountingEngine
+    configure_engine("paddle")
@@ -0,0 +1,81 @@
+import time
+import threading
+
+import fitz  # PyMuPDF
+
+from utils.ocr_engines import OcrEngine, OcrLine, current_engine_config
+
+A4_WIDTH, A4_HEIGHT = fitz.paper_size("a4")
+
+
+def _scan_png(text):
+    src = fitz.open()
+    page = src.new_page(width=A4_WIDTH, height=A4_HEIGHT)
+    page.insert_text((72, 100), text, fontsize=14)
+    png = page.get_pixmap(dpi=72).tobytes("png")
+    src.close()
+    return png
+
+
+def make_pdf(kinds):
+    """
+    kinds: 페이지별 "text" (텍스트 레이어) / "scan" (이미지만) / "mixed" (텍스트 + 이미지 영역) / "blank"
+    """
+    doc = fitz.open()
+    for i, kind in enumerate(kinds):
+        page = doc.new_page(width=A4_WIDTH, height=A4_HEIGHT)
+        if kind in ("text", "mixed"):
+            for line in range(4):
+                page.insert_text((72, 80 + line * 20), f"page {i + 1} text layer line {line}", fontsize=12)
+        if kind == "scan":
+            page.insert_image(page.rect, stream=_scan_png(f"scanned page {i + 1}"))
+        if kind == "mixed":
+            page.insert_image(fitz.Rect(72, 300, A4_WIDTH - 72, 600), stream=_scan_png(f"figure {i + 1}"))
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+class StubOcr:
+    """
+    실제 OCR 대신 현재 엔진 이름이 들어간 줄 하나를 반환 (호출된 이미지 수 기록)
+    """
+
+    def __init__(self):
+        self.images = 0
+
+    def __call__(self, images):
+        self.images += len(images)
+        engine = current_engine_config()["engine"]
+        return [[OcrLine([[10.0, 10.0], [90.0, 10.0], [90.0, 30.0], [10.0, 30.0]], f"ocr-{engine}", 0.99)]
+                for _ in images]
+
+
+class CountingEngine(OcrEngine):
+    """
+    동시 호출 수를 기록하는 가짜 엔진 (thread_safe=False, PaddleOCR처럼 동시 호출 불가)
+    """
+    name = "counting"
+    active = 0
+    max_active = 0
+    calls = 0
+    _guard = threading.Lock()
+
+    def __init__(self, **options):
+        self.options = options
+
+    @classmethod
+    def reset(cls):
+        cls.active = cls.max_active = cls.calls = 0
+
+    def ocr_pages(self, images):
+        cls = type(self)
+        with cls._guard:
+            cls.active += 1
+            cls.calls += 1
+            cls.max_active = max(cls.max_active, cls.active)
+        time.sleep(0.01)
+        with cls._guard:
+            cls.active -= 1
+        return [[OcrLine([[10.0, 10.0], [90.0, 10.0], [90.0, 30.0], [10.0, 30.0]], "ocr-counting", 0.99)]
+                for _ in images]
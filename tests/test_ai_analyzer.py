@@ -0,0 +1,60 @@
+import re
+import asyncio
+from types import SimpleNamespace
+
+from utils.ai_analyzer import REDUCE_INSTRUCTION, analyze_pages_async, chunk_pages, estimate_tokens
+
+
+class FakeClient:
+    """
+    chat.completions.create 호출마다 고정 길이 응답을 돌려주는 가짜 비동기 클라이언트
+    """
+
+    def __init__(self, reply_chars):
+        self.reply_chars = reply_chars
+        self.calls = 0
+        self.prompts = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, messages, **kwargs):
+        self.calls += 1
+        self.prompts.append(messages[-1]["content"])
+        content = "요" * self.reply_chars
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def _pages(count, chars=400):
+    return [{"page_number": i + 1, "text": "가" * chars} for i in range(count)]
+
+
+def test_chunks_respect_token_budget_and_page_ranges():
+    chunks = chunk_pages(_pages(10), max_tokens=1000)
+    assert all(estimate_tokens(chunk["text"]) <= 1000 for chunk in chunks)
+    assert chunks[0]["first_page"] == 1 and chunks[-1]["last_page"] == 10
+
+
+def test_reduce_terminates_when_partials_do_not_shrink(capsys):
+    # 응답이 예산의 절반을 넘으면 묶음 수가 줄지 않음 → 잘라서 한 번에 통합해야 끝남
+    client = FakeClient(reply_chars=700)
+    result = asyncio.run(asyncio.wait_for(
+        analyze_pages_async(client, "test", _pages(12), "요약", chunk_tokens=1000), timeout=10))
+    assert result["summary"] == "요" * 700
+    assert client.calls == result["chunks"] + 1
+    assert "생략" in capsys.readouterr().out
+
+
+def test_reduce_merges_in_rounds_when_replies_are_short():
+    client = FakeClient(reply_chars=50)
+    result = asyncio.run(analyze_pages_async(client, "test", _pages(40), "요약", chunk_tokens=1000))
+    assert result["chunks"] > 1
+    assert result["summary"] == "요" * 50
+
+
+def test_reduce_prompt_has_only_real_page_ranges():
+    client = FakeClient(reply_chars=50)
+    asyncio.run(analyze_pages_async(client, "test", _pages(40), "요약", chunk_tokens=1000))
+    reduce_prompts = [p for p in client.prompts if p.startswith(REDUCE_INSTRUCTION)]
+    assert reduce_prompts
+    # 첫 통합은 부분 결과에 붙은 [페이지 a-b] 범위를 그대로 받고, 부분 결과 번호로 만든 [페이지 N] 표시는 어디에도 없어야 함
+    assert re.search(r"^\[페이지 \d+-\d+\]$", reduce_prompts[0], re.MULTILINE)
+    assert not any(re.search(r"^\[페이지 \d+\]$", prompt, re.MULTILINE) for prompt in reduce_prompts)
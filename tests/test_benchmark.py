@@ -0,0 +1,33 @@
+import json
+
+from benchmarks.run_benchmark import _stub_pool, run_case
+from tests.helpers import make_pdf
+from utils.ocr_processor import hybrid_extract
+
+
+def _options(**overrides):
+    options = {"stub_ocr": True, "stub_ocr_ms": 0, "min_chars": 20, "dpi": 72, "workers": 2, "ocr_workers": 1}
+    options.update(overrides)
+    return options
+
+
+def test_stub_pool_workers_use_stub_ocr(tmp_path):
+    pdf_path = tmp_path / "scan.pdf"
+    pdf_path.write_bytes(make_pdf(["scan", "text", "scan", "scan"]))
+    executor = _stub_pool(2)
+    try:
+        hybrid_extract(str(pdf_path), str(tmp_path / "images"), str(tmp_path / "result.json"), dpi=72,
+                       workers=2, executor=executor)
+    finally:
+        executor.shutdown()
+    with open(tmp_path / "result.json", encoding="utf-8") as f:
+        pages = json.load(f)["pages"]
+    assert [page["text"] for page in pages.values() if page["extraction_method"] == "ocr"] == ["스텁"] * 3
+
+
+def test_parallel_stub_case_runs_without_ocr_engine(tmp_path):
+    pdf_path = tmp_path / "scan.pdf"
+    pdf_path.write_bytes(make_pdf(["scan", "text", "scan", "scan"]))
+    result = run_case("hybrid_extract", str(pdf_path), _options())
+    assert "error" not in result, result.get("error")
+    assert (result["pages"], result["ocr_pages"]) == (4, 3)
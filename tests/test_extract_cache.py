@@ -0,0 +1,55 @@
+import json
+
+from utils.extract_cache import ExtractionCache
+from utils.ocr_engines import configure_engine
+from utils.ocr_processor import hybrid_extract
+from tests.helpers import make_pdf
+
+
+def _texts(path):
+    with open(path, "r", encoding="utf-8") as f:
+        result = json.load(f)
+    return [page["text"] for page in result["pages"].values()]
+
+
+def test_cache_key_changes_with_engine(tmp_path, stub_ocr):
+    pdf = make_pdf(["scan", "text", "scan"])
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    out = str(tmp_path / "out.json")
+
+    hybrid_extract(pdf, str(tmp_path / "img"), out, cache=cache)
+    assert _texts(out)[0] == "ocr-paddle"
+
+    configure_engine("onnx", model_dir="models/ko", int8=True)
+    hybrid_extract(pdf, str(tmp_path / "img"), out, cache=cache)
+    assert _texts(out)[0] == "ocr-onnx"
+    assert stub_ocr.images == 4
+
+    # 스레드 수만 바뀌면 같은 결과이므로 캐시 적중
+    configure_engine("onnx", intra_op_threads=2)
+    hybrid_extract(pdf, str(tmp_path / "img"), out, cache=cache)
+    assert stub_ocr.images == 4
+
+    configure_engine("onnx", int8=False)
+    hybrid_extract(pdf, str(tmp_path / "img"), out, cache=cache)
+    assert stub_ocr.images == 6
+
+
+def test_cache_key_changes_with_render_options(tmp_path, stub_ocr):
+    pdf = make_pdf(["scan"])
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    out = str(tmp_path / "out.json")
+    hybrid_extract(pdf, str(tmp_path / "img"), out, cache=cache)
+    hybrid_extract(pdf, str(tmp_path / "img"), out, cache=cache, grayscale=True)
+    hybrid_extract(pdf, str(tmp_path / "img"), out, cache=cache, max_pixels=1_000_000)
+    assert stub_ocr.images == 3
+
+
+def test_stream_checkpoint_restarts_when_engine_changes(tmp_path, stub_ocr):
+    pdf = make_pdf(["scan", "scan"])
+    out = str(tmp_path / "out.json")
+    hybrid_extract(pdf, str(tmp_path / "img"), out, stream=True)
+    configure_engine("onnx")
+    hybrid_extract(pdf, str(tmp_path / "img"), out, stream=True)
+    assert _texts(out) == ["ocr-onnx", "ocr-onnx"]
+    assert stub_ocr.images == 4
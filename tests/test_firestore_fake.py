@@ -0,0 +1,40 @@
+import pytest
+
+from utils.firestore_fake import FakeFirestore, InvalidArgument
+
+
+def test_snapshot_get_follows_dotted_paths_and_raises_for_missing_fields():
+    db = FakeFirestore()
+    ref = db.collection("docs").document("a")
+    ref.set({"storage": "paged", "timings": {"total": 1.5}})
+    snap = ref.get()
+    assert snap.get("storage") == "paged"
+    assert snap.get("timings.total") == 1.5
+    with pytest.raises(KeyError):
+        snap.get("page_hashes")
+    with pytest.raises(KeyError):
+        snap.get("timings.missing")
+    assert db.collection("docs").document("missing").get().get("storage") is None
+
+
+def test_field_projection_drops_unselected_fields():
+    db = FakeFirestore()
+    ref = db.collection("docs").document("a")
+    ref.set({"storage": "paged", "preview": "text"})
+    snap = ref.get(field_paths=["storage"])
+    assert snap.to_dict() == {"storage": "paged"}
+    with pytest.raises(KeyError):
+        snap.get("preview")
+
+
+def test_nested_arrays_are_rejected():
+    db = FakeFirestore()
+    ref = db.collection("docs").document("a")
+    with pytest.raises(InvalidArgument):
+        ref.set({"regions": [{"ocr_data": [{"box": [[0, 0], [1, 1]]}]}]})
+    batch = db.batch()
+    batch.set(ref, {"box": [[0, 0]]})
+    with pytest.raises(InvalidArgument):
+        batch.commit()
+    assert not ref.get().exists
+    ref.set({"box": [0, 0, 1, 1], "lines": [{"box": [0, 0]}]})
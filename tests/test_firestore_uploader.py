@@ -0,0 +1,97 @@
+import json
+
+from utils.firestore_fake import FakeFirestore
+from utils.firestore_uploader import (PAGES_SUBCOLLECTION, build_metadata, load_document, sync_document,
+                                      upload_document)
+from utils.ocr_processor import hybrid_extract
+from tests.helpers import make_pdf
+
+
+def _result(texts):
+    return {
+        "pdf_path": "sample.pdf",
+        "total_pages": len(texts),
+        "pages": {
+            f"page_{i}": {"page_number": i, "extraction_method": "text", "text": text, "char_count": len(text)}
+            for i, text in enumerate(texts, start=1)
+        },
+    }
+
+
+def test_sync_legacy_inline_document_uploads_everything():
+    db = FakeFirestore()
+    legacy = _result(["a", "b"])
+    db.collection("pdf_texts").document("doc").set({"pdf_path": "sample.pdf", "pages": list(legacy["pages"].values())})
+
+    stats = sync_document(db, "doc", _result(["a", "b"]))
+    assert stats["mode"] == "full"
+    assert stats["pages_written"] == 2
+
+
+def test_sync_paged_document_without_page_hashes():
+    db = FakeFirestore()
+    upload_document(db, "doc", _result(["a", "b", "c"]))
+    # page_hashes 필드가 생기기 전에 업로드한 문서
+    metadata = build_metadata(_result(["a", "b", "c"]))
+    db.collection("pdf_texts").document("doc").set(metadata)
+    assert "page_hashes" not in db.collection("pdf_texts").document("doc").get().to_dict()
+
+    stats = sync_document(db, "doc", _result(["a", "B", "c"]))
+    assert stats["mode"] == "sync"
+    assert (stats["pages_written"], stats["pages_unchanged"]) == (1, 2)
+    assert [p["text"] for p in load_document(db, "doc")["pages"]] == ["a", "B", "c"]
+
+
+def test_sync_deletes_removed_pages():
+    db = FakeFirestore()
+    upload_document(db, "doc", _result(["a", "b", "c"]))
+    stats = sync_document(db, "doc", _result(["a", "b"]))
+    assert stats["pages_deleted"] == 1
+    pages = db.collection("pdf_texts").document("doc").collection(PAGES_SUBCOLLECTION).get()
+    assert [snap.id for snap in pages] == ["page_00001", "page_00002"]
+
+
+def _box(x, y):
+    return [[x, y], [x + 50.0, y], [x + 50.0, y + 10.0], [x, y + 10.0]]
+
+
+def test_region_ocr_boxes_round_trip():
+    db = FakeFirestore()
+    result = _result(["text"])
+    line = {"box": _box(10.0, 20.0), "text": "ocr", "confidence": 0.9}
+    result["pages"]["page_1"].update({
+        "extraction_method": "mixed",
+        "ocr_data": [line],
+        "regions": [{"bbox": [0.0, 0.0, 100.0, 100.0], "text": "ocr", "ocr_data": [line]}],
+    })
+    upload_document(db, "doc", result)
+
+    page = load_document(db, "doc")["pages"][0]
+    assert page["ocr_data"] == [line]
+    assert page["regions"][0]["ocr_data"] == [line]
+
+
+def test_sync_same_pdf_extracted_twice_writes_nothing(tmp_path, stub_ocr):
+    # 앱의 OCR 경로처럼 timings / triage / 이미지 저장을 켜서 두 번 따로 추출
+    pdf = make_pdf(["text", "scan", "blank", "mixed"])
+    results = []
+    for run in ("first", "second"):
+        out = tmp_path / f"{run}.json"
+        hybrid_extract(pdf, str(tmp_path / run / "images"), str(out), triage=True, timings=True, save_images=True)
+        results.append(json.loads(out.read_text(encoding="utf-8")))
+
+    db = FakeFirestore()
+    sync_document(db, "doc", results[0])
+    stats = sync_document(db, "doc", results[1])
+    assert stats["mode"] == "sync"
+    assert (stats["pages_written"], stats["pages_deleted"], stats["pages_unchanged"]) == (0, 0, 4)
+
+
+def test_upload_over_longer_document_deletes_extra_pages():
+    db = FakeFirestore()
+    upload_document(db, "doc", _result(["a", "b", "c"]))
+    stats = upload_document(db, "doc", _result(["x"]))
+    assert stats["pages_deleted"] == 2
+    assert [p["text"] for p in load_document(db, "doc")["pages"]] == ["x"]
+    pages = db.collection("pdf_texts").document("doc").collection(PAGES_SUBCOLLECTION).get()
+    assert [snap.id for snap in pages] == ["page_00001"]
@@ -0,0 +1,82 @@
+import numpy as np
+
+from utils.layout import build_layout, detect_columns, order_ocr_lines, reading_order
+from utils.ocr_engines import OcrLine
+
+LINE = 10
+PITCH = 20
+
+
+def _column(name, x, y, count, width=240):
+    return [((x, y + PITCH * i, x + width, y + PITCH * i + LINE), f"{name}{i}") for i in range(count)]
+
+
+def _table(y, rows, xs=(50, 200, 350, 480), width=80, skip=lambda r, c: False):
+    return [((x, y + PITCH * r, x + width, y + PITCH * r + LINE), f"r{r}c{c}")
+            for r in range(rows) for c, x in enumerate(xs) if not skip(r, c)]
+
+
+def _read(items):
+    text, layout, _ = build_layout([box for box, _ in items], [t for _, t in items])
+    return text.split("\n"), layout
+
+
+def _words(lines):
+    return " ".join(lines).split()
+
+
+def test_two_columns_read_left_then_right():
+    items = _column("R", 320, 50, 10) + _column("L", 50, 50, 10)
+    lines, layout = _read(items)
+    assert lines == [f"L{i}" for i in range(10)] + [f"R{i}" for i in range(10)]
+    assert len(layout["columns"]) == 1
+
+
+def test_full_width_title_before_columns():
+    items = [((50, 20, 560, 30), "title")] + _column("L", 50, 50, 8) + _column("R", 320, 50, 8)
+    lines, _ = _read(items)
+    assert lines[0] == "title"
+    assert lines[1:] == [f"L{i}" for i in range(8)] + [f"R{i}" for i in range(8)]
+
+
+def test_columns_keep_flowing_across_aligned_blank_lines():
+    # 두 단에 같은 높이의 빈 줄이 있어도 단 순서 유지
+    items = (_column("L", 50, 50, 6) + _column("L", 50, 220, 6) + _column("R", 320, 50, 6)
+             + _column("R", 320, 220, 6))
+    lines, _ = _read(items)
+    assert lines[:12] == [f"L{i}" for i in range(6)] * 2
+    assert lines[12:] == [f"R{i}" for i in range(6)] * 2
+
+
+def test_table_below_two_columns_reads_row_by_row():
+    items = _column("L", 50, 50, 10) + _column("R", 320, 50, 10) + _table(300, 4)
+    lines, _ = _read(items)
+    assert lines[:20] == [f"L{i}" for i in range(10)] + [f"R{i}" for i in range(10)]
+    assert lines[20:] == [" ".join(f"r{r}c{c}" for c in range(4)) for r in range(4)]
+
+
+def test_table_with_sparse_column_and_footer():
+    items = _table(100, 6, skip=lambda r, c: c == 3 and r % 3) + [((60, 780, 120, 790), "footer")]
+    lines, layout = _read(items)
+    assert _words(lines) == [t for _, t in items]
+    assert lines[-1] == "footer"
+    assert layout["columns"] == []
+
+
+def test_table_alone_has_no_gutters():
+    items = _table(100, 5)
+    assert len(detect_columns([box for box, _ in items])) == 0
+
+
+def test_explicit_gutters_and_ocr_quads():
+    boxes = np.array([box for box, _ in _column("L", 50, 50, 3) + _column("R", 320, 50, 3)], dtype=np.float64)
+    order, line_ids, column_ids = reading_order(boxes, gutters=[305.0])
+    assert order.tolist() == [0, 1, 2, 3, 4, 5]
+    assert column_ids.tolist() == [0, 0, 0, 1, 1, 1]
+    assert len(set(line_ids.tolist())) == 6
+
+    quads = [OcrLine([[x0, y0], [x1, y0], [x1, y1], [x0, y1]], f"w{i}", 0.9)
+             for i, (x0, y0, x1, y1) in enumerate(boxes.tolist())]
+    ordered, text, layout = order_ocr_lines(quads[::-1])
+    assert [line.text for line in ordered] == [f"w{i}" for i in range(6)]
+    assert text.split("\n") == [f"w{i}" for i in range(6)]
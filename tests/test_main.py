@@ -0,0 +1,82 @@
+import os
+
+import pytest
+
+import main
+from tests.helpers import make_pdf
+
+
+class _StopWatch(Exception):
+    pass
+
+
+def _run_watch(monkeypatch, args, runner, rounds, between=None):
+    # watch 루프를 rounds번 돌린 뒤 멈춤 (between(i)는 i번째 대기 때 호출)
+    calls = {"n": 0}
+
+    def fake_sleep(_):
+        calls["n"] += 1
+        if between is not None:
+            between(calls["n"])
+        if calls["n"] >= rounds:
+            raise _StopWatch
+
+    monkeypatch.setattr(main.time, "sleep", fake_sleep)
+    with pytest.raises(_StopWatch):
+        main.watch(runner, args)
+
+
+def test_watch_does_not_retry_failed_file_until_modified(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "in" / "broken.pdf"
+    pdf_path.parent.mkdir()
+    pdf_path.write_bytes(make_pdf(["text"]))
+    args = main.parse_args([str(pdf_path.parent), "--out", str(tmp_path / "out"), "--workers", "1",
+                            "--watch", "--interval", "0"])
+    attempts = []
+
+    def failing(pdf_path, json_path, args, executor, cache):
+        attempts.append(pdf_path)
+        raise RuntimeError("broken pdf")
+
+    monkeypatch.setattr(main, "process_file", failing)
+    runner = main.BatchRunner(args)
+
+    def touch(i):
+        if i == 5:
+            mtime = os.path.getmtime(pdf_path) + 10
+            os.utime(pdf_path, (mtime, mtime))
+
+    _run_watch(monkeypatch, args, runner, rounds=8, between=touch)
+    runner.close()
+    # 크기가 두 번 같아야 처리하므로 2번째 확인에서 한 번 실패, 수정 후 다시 한 번만 시도
+    assert len(attempts) == 2
+    assert runner.stats["failed"] == 2
+
+
+def test_watch_processes_file_once(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "in" / "ok.pdf"
+    pdf_path.parent.mkdir()
+    pdf_path.write_bytes(make_pdf(["text", "text"]))
+    args = main.parse_args([str(pdf_path.parent), "--out", str(tmp_path / "out"), "--method", "text",
+                            "--workers", "1", "--watch", "--interval", "0"])
+    runner = main.BatchRunner(args)
+    _run_watch(monkeypatch, args, runner, rounds=5)
+    runner.close()
+    assert runner.stats["files"] == 1
+    assert runner.stats["pages"] == 2
+    assert not runner.failed_mtimes
+
+
+def test_in_process_files_share_engine_one_call_at_a_time(tmp_path, counting_engine):
+    # --workers 1 이면 프로세스 풀 없이 문서 스레드들이 같은 엔진을 공유
+    inputs = tmp_path / "in"
+    inputs.mkdir()
+    for name in ("a", "b", "c"):
+        (inputs / f"{name}.pdf").write_bytes(make_pdf(["scan", "text", "scan", "scan"]))
+    args = main.parse_args([str(inputs), "--out", str(tmp_path / "out"), "--workers", "1", "--files-in-flight", "3"])
+    runner = main.BatchRunner(args)
+    assert runner.executor is None
+    runner.run(main.find_pdfs(args.inputs))
+    runner.close()
+    assert (runner.stats["files"], runner.stats["ocr_pages"]) == (3, 9)
+    assert counting_engine.max_active == 1
@@ -0,0 +1,130 @@
+import time
+import asyncio
+import threading
+
+import pytest
+
+from utils.ocr_processor import hybrid_extract, hybrid_extract_async
+from utils.pipeline import Pipeline, Stage, aiter_callback
+from tests.helpers import make_pdf
+
+
+def test_results_keep_input_order_with_parallel_workers():
+    def slow_square(x):
+        time.sleep(0.001 * (x % 3))
+        return x * x
+
+    pipeline = Pipeline([Stage("square", slow_square, workers=3), Stage("inc", lambda xs: [x + 1 for x in xs], batch=4)],
+                        queue_size=2)
+    assert list(pipeline.run(range(20))) == [x * x + 1 for x in range(20)]
+    assert pipeline.stats["square"]["items"] == 20
+
+
+def test_stage_error_is_raised_and_threads_stop():
+    def fail_on_five(x):
+        if x == 5:
+            raise ValueError("boom")
+        return x
+
+    before = threading.active_count()
+    with pytest.raises(ValueError, match="boom"):
+        list(Pipeline([Stage("check", fail_on_five, workers=2)]).run(range(100)))
+    assert threading.active_count() == before
+
+
+def test_closing_run_early_stops_feeding():
+    fed = []
+
+    def items():
+        for i in range(1000):
+            fed.append(i)
+            yield i
+
+    results = Pipeline([Stage("id", lambda x: x)], queue_size=2).run(items())
+    assert next(results) == 0
+    results.close()
+    assert len(fed) < 20
+
+
+def test_aiter_callback_yields_items_and_propagates_errors():
+    def produce(n, on_page=None, fail=False):
+        for i in range(n):
+            on_page(i)
+        if fail:
+            raise RuntimeError("failed")
+        return n
+
+    async def collect(**kwargs):
+        return [item async for item in aiter_callback(produce, 3, **kwargs)]
+
+    assert asyncio.run(collect()) == [0, 1, 2]
+    with pytest.raises(RuntimeError):
+        asyncio.run(collect(fail=True))
+
+
+class _SlowOcr:
+    def __init__(self, stub):
+        self.stub = stub
+
+    def __call__(self, images):
+        time.sleep(0.02)
+        return self.stub(images)
+
+
+@pytest.mark.parametrize("close", ["break", "aclose"])
+def test_async_early_exit_stops_rendering_and_ocr(tmp_path, stub_ocr, monkeypatch, close):
+    from utils import ocr_processor
+    monkeypatch.setattr(ocr_processor, "ocr_images", _SlowOcr(stub_ocr))
+    pdf = make_pdf(["scan"] * 30)
+
+    async def first_pages():
+        pages = hybrid_extract_async(pdf, str(tmp_path / "img"), str(tmp_path / "out.json"),
+                                     pipeline=True, queue_size=1, ocr_batch_size=1)
+        seen = []
+        if close == "break":
+            async for page_info in pages:
+                seen.append(page_info["page_number"])
+                if len(seen) == 2:
+                    break
+        else:
+            seen.append((await pages.__anext__())["page_number"])
+            seen.append((await pages.__anext__())["page_number"])
+            await pages.aclose()
+        await asyncio.sleep(0.5)
+        return seen
+
+    assert asyncio.run(first_pages()) == [1, 2]
+    # 큐에 미리 들어간 몇 페이지만 처리되고 나머지는 렌더링 / OCR 하지 않음
+    assert stub_ocr.images < 10
+
+
+def test_pipeline_result_matches_serial(tmp_path, stub_ocr):
+    pdf = make_pdf(["text", "scan", "blank", "scan", "text", "scan"])
+    serial = tmp_path / "serial.json"
+    piped = tmp_path / "piped.json"
+    _, serial_count = hybrid_extract(pdf, str(tmp_path / "img"), str(serial))
+    _, piped_count = hybrid_extract(pdf, str(tmp_path / "img"), str(piped), pipeline=True, ocr_workers=2)
+    assert serial_count == piped_count
+    assert serial.read_text(encoding="utf-8") == piped.read_text(encoding="utf-8")
+
+
+def test_concurrent_jobs_serialize_non_thread_safe_engine(tmp_path, counting_engine):
+    # 앱의 작업 관리자처럼 두 문서를 스레드 두 개에서 동시에 파이프라인 추출
+    pdf = make_pdf(["scan", "text", "scan", "scan", "scan", "scan"])
+    errors = []
+
+    def job(name):
+        try:
+            hybrid_extract(pdf, str(tmp_path / name / "img"), str(tmp_path / f"{name}.json"),
+                           pipeline=True, ocr_batch_size=1, triage=True, timings=True)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=job, args=(name,)) for name in ("a", "b")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert counting_engine.calls == 10
+    assert counting_engine.max_active == 1
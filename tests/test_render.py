@@ -0,0 +1,58 @@
+import numpy as np
+import fitz  # PyMuPDF
+
+from utils.render import FALLBACK_DPI, adaptive_dpi, choose_dpi, estimate_line_height, page_preview
+
+A4_WIDTH, A4_HEIGHT = fitz.paper_size("a4")
+
+
+def _text_page(doc, fontsize=11, border=False, ruled=False):
+    page = doc.new_page(width=A4_WIDTH, height=A4_HEIGHT)
+    y = 40 + fontsize
+    while y < A4_HEIGHT - 40:
+        page.insert_text((40, y), "Lorem ipsum dolor sit amet consectetur " * 2, fontsize=fontsize)
+        y += fontsize * 1.6
+    if border:
+        page.draw_rect(fitz.Rect(6, 6, A4_WIDTH - 6, A4_HEIGHT - 6), color=(0, 0, 0), width=1)
+    if ruled:
+        for x in (30, 300, A4_WIDTH - 30):
+            page.draw_line((x, 30), (x, A4_HEIGHT - 30), color=(0, 0, 0), width=1)
+    return page
+
+
+def _scan_page(doc, angle=0.6, **kwargs):
+    # 텍스트 페이지를 기울여 렌더링한 이미지만 들어 있는 '스캔' 페이지
+    src = fitz.open()
+    _text_page(src, **kwargs)
+    pix = src[0].get_pixmap(matrix=fitz.Matrix(150 / 72, 150 / 72).prerotate(angle), colorspace=fitz.csGRAY)
+    page = doc.new_page(width=A4_WIDTH, height=A4_HEIGHT)
+    page.insert_image(page.rect, stream=pix.tobytes("png"))
+    src.close()
+    return page
+
+
+def test_line_height_plain_text():
+    doc = fitz.open()
+    height = estimate_line_height(page_preview(_text_page(doc)))
+    assert 8 <= height <= 16
+
+
+def test_skewed_bordered_scan_keeps_text_line_height():
+    doc = fitz.open()
+    plain = estimate_line_height(page_preview(_scan_page(doc, border=False)))
+    bordered = estimate_line_height(page_preview(_scan_page(doc, border=True)))
+    assert bordered is not None and bordered <= 2 * plain
+    assert adaptive_dpi(doc[1]) >= FALLBACK_DPI - 20
+
+
+def test_skewed_ruled_scan_keeps_text_line_height():
+    doc = fitz.open()
+    height = estimate_line_height(page_preview(_scan_page(doc, border=True, ruled=True)))
+    assert height is not None and height < 20
+
+
+def test_implausible_line_height_falls_back():
+    gray = np.full((400, 300), 255, dtype=np.uint8)
+    gray[20:380, 20:280] = 0  # 글자가 아닌 큰 그림
+    assert estimate_line_height(gray) is None
+    assert choose_dpi(None) == FALLBACK_DPI
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from utils.ocr_pack import load_result
+from utils.ocr_processor import hybrid_extract
+from utils.regions import region_ocr_data
+from tests.helpers import make_pdf
+
+KINDS = ["text", "mixed", "scan", "blank", "mixed", "text"]
+
+
+def _load(path):
+    with open(path, "r", encoding="utf-8") as f:
+        result = json.load(f)
+    result.pop("timings", None)
+    return result
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"ocr_mode": "region"},
+    {"ocr_mode": "region", "layout": True, "triage": True},
+])
+def test_streaming_matches_in_memory_result(tmp_path, stub_ocr, options):
+    pdf = make_pdf(KINDS)
+    plain = str(tmp_path / "plain.json")
+    streamed = str(tmp_path / "streamed.json")
+    _, plain_count = hybrid_extract(pdf, str(tmp_path / "img"), plain, **options)
+    _, streamed_count = hybrid_extract(pdf, str(tmp_path / "img"), streamed, stream=True, **options)
+
+    assert streamed_count == plain_count
+    assert _load(streamed) == _load(plain)
+
+
+def test_region_mode_counts_mixed_pages(tmp_path, stub_ocr):
+    out = str(tmp_path / "out.json")
+    _, count = hybrid_extract(make_pdf(KINDS), str(tmp_path / "img"), out, ocr_mode="region", stream=True)
+    methods = [page["extraction_method"] for page in _load(out)["pages"].values()]
+    assert "mixed" in methods
+    assert count == sum(method in ("ocr", "mixed") for method in methods)
+
+
+def test_triage_result_is_identical_across_runs(tmp_path):
+    # 판정 시간 같은 실행마다 다른 값이 없어야 직렬 / 병렬 결과가 바이트 단위로 같음
+    pdf = make_pdf(["text", "blank", "text", "blank", "text", "text"])
+    serial = tmp_path / "serial.json"
+    parallel = tmp_path / "parallel.json"
+    hybrid_extract(pdf, str(tmp_path / "img"), str(serial), triage=True)
+    hybrid_extract(pdf, str(tmp_path / "img"), str(parallel), triage=True, workers=2)
+    assert serial.read_text(encoding="utf-8") == parallel.read_text(encoding="utf-8")
+    assert "blank" in [page["triage"]["decision"] for page in _load(serial)["pages"].values()]
+
+
+@pytest.mark.parametrize("compact_ocr", [False, True])
+def test_region_ocr_lines_are_stored_once(tmp_path, stub_ocr, compact_ocr):
+    out = str(tmp_path / "out.json")
+    hybrid_extract(make_pdf(KINDS), str(tmp_path / "img"), out, ocr_mode="region", compact_ocr=compact_ocr)
+    pages = load_result(out, lazy=False)["pages"].values()
+    mixed = [page for page in pages if page["extraction_method"] == "mixed"]
+    assert mixed
+    for page in mixed:
+        assert all("ocr_data" not in region and "ocr_packed" not in region for region in page["regions"])
+        lines = [line for region in page["regions"] for line in region_ocr_data(page, region)]
+        assert lines == page["ocr_data"]
+        assert [line["text"] for line in lines] == ["ocr-paddle"] * len(page["regions"])
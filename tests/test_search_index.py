@@ -0,0 +1,43 @@
+import pytest
+
+from utils.search_index import SearchIndex, _snippet, normalize, normalize_with_offsets, tokenize
+
+
+@pytest.mark.parametrize("text", [
+    "ＡＢＣ 전각 문자 ㈜한국 Ⅻ장 ﬁle",
+    "ｶﾞｷﾞ 반각 카나 ㎏",
+    "e\u0301te\u0301 결합 악센트",
+    "\u1100\u1161\u11a8 조합형 한글",
+])
+def test_offsets_cover_normalized_text(text):
+    normalized, starts, ends = normalize_with_offsets(text)
+    assert normalized == normalize(text)
+    assert len(starts) == len(ends) == len(normalized)
+    assert all(0 <= a < b <= len(text) for a, b in zip(starts, ends))
+
+
+def test_snippet_highlights_original_text_after_fullwidth_characters():
+    text = "（주）ＡＢＣ건설 " * 3 + "공동수급체 운영협약서 제1조"
+    snippet = _snippet(text, ["운영협약서"], [], width=5)
+    assert "**운영협약서**" in snippet
+    assert snippet.startswith("…")
+
+
+def test_snippet_maps_expanded_compatibility_characters():
+    text = "㈜한국 ㎏ 단위 ﬁle 검사"
+    assert "**ﬁle**" in _snippet(text, ["file"], [])
+    assert _snippet(text, ["(주)한국"], []).startswith("**㈜한국**")
+    assert "**㎏**" in _snippet(text, ["kg"], [])
+
+
+def test_search_returns_page_hits(tmp_path):
+    index = SearchIndex(str(tmp_path / "search"))
+    index.add_document("doc", {"pages": [
+        {"page_number": 1, "text": "ＡＢＣ 공동수급체 운영협약서"},
+        {"page_number": 2, "text": "하자보수 보증금"},
+    ]})
+    hits = index.search("운영협약")
+    assert [(hit["doc_id"], hit["page_number"]) for hit in hits] == [("doc", 1)]
+    assert "**운영협약**" in hits[0]["snippet"]
+    assert tokenize("운영협약서") == ["운영", "영협", "협약", "약서"]
+    index.close()
@@ -0,0 +1,26 @@
+import pytest
+
+from utils.triage import text_quality
+
+
+@pytest.mark.parametrize("text", [
+    "공동수급체 운영협약서 제1조 (목적) 본 협약은 …",
+    "本契約は、甲と乙の間で締結される業務委託に関する事項を定める。",
+    "ｶﾀｶﾅ ﾃｽﾄ ﾃﾞｰﾀ",
+    "Le délégué général présentera le rapport à l'assemblée, déjà approuvé.",
+    "Größe, Übergabe und Maßnahmen für Gewährleistung · Straße",
+    "Zażółć gęślą jaźń — Čeština, Łódź",
+])
+def test_normal_text_is_not_garbled(text):
+    quality = text_quality(text)
+    assert not quality["garbled"]
+    assert quality["valid_ratio"] > 0.9
+
+
+@pytest.mark.parametrize("text", [
+    "계약���서 �� 조항",
+    "丁七丂丄丅丆万丈三上下丌不与丏丐丑丒专且丕世丗丘丙",
+    "\ue000\ue001\ue002\ue003\ue004\ue005 abc",
+])
+def test_broken_text_is_garbled(text):
+    assert text_quality(text)["garbled"]
@@ -0,0 +1,232 @@
+import json
+import asyncio
+import hashlib
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken이 없으면 글자 기반 추정 사용
+    _encoding = None
+
+SYSTEM_PROMPT = "You are an assistant that summarizes PDF contents."
+REDUCE_INSTRUCTION = (
+    "아래는 한 문서를 여러 부분으로 나누어 각각 분석한 결과입니다. "
+    "사용자 요청에 맞게 중복을 없애고 하나의 결과로 통합하세요."
+)
+MAX_REDUCE_ROUNDS = 3  # 이 단계 안에 하나로 줄지 않으면 부분 결과를 잘라 마지막 한 번에 통합
+
+
+def estimate_tokens(text):
+    """
+    토큰 수 추정 (tiktoken이 있으면 정확히, 없으면 한글 등 비ASCII 1자≈1토큰, ASCII 4자≈1토큰)
+    """
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    non_ascii = sum(1 for c in text if ord(c) > 127)
+    return non_ascii + (len(text) - non_ascii + 3) // 4
+
+
+def _split_text(text, max_tokens):
+    """
+    한 페이지가 예산보다 길면 줄 단위(필요하면 글자 단위)로 나눔
+    """
+    parts, current = [], ""
+    for line in text.splitlines(keepends=True):
+        while estimate_tokens(line) > max_tokens:
+            cut = max(1, len(line) * max_tokens // estimate_tokens(line))
+            if current:
+                parts.append(current)
+                current = ""
+            parts.append(line[:cut])
+            line = line[cut:]
+        if current and estimate_tokens(current + line) > max_tokens:
+            parts.append(current)
+            current = ""
+        current += line
+    if current:
+        parts.append(current)
+    return parts
+
+
+def chunk_pages(pages, max_tokens=6000):
+    """
+    페이지를 순서대로 묶어 토큰 예산 이하의 청크 목록 생성
+    - 각 청크: {"first_page", "last_page", "text"} (텍스트에 [페이지 N] 표시 포함)
+    """
+    chunks = []
+    current, first, last, used = [], None, None, 0
+
+    def flush():
+        nonlocal current, first, last, used
+        if current:
+            chunks.append({"first_page": first, "last_page": last, "text": "\n".join(current)})
+        current, first, last, used = [], None, None, 0
+
+    for page in pages:
+        text = (page.get("text") or "").strip()
+        if not text:
+            continue
+        number = page["page_number"]
+        for part in _split_text(f"[페이지 {number}]\n{text}", max_tokens):
+            tokens = estimate_tokens(part)
+            if current and used + tokens > max_tokens:
+                flush()
+            if first is None:
+                first = number
+            last = number
+            current.append(part)
+            used += tokens
+    flush()
+    return chunks
+
+
+def group_texts(texts, max_tokens=6000):
+    """
+    텍스트(청크별 부분 결과)를 순서대로 묶어 토큰 예산 이하의 묶음 목록 생성
+    - chunk_pages와 달리 [페이지 N] 표시를 붙이지 않음 (부분 결과에는 이미 [페이지 a-b] 범위가 있음)
+    """
+    groups, current, used = [], [], 0
+    for text in texts:
+        for part in _split_text(text, max_tokens):
+            tokens = estimate_tokens(part)
+            if current and used + tokens > max_tokens:
+                groups.append("\n".join(current))
+                current, used = [], 0
+            current.append(part)
+            used += tokens
+    if current:
+        groups.append("\n".join(current))
+    return groups
+
+
+def _truncate_partials(partials, max_tokens):
+    """
+    부분 결과를 각각 max_tokens // 개수 토큰으로 잘라 하나로 합침 (버려지는 분량이 있으면 경고 출력)
+    """
+    share = max(1, max_tokens // len(partials))
+    kept = [(_split_text(p, share) or [""])[0] for p in partials]
+    total = sum(estimate_tokens(p) for p in partials)
+    dropped = total - sum(estimate_tokens(k) for k in kept)
+    if dropped > 0:
+        print(f"[⚠️ 통합] 부분 결과 {len(partials)}개가 예산에 들어가지 않아 각각 {share}토큰으로 잘라 통합 "
+              f"({dropped}/{total}토큰 생략)")
+    return "\n".join(kept)
+
+
+def document_hash(pages):
+    digest = hashlib.sha256()
+    for page in pages:
+        digest.update(f"{page['page_number']}\x00{page.get('text') or ''}\x00".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _cache_key(kind, content_hash, prompt, deployment, params):
+    raw = json.dumps([content_hash, prompt, deployment, params], ensure_ascii=False, sort_keys=True)
+    return f"ai:{kind}:{hashlib.sha256(raw.encode('utf-8')).hexdigest()}"
+
+
+async def _complete(client, deployment, user_content, max_tokens, temperature):
+    response = await client.chat.completions.create(
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_content},
+        ],
+        model=deployment,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        top_p=1.0,
+    )
+    return response.choices[0].message.content or ""
+
+
+async def analyze_pages_async(client, deployment, pages, prompt, chunk_tokens=6000, concurrency=4,
+                              max_tokens=1000, temperature=0.7, cache=None, progress=None):
+    """
+    페이지 인식 map-reduce 문서 분석
+    - map: 토큰 예산으로 나눈 청크마다 프롬프트를 적용 (최대 concurrency개 동시 요청)
+    - reduce: 청크 결과를 모아 하나로 통합, 결과가 예산을 넘으면 여러 단계로 통합
+    - cache(ExtractionCache)를 주면 문서 해시 + 프롬프트 + 배포 이름 기준으로 최종/청크 결과 재사용
+    - client: AsyncOpenAI / AsyncAzureOpenAI 또는 같은 인터페이스의 OpenAI 호환 클라이언트
+    """
+    params = {"chunk_tokens": chunk_tokens, "max_tokens": max_tokens, "temperature": temperature}
+    final_key = _cache_key("final", document_hash(pages), prompt, deployment, params)
+    if cache is not None:
+        cached = cache.get(final_key, kind="analysis")
+        if cached is not None:
+            return {**cached, "cached": True}
+
+    chunks = chunk_pages(pages, chunk_tokens)
+    if not chunks:
+        return {"summary": "", "chunks": 0, "calls": 0, "cached": False}
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    calls = 0
+    done = 0
+
+    async def cached_complete(kind, content, user_content):
+        nonlocal calls
+        key = _cache_key(kind, hashlib.sha256(content.encode("utf-8")).hexdigest(), prompt, deployment, params)
+        if cache is not None:
+            cached = cache.get(key, kind="analysis")
+            if cached is not None:
+                return cached["text"]
+        async with semaphore:
+            calls += 1
+            text = await _complete(client, deployment, user_content, max_tokens, temperature)
+        if cache is not None:
+            cache.put(key, {"text": text})
+        return text
+
+    async def map_chunk(chunk):
+        nonlocal done
+        text = await cached_complete(
+            "map", chunk["text"],
+            f"{prompt}\n(문서의 {chunk['first_page']}~{chunk['last_page']} 페이지 부분입니다)\n---\n{chunk['text']}",
+        )
+        done += 1
+        if progress:
+            progress(done, len(chunks))
+        return f"[페이지 {chunk['first_page']}-{chunk['last_page']}]\n{text}"
+
+    partials = await asyncio.gather(*(map_chunk(chunk) for chunk in chunks))
+
+    if len(partials) == 1:
+        summary = partials[0].split("\n", 1)[1]
+    else:
+        # 부분 결과가 한 번에 들어가지 않으면 예산 단위로 묶어 여러 단계로 통합
+        # (응답이 길어 묶음 수가 줄지 않거나 MAX_REDUCE_ROUNDS를 넘기면 부분 결과를 잘라 한 번에 통합)
+        rounds = 0
+        while True:
+            rounds += 1
+            texts = group_texts(partials, chunk_tokens)
+            if len(texts) > 1 and (rounds > MAX_REDUCE_ROUNDS or len(texts) >= len(partials)):
+                texts = [_truncate_partials(partials, chunk_tokens)]
+            merged = await asyncio.gather(*(
+                cached_complete("reduce", text, f"{REDUCE_INSTRUCTION}\n사용자 요청: {prompt}\n---\n{text}")
+                for text in texts
+            ))
+            if len(merged) == 1:
+                summary = merged[0]
+                break
+            partials = list(merged)
+
+    result = {"summary": summary, "chunks": len(chunks), "calls": calls, "cached": False}
+    if cache is not None:
+        cache.put(final_key, {k: v for k, v in result.items() if k != "cached"})
+    return result
+
+
+def analyze_pages(client_factory, deployment, pages, prompt, **kwargs):
+    """
+    동기 코드(Streamlit)용 래퍼 - 이벤트 루프마다 새 비동기 클라이언트를 만들기 위해 client_factory를 받음
+    """
+    async def run():
+        client = client_factory()
+        try:
+            return await analyze_pages_async(client, deployment, pages, prompt, **kwargs)
+        finally:
+            close = getattr(client, "close", None)
+            if close is not None:
+                await close()
+
+    return asyncio.run(run())
@@ -0,0 +1,164 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """
+    PDF 파일의 SHA-256 (캐시 키의 기준)
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def bytes_sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def config_fingerprint(config):
+    """
+    결과에 영향을 주는 설정(dict)의 짧은 해시 (OCR 엔진 / 모델 / 언어 / 렌더링 옵션 등)
+    """
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+def _suffix(config):
+    return f":{config}" if config else ""
+
+
+def document_key(pdf_hash, method, min_chars, dpi, config=None):
+    return f"doc:{pdf_hash}:{method}:{min_chars}:{dpi}{_suffix(config)}"
+
+
+def text_key(pdf_hash, method, page_number):
+    return f"text:{pdf_hash}:{method}:{page_number}"
+
+
+def ocr_key(pdf_hash, method, page_number, dpi, config=None):
+    return f"ocr:{pdf_hash}:{method}:{page_number}:{dpi}{_suffix(config)}"
+
+
+class ExtractionCache:
+    """
+    PDF 해시 + 추출 파라미터 기반 로컬 추출 캐시 (SQLite 단일 파일)
+    - 문서 단위: (hash, method, min_chars, dpi, config) → 최종 결과 JSON
+    - 페이지 단위: 텍스트 레이어는 (hash, method, page), OCR 결과는 (hash, method, page, dpi, config)
+    - config: OCR 설정 지문(config_fingerprint) → OCR 엔진 / 모델 / 언어를 바꾸면 다른 항목
+      → min_chars만 바뀌면 새로 OCR 대상이 된 페이지만 다시 OCR
+    - 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+    - 적중/실패 통계는 DB에 누적되므로 병렬 워커의 조회도 함께 집계됨
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.path = os.path.join(cache_dir, "extract_cache.sqlite3")
+        self._conn = None
+        self._lock = threading.Lock()
+
+    # 프로세스 풀 워커에 넘길 때 연결 객체는 제외하고 워커에서 다시 연결
+    def __getstate__(self):
+        return {"cache_dir": self.cache_dir, "max_bytes": self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(state["cache_dir"], state["max_bytes"])
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL,"
+                " size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_access)")
+            conn.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, count INTEGER NOT NULL)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _count(self, conn, name):
+        conn.execute(
+            "INSERT INTO stats (name, count) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET count = count + 1",
+            (name,),
+        )
+
+    def get(self, key, kind="page"):
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._count(conn, f"{kind}_misses")
+                conn.commit()
+                return None
+            conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._count(conn, f"{kind}_hits")
+            conn.commit()
+        return json.loads(zlib.decompress(row[0]).decode("utf-8"))
+
+    def put(self, key, value):
+        blob = zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8"), 1)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, blob, len(blob), time.time()),
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall():
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._count(conn, "evictions")
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def get_document(self, pdf_hash, method, min_chars, dpi, config=None):
+        return self.get(document_key(pdf_hash, method, min_chars, dpi, config), kind="document")
+
+    def put_document(self, pdf_hash, method, min_chars, dpi, result, config=None):
+        self.put(document_key(pdf_hash, method, min_chars, dpi, config), result)
+
+    def stats(self):
+        """
+        적중/실패/퇴출 횟수와 현재 항목 수, 크기 반환
+        """
+        with self._lock:
+            conn = self._connect()
+            counts = dict(conn.execute("SELECT name, count FROM stats").fetchall())
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        stats = {name: 0 for name in (
+            "document_hits", "document_misses", "page_hits", "page_misses", "evictions")}
+        stats.update(counts)
+        stats.update({"entries": entries, "size_bytes": size, "max_bytes": self.max_bytes})
+        return stats
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM stats")
+            conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,97 @@
+import time
+import threading
+
+from utils.firestore_uploader import load_pages
+
+# 목록 조회 시 가져오는 요약 필드 (업로드 시 build_metadata가 기록)
+SUMMARY_FIELDS = ["storage", "page_count", "total_chars", "ocr_pages_count", "preview", "uploaded_at"]
+
+
+class DocumentBrowser:
+    """
+    Firestore 문서 목록 조회기
+    - 목록은 요약 필드만 select 해서 가져오고, 문서 ID 순서의 커서 기반 페이지네이션
+    - 조회한 목록 페이지와 문서 본문은 ttl초 동안 캐시 (Streamlit 재실행 간 공유)
+    - 업로드/삭제 후 invalidate()로 캐시 무효화
+    - 페이지 본문은 load_pages()를 호출할 때만 가져옴
+    """
+
+    def __init__(self, db, collection="pdf_texts", page_size=20, ttl=300):
+        self.db = db
+        self.collection = collection
+        self.page_size = page_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._listing = {}   # 목록 페이지 번호 → (조회 시각, rows, 마지막 스냅샷)
+        self._pages = {}     # doc_id → (조회 시각, pages)
+
+    def _fresh(self, entry):
+        return entry is not None and time.monotonic() - entry[0] < self.ttl
+
+    def list_page(self, index=0):
+        """
+        index번째 목록 페이지 반환: (rows, has_next)
+        - rows: [(doc_id, summary_dict), ...]
+        - index > 0 은 바로 앞 페이지의 마지막 문서를 커서로 사용 (앞 페이지부터 차례로 조회됨)
+        """
+        with self._lock:
+            entry = self._listing.get(index)
+            if self._fresh(entry):
+                return entry[1], entry[2] is not None
+
+        cursor = None
+        if index > 0:
+            self.list_page(index - 1)
+            with self._lock:
+                cursor = self._listing[index - 1][2]
+            if cursor is None:
+                return [], False
+
+        query = (
+            self.db.collection(self.collection)
+            .select(SUMMARY_FIELDS)
+            .order_by("__name__")
+            .limit(self.page_size + 1)
+        )
+        if cursor is not None:
+            query = query.start_after(cursor)
+
+        snaps = list(query.stream())
+        has_next = len(snaps) > self.page_size
+        snaps = snaps[:self.page_size]
+        rows = [(snap.id, snap.to_dict() or {}) for snap in snaps]
+        last = snaps[-1] if has_next else None
+
+        with self._lock:
+            self._listing[index] = (time.monotonic(), rows, last)
+        return rows, has_next
+
+    def load_pages(self, doc_id, summary=None):
+        """
+        문서 본문(페이지 목록)을 가져옴 - 문서를 펼쳐 볼 때만 호출
+        """
+        with self._lock:
+            entry = self._pages.get(doc_id)
+            if self._fresh(entry):
+                return entry[1]
+
+        metadata = summary
+        if metadata is None or metadata.get("storage") != "paged":
+            # 이전 방식(pages를 문서에 통째로 저장) 문서는 전체 문서를 읽어야 함
+            metadata = self.db.collection(self.collection).document(doc_id).get().to_dict() or {}
+        pages = load_pages(self.db, doc_id, metadata, self.collection)
+
+        with self._lock:
+            self._pages[doc_id] = (time.monotonic(), pages)
+        return pages
+
+    def invalidate(self, doc_id=None):
+        """
+        목록 캐시 전체와 (지정 시) 해당 문서 본문 캐시를 비움
+        """
+        with self._lock:
+            self._listing.clear()
+            if doc_id is None:
+                self._pages.clear()
+            else:
+                self._pages.pop(doc_id, None)
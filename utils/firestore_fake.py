@@ -0,0 +1,220 @@
+import copy
+import threading
+
+
+class ServiceUnavailable(Exception):
+    """google.api_core.exceptions.ServiceUnavailable 와 같은 이름의 재시도 대상 오류"""
+
+
+class InvalidArgument(Exception):
+    """google.api_core.exceptions.InvalidArgument 와 같은 이름의 잘못된 데이터 오류"""
+
+
+def _check_value(value, path, in_array=False):
+    # 실제 Firestore처럼 배열 안의 배열은 거부
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _check_value(item, f"{path}.{key}", False)
+    elif isinstance(value, (list, tuple)):
+        if in_array:
+            raise InvalidArgument(f"Cannot convert an array value in an array value: {path}")
+        for item in value:
+            _check_value(item, path, True)
+
+
+class FakeFirestore:
+    """
+    테스트/벤치마크용 인메모리 Firestore 클라이언트
+    - firebase_admin firestore.client() 중 이 저장소에서 쓰는 기능만 구현
+      (collection / document / 하위 컬렉션, batch, select / order_by / limit / start_after)
+    - fail_next(n)으로 다음 n번의 커밋을 일시적 오류로 실패시켜 재시도 동작 확인
+    - write_count 로 실제 쓰기(set/update/delete) 횟수 집계
+    - 배열 안의 배열 등 Firestore가 저장할 수 없는 값은 실제와 같이 InvalidArgument로 거부
+    """
+
+    def __init__(self):
+        self._docs = {}
+        self._lock = threading.Lock()
+        self._failures = 0
+        self.write_count = 0
+        self.commit_count = 0
+
+    def collection(self, name):
+        return CollectionReference(self, name)
+
+    def batch(self):
+        return WriteBatch(self)
+
+    def fail_next(self, n=1):
+        self._failures += n
+
+    def _maybe_fail(self):
+        with self._lock:
+            if self._failures > 0:
+                self._failures -= 1
+                raise ServiceUnavailable("fake transient failure")
+
+    def _apply(self, ops):
+        for op, path, data in ops:
+            if data is not None:
+                _check_value(data, path)
+        self._maybe_fail()
+        with self._lock:
+            self.commit_count += 1
+            for op, path, data in ops:
+                self.write_count += 1
+                if op == "set":
+                    self._docs[path] = copy.deepcopy(data)
+                elif op == "merge":
+                    self._docs.setdefault(path, {}).update(copy.deepcopy(data))
+                elif op == "update":
+                    if path not in self._docs:
+                        raise KeyError(f"No document to update: {path}")
+                    self._docs[path].update(copy.deepcopy(data))
+                elif op == "delete":
+                    self._docs.pop(path, None)
+
+    def _children(self, collection_path):
+        prefix = collection_path + "/"
+        with self._lock:
+            return [
+                (path, copy.deepcopy(data)) for path, data in self._docs.items()
+                if path.startswith(prefix) and "/" not in path[len(prefix):]
+            ]
+
+
+class DocumentSnapshot:
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+
+    @property
+    def exists(self):
+        return self._data is not None
+
+    def get(self, field_path):
+        """
+        실제 클라이언트와 같이 점(.)으로 구분된 경로를 따라가고, 필드가 없으면 KeyError (문서가 없으면 None)
+        """
+        if self._data is None:
+            return None
+        value = self._data
+        for part in field_path.split("."):
+            if not isinstance(value, dict) or part not in value:
+                raise KeyError(f"'{field_path}' is not contained in the data")
+            value = value[part]
+        return copy.deepcopy(value)
+
+    def to_dict(self):
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+
+class DocumentReference:
+    def __init__(self, client, path):
+        self._client = client
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def collection(self, name):
+        return CollectionReference(self._client, f"{self.path}/{name}")
+
+    def get(self, field_paths=None):
+        with self._client._lock:
+            data = copy.deepcopy(self._client._docs.get(self.path))
+        if data is not None and field_paths is not None:
+            data = {k: v for k, v in data.items() if k in field_paths}
+        return DocumentSnapshot(self, data)
+
+    def set(self, data, merge=False):
+        self._client._apply([("merge" if merge else "set", self.path, data)])
+
+    def update(self, data):
+        self._client._apply([("update", self.path, data)])
+
+    def delete(self):
+        self._client._apply([("delete", self.path, None)])
+
+
+class Query:
+    def __init__(self, client, path, fields=None, orders=(), limit_count=None, cursor=None):
+        self._client = client
+        self._path = path
+        self._fields = fields
+        self._orders = tuple(orders)
+        self._limit = limit_count
+        self._cursor = cursor
+
+    def _copy(self, **changes):
+        state = {
+            "fields": self._fields, "orders": self._orders,
+            "limit_count": self._limit, "cursor": self._cursor,
+        }
+        state.update(changes)
+        return Query(self._client, self._path, **state)
+
+    def select(self, field_paths):
+        return self._copy(fields=list(field_paths))
+
+    def order_by(self, field_path, direction="ASCENDING"):
+        return self._copy(orders=self._orders + ((field_path, direction),))
+
+    def limit(self, count):
+        return self._copy(limit_count=count)
+
+    def start_after(self, document_fields_or_snapshot):
+        return self._copy(cursor=document_fields_or_snapshot)
+
+    def stream(self):
+        items = self._client._children(self._path)
+        orders = self._orders or (("__name__", "ASCENDING"),)
+        for field, direction in reversed(orders):
+            items.sort(
+                key=lambda item, f=field: item[0].rsplit("/", 1)[-1] if f == "__name__" else (item[1].get(f) is None, item[1].get(f)),
+                reverse=direction == "DESCENDING",
+            )
+
+        if self._cursor is not None:
+            cursor_id = self._cursor.id if isinstance(self._cursor, DocumentSnapshot) else self._cursor.get("__name__")
+            ids = [path.rsplit("/", 1)[-1] for path, _ in items]
+            if cursor_id in ids:
+                items = items[ids.index(cursor_id) + 1:]
+
+        if self._limit is not None:
+            items = items[:self._limit]
+
+        for path, data in items:
+            if self._fields is not None:
+                data = {k: v for k, v in data.items() if k in self._fields}
+            yield DocumentSnapshot(DocumentReference(self._client, path), data)
+
+    def get(self):
+        return list(self.stream())
+
+
+class CollectionReference(Query):
+    def __init__(self, client, path):
+        super().__init__(client, path)
+        self.id = path.rsplit("/", 1)[-1]
+
+    def document(self, doc_id):
+        return DocumentReference(self._client, f"{self._path}/{doc_id}")
+
+
+class WriteBatch:
+    def __init__(self, client):
+        self._client = client
+        self._ops = []
+
+    def set(self, reference, data, merge=False):
+        self._ops.append(("merge" if merge else "set", reference.path, data))
+
+    def update(self, reference, data):
+        self._ops.append(("update", reference.path, data))
+
+    def delete(self, reference):
+        self._ops.append(("delete", reference.path, None))
+
+    def commit(self):
+        self._client._apply(self._ops)
+        self._ops = []
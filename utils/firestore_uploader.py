@@ -0,0 +1,377 @@
+import json
+import time
+import random
+import hashlib
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils.metrics import record_document
+from utils.result_writer import is_ocr_page
+
+# Firestore 제한: 배치당 최대 500개 쓰기, 요청당 10 MiB, 문서당 1 MiB
+MAX_BATCH_WRITES = 500
+MAX_BATCH_BYTES = 9 * 1024 * 1024
+
+PAGES_SUBCOLLECTION = "pages"
+PREVIEW_CHARS = 300
+
+# 업로드 시 추가되는 요약 필드 (원래 결과 JSON에 없던 필드, load_document에서 제거)
+SUMMARY_ONLY_FIELDS = ("storage", "page_count", "total_chars", "preview", "uploaded_at", "page_hashes")
+
+# 재시도할 Firestore(google.api_core) 예외 이름 - 에뮬레이터/가짜 클라이언트에서도 동작하도록 이름으로 비교
+# 실행마다 달라지는 페이지 필드 (단계별 시간, 디버깅 이미지 경로, 예전 결과의 triage 판정 시간) - 페이지 해시에서 제외
+VOLATILE_PAGE_FIELDS = ("timings", "image_path")
+VOLATILE_TRIAGE_FIELDS = ("ms",)
+
+RETRYABLE_ERRORS = {
+    "Aborted", "DeadlineExceeded", "InternalServerError", "ResourceExhausted",
+    "ServiceUnavailable", "TooManyRequests", "Unknown", "ConnectionError", "TimeoutError",
+}
+
+
+def iter_pages(json_data):
+    """
+    결과 JSON의 페이지를 페이지 번호 순서로 반환
+    - app.py 결과는 pages가 리스트, hybrid_extract 결과는 {"page_N": {...}} 딕셔너리
+    """
+    pages = json_data.get("pages") or []
+    if isinstance(pages, dict):
+        pages = pages.values()
+    return sorted(pages, key=lambda p: p["page_number"])
+
+
+def page_doc_id(page_number):
+    # 문서 ID 정렬 = 페이지 순서가 되도록 0 채움
+    return f"page_{page_number:05d}"
+
+
+def _flatten_boxes(ocr_data):
+    return [
+        {**line, "box": [float(v) for point in line["box"] for v in point]}
+        if line.get("box") and isinstance(line["box"][0], (list, tuple)) else line
+        for line in ocr_data
+    ]
+
+
+def _restore_boxes(ocr_data):
+    return [
+        {**line, "box": [line["box"][i:i + 2] for i in range(0, len(line["box"]), 2)]}
+        if line.get("box") and not isinstance(line["box"][0], (list, tuple)) else line
+        for line in ocr_data
+    ]
+
+
+def _convert_page(page_info, convert):
+    # 페이지 ocr_data와 (예전 결과의) 영역 OCR regions[*].ocr_data의 box 변환
+    if "ocr_data" not in page_info and "regions" not in page_info:
+        return page_info
+    page = dict(page_info)
+    if "ocr_data" in page:
+        page["ocr_data"] = convert(page["ocr_data"])
+    if "regions" in page:
+        page["regions"] = [
+            {**region, "ocr_data": convert(region["ocr_data"])} if "ocr_data" in region else region
+            for region in page["regions"]
+        ]
+    return page
+
+
+def _to_firestore_page(page_info):
+    """
+    Firestore는 배열 안의 배열을 저장할 수 없으므로 OCR box [[x, y], ...] 를 [x1, y1, x2, y2, ...] 로 펼침
+    (페이지 ocr_data와 영역별 regions[*].ocr_data 모두)
+    """
+    return _convert_page(page_info, _flatten_boxes)
+
+
+def _from_firestore_page(page):
+    return _convert_page(page, _restore_boxes)
+
+
+def _canonical_page(data):
+    page = {k: v for k, v in data.items() if k not in VOLATILE_PAGE_FIELDS}
+    if isinstance(page.get("triage"), dict):
+        page["triage"] = {k: v for k, v in page["triage"].items() if k not in VOLATILE_TRIAGE_FIELDS}
+    return page
+
+
+def page_hash(data):
+    """
+    Firestore에 저장되는 페이지 데이터의 내용 해시 (sync_document에서 변경된 페이지 판별)
+    - 실행마다 달라지는 필드(VOLATILE_PAGE_FIELDS)는 빼고 계산해서, 같은 PDF를 다시 추출하면 해시가 같음
+    """
+    canonical = json.dumps(_canonical_page(data), ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def build_metadata(json_data, preview_chars=PREVIEW_CHARS, page_hashes=None):
+    """
+    문서 메타데이터 (pages를 제외한 최상위 필드 + 목록 화면용 요약 필드)
+    - page_hashes: {page_00001: 해시, ...} - 다음 동기화 때 비교용
+    """
+    pages = iter_pages(json_data)
+    metadata = {k: v for k, v in json_data.items() if k != "pages"}
+    preview = next((p["text"] for p in pages if p.get("text", "").strip()), "")
+    metadata.update({
+        "storage": "paged",
+        "page_count": len(pages),
+        "total_chars": sum(p.get("char_count", 0) for p in pages),
+        "preview": preview.strip()[:preview_chars],
+        "uploaded_at": datetime.now().strftime("%Y%m%d%H%M%S"),
+    })
+    metadata.setdefault("ocr_pages_count", sum(1 for p in pages if is_ocr_page(p)))
+    if page_hashes is not None:
+        metadata["page_hashes"] = page_hashes
+    return metadata
+
+
+def _estimate_bytes(data):
+    return len(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+
+def _make_batches(writes):
+    """
+    (ref, data) 목록을 Firestore 배치 제한(쓰기 수 / 요청 크기)에 맞게 분할
+    """
+    batches, current, current_bytes = [], [], 0
+    for ref, data, size in writes:
+        if current and (len(current) >= MAX_BATCH_WRITES or current_bytes + size > MAX_BATCH_BYTES):
+            batches.append(current)
+            current, current_bytes = [], 0
+        current.append((ref, data, size))
+        current_bytes += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+def is_retryable(exc):
+    return type(exc).__name__ in RETRYABLE_ERRORS
+
+
+def commit_with_retry(commit, max_retries=5, base_delay=0.5, max_delay=30.0):
+    """
+    commit()을 지수 백오프(+지터)로 재시도, 재시도 횟수 반환
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            commit()
+            return attempt
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            delay = min(max_delay, base_delay * (2 ** attempt)) * random.uniform(0.5, 1.5)
+            print(f"[⚠️ 재시도] Firestore 쓰기 실패 ({type(e).__name__}) - {delay:.1f}초 후 재시도 {attempt + 1}/{max_retries}")
+            time.sleep(delay)
+
+
+def _commit_batch(db, items, max_retries, base_delay, delete=False):
+    def commit():
+        batch = db.batch()
+        for ref, data, _ in items:
+            if delete:
+                batch.delete(ref)
+            else:
+                batch.set(ref, data)
+        batch.commit()
+
+    return commit_with_retry(commit, max_retries, base_delay)
+
+
+def _run_batches(db, batches, concurrency, max_retries, base_delay, progress=None, total=None, delete=False):
+    """
+    배치들을 최대 concurrency개씩 동시에 커밋하고 (쓰기 수, 재시도 수) 반환
+    - progress 콜백은 호출한 스레드에서 실행 (Streamlit 위젯 갱신 가능)
+    """
+    done = 0
+    retries = 0
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {
+            executor.submit(_commit_batch, db, items, max_retries, base_delay, delete): len(items)
+            for items in batches
+        }
+        for future in as_completed(futures):
+            retries += future.result()
+            done += futures[future]
+            if progress:
+                progress(done, total if total is not None else done)
+
+    return done, retries
+
+
+def _firestore_pages(json_data):
+    return [(page_doc_id(p["page_number"]), _to_firestore_page(p)) for p in iter_pages(json_data)]
+
+
+def _stale_pages(pages_ref, page_ids):
+    """
+    저장된 페이지 문서 중 새 결과에 없는 페이지 (페이지 수가 줄어든 재업로드) → 삭제할 (ref, None, 0) 목록
+    - 필드 없이 문서 ID만 조회
+    """
+    return [(snap.reference, None, 0) for snap in pages_ref.select([]).stream() if snap.id not in page_ids]
+
+
+def upload_document(db, doc_id, json_data, collection="pdf_texts", concurrency=4,
+                    max_retries=5, base_delay=0.5, progress=None):
+    """
+    결과 JSON을 메타데이터 문서 + 페이지별 하위 컬렉션으로 나눠 저장
+    - {collection}/{doc_id}: pages를 뺀 메타데이터 (1 MiB 문서 제한 회피)
+    - {collection}/{doc_id}/pages/page_00001 ...: 페이지별 문서, 배치 쓰기로 저장
+    - 배치는 최대 concurrency개씩 동시에 커밋, 일시적 오류는 지수 백오프로 재시도
+    - 같은 doc_id에 페이지 수가 줄어든 결과를 올리면 남는 페이지 문서는 삭제
+    - progress(done_pages, total_pages) 콜백으로 진행률 전달
+    - db는 firestore.client() 또는 같은 인터페이스의 가짜 클라이언트
+      (FIRESTORE_EMULATOR_HOST 를 설정하면 firebase_admin 클라이언트가 에뮬레이터로 연결됨)
+    - 처리량 통계 딕셔너리 반환
+    """
+    started = time.perf_counter()
+    doc_ref = db.collection(collection).document(doc_id)
+    pages_ref = doc_ref.collection(PAGES_SUBCOLLECTION)
+
+    writes = []
+    page_hashes = {}
+    for page_id, data in _firestore_pages(json_data):
+        writes.append((pages_ref.document(page_id), data, _estimate_bytes(data)))
+        page_hashes[page_id] = page_hash(data)
+
+    batches = _make_batches(writes)
+    written, retries = _run_batches(db, batches, concurrency, max_retries, base_delay, progress, len(writes))
+    delete_batches = _make_batches(_stale_pages(pages_ref, page_hashes))
+    deleted, delete_retries = _run_batches(db, delete_batches, concurrency, max_retries, base_delay, delete=True)
+    retries += delete_retries
+
+    # 페이지를 모두 쓴 뒤 메타데이터를 써서, 목록에 보이는 문서는 항상 완전한 상태
+    metadata = build_metadata(json_data, page_hashes=page_hashes)
+    retries += commit_with_retry(lambda: doc_ref.set(metadata), max_retries, base_delay)
+
+    elapsed = time.perf_counter() - started
+    record_document({"firestore": elapsed}, "firestore")
+    total_bytes = sum(size for _, _, size in writes) + _estimate_bytes(metadata)
+    stats = {
+        "doc_id": doc_id,
+        "pages": written,
+        "pages_deleted": deleted,
+        "batches": len(batches) + len(delete_batches),
+        "retries": retries,
+        "bytes": total_bytes,
+        "seconds": round(elapsed, 3),
+        "pages_per_sec": round(written / elapsed, 1) if elapsed else None,
+        "mb_per_sec": round(total_bytes / 1024 / 1024 / elapsed, 2) if elapsed else None,
+    }
+    print(f"[✅ Firestore 업로드] {doc_id}: {written}페이지, 삭제 {deleted}페이지, {len(batches)}배치, "
+          f"{stats['pages_per_sec']} pages/s, {stats['mb_per_sec']} MB/s")
+    return stats
+
+
+def _stored_page_hashes(doc_ref):
+    """
+    저장된 문서의 페이지 해시 {page_id: 해시} (문서가 없거나 페이지 방식이 아니면 None)
+    - 해시를 기록하기 전에 업로드한 문서는 페이지를 읽어서 계산 (읽기가 쓰기보다 저렴)
+    """
+    snap = doc_ref.get(field_paths=["storage", "page_hashes"])
+    # snap.get()은 필드가 없으면 KeyError (이전 방식 문서 / 해시 기록 전 문서)
+    stored = (snap.to_dict() or {}) if snap.exists else {}
+    if stored.get("storage") != "paged":
+        return None
+    hashes = stored.get("page_hashes")
+    if hashes is None:
+        hashes = {s.id: page_hash(s.to_dict()) for s in doc_ref.collection(PAGES_SUBCOLLECTION).stream()}
+    return hashes
+
+
+def sync_document(db, doc_id, json_data, collection="pdf_texts", concurrency=4,
+                  max_retries=5, base_delay=0.5, progress=None):
+    """
+    같은 문서의 개정본을 올릴 때 바뀐 페이지만 쓰고, 없어진 페이지만 삭제
+    - 저장된 페이지 해시(메타데이터 page_hashes)와 새 추출 결과의 해시를 비교
+    - 문서가 없거나 이전 방식(pages 통째 저장)이면 upload_document로 전체 업로드
+    - 메타데이터 문서는 항상 다시 씀 (요약 필드 / 해시 갱신)
+    - 통계에 아낀 쓰기 수 / 바이트(writes_saved, bytes_saved) 포함
+    """
+    started = time.perf_counter()
+    doc_ref = db.collection(collection).document(doc_id)
+    stored = _stored_page_hashes(doc_ref)
+    if stored is None:
+        stats = upload_document(db, doc_id, json_data, collection, concurrency, max_retries, base_delay, progress)
+        stats.update({"mode": "full", "pages_written": stats["pages"],
+                      "pages_unchanged": 0, "writes_saved": 0, "bytes_saved": 0})
+        return stats
+
+    pages_ref = doc_ref.collection(PAGES_SUBCOLLECTION)
+    writes = []
+    page_hashes = {}
+    unchanged_bytes = 0
+    for page_id, data in _firestore_pages(json_data):
+        page_hashes[page_id] = page_hash(data)
+        size = _estimate_bytes(data)
+        if stored.get(page_id) == page_hashes[page_id]:
+            unchanged_bytes += size
+        else:
+            writes.append((pages_ref.document(page_id), data, size))
+    deletes = [(pages_ref.document(page_id), None, 0) for page_id in stored if page_id not in page_hashes]
+
+    batches = _make_batches(writes)
+    written, retries = _run_batches(db, batches, concurrency, max_retries, base_delay, progress, len(writes))
+    delete_batches = _make_batches(deletes)
+    deleted, delete_retries = _run_batches(db, delete_batches, concurrency, max_retries, base_delay, delete=True)
+    retries += delete_retries
+
+    metadata = build_metadata(json_data, page_hashes=page_hashes)
+    retries += commit_with_retry(lambda: doc_ref.set(metadata), max_retries, base_delay)
+
+    elapsed = time.perf_counter() - started
+    record_document({"firestore": elapsed}, "firestore")
+    written_bytes = sum(size for _, _, size in writes) + _estimate_bytes(metadata)
+    unchanged = len(page_hashes) - len(writes)
+    stats = {
+        "doc_id": doc_id,
+        "mode": "sync",
+        "pages": len(page_hashes),
+        "pages_written": written,
+        "pages_deleted": deleted,
+        "pages_unchanged": unchanged,
+        "batches": len(batches) + len(delete_batches),
+        "retries": retries,
+        "bytes": written_bytes,
+        "bytes_saved": unchanged_bytes,
+        "writes_saved": unchanged,
+        "seconds": round(elapsed, 3),
+        "pages_per_sec": round(len(page_hashes) / elapsed, 1) if elapsed else None,
+    }
+    print(f"[✅ Firestore 동기화] {doc_id}: 변경 {written}페이지, 삭제 {deleted}페이지, 유지 {unchanged}페이지 "
+          f"(쓰기 {unchanged}회 / {unchanged_bytes / 1024:.1f} KB 절약)")
+    return stats
+
+
+def load_pages(db, doc_id, metadata=None, collection="pdf_texts"):
+    """
+    문서의 페이지 목록을 페이지 순서대로 반환 (이전 방식으로 pages를 통째로 저장한 문서도 지원)
+    """
+    if metadata is not None and metadata.get("storage") != "paged":
+        return iter_pages(metadata)
+    pages_ref = db.collection(collection).document(doc_id).collection(PAGES_SUBCOLLECTION)
+    return [_from_firestore_page(snap.to_dict()) for snap in pages_ref.order_by("page_number").stream()]
+
+
+def load_document(db, doc_id, collection="pdf_texts"):
+    """
+    메타데이터와 페이지를 합쳐 업로드 전과 같은 형태의 딕셔너리로 반환 (pages는 리스트)
+    """
+    snap = db.collection(collection).document(doc_id).get()
+    if not snap.exists:
+        return None
+    metadata = snap.to_dict()
+    data = {k: v for k, v in metadata.items() if k not in SUMMARY_ONLY_FIELDS}
+    data["pages"] = load_pages(db, doc_id, metadata, collection)
+    return data
+
+
+def delete_document(db, doc_id, collection="pdf_texts", concurrency=4, max_retries=5, base_delay=0.5):
+    """
+    페이지 하위 컬렉션까지 배치 삭제한 뒤 메타데이터 문서 삭제
+    """
+    doc_ref = db.collection(collection).document(doc_id)
+    refs = [(snap.reference, None, 0) for snap in doc_ref.collection(PAGES_SUBCOLLECTION).stream()]
+    _run_batches(db, _make_batches(refs), concurrency, max_retries, base_delay, delete=True)
+    commit_with_retry(doc_ref.delete, max_retries, base_delay)
@@ -0,0 +1,171 @@
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+
+class JobCancelled(Exception):
+    """작업 취소 요청으로 중단됨"""
+
+
+class Job:
+    def __init__(self, job_id, name, owner=None):
+        self.id = job_id
+        self.name = name
+        self.owner = owner
+        self.status = QUEUED
+        self.done = 0
+        self.total = None
+        self.message = ""
+        self.result = None
+        self.partial = []
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_requested = threading.Event()
+        self.future = None
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "owner": self.owner,
+            "status": self.status,
+            "done": self.done,
+            "total": self.total,
+            "partial_count": len(self.partial),
+            "message": self.message,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobContext:
+    """
+    작업 함수에 전달되는 진행률 / 취소 핸들
+    - progress(done, total)를 페이지마다 호출하면 진행률이 갱신되고, 취소 요청이 있으면 JobCancelled 발생
+    - publish(item)으로 완료된 부분 결과(예: 페이지)를 올리면 작업이 끝나기 전에도 JobManager.partial()로 조회 가능
+    """
+
+    def __init__(self, job):
+        self._job = job
+
+    @property
+    def cancelled(self):
+        return self._job.cancel_requested.is_set()
+
+    def check(self):
+        if self.cancelled:
+            raise JobCancelled(self._job.id)
+
+    def progress(self, done, total=None, message=None):
+        self._job.done = done
+        if total is not None:
+            self._job.total = total
+        if message is not None:
+            self._job.message = message
+        self.check()
+
+    def publish(self, item):
+        self._job.partial.append(item)
+
+
+class JobManager:
+    """
+    백그라운드 작업 큐 (Streamlit 재실행과 분리된 스레드 풀)
+    - submit()은 바로 job id를 반환하고, 작업은 최대 max_workers개씩 실행
+    - 상태 / 진행률 / 결과는 프로세스가 살아 있는 동안 유지 (재실행, 새로고침 후에도 조회 가능)
+    - 완료된 작업은 keep개까지만 보관
+    """
+
+    def __init__(self, max_workers=2, keep=100):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self.keep = keep
+
+    def submit(self, name, fn, *args, owner=None, **kwargs):
+        """
+        fn(ctx, *args, **kwargs) 를 백그라운드에서 실행하고 job id 반환
+        """
+        job = Job(uuid.uuid4().hex[:12], name, owner)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        job.future = self._executor.submit(self._run, job, fn, args, kwargs)
+        return job.id
+
+    def _run(self, job, fn, args, kwargs):
+        if job.cancel_requested.is_set():
+            job.status = CANCELLED
+            job.finished_at = time.time()
+            return
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            job.result = fn(JobContext(job), *args, **kwargs)
+            job.status = DONE
+        except JobCancelled:
+            job.status = CANCELLED
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+            print(f"[에러] 작업 실패 - {job.name} ({job.id}): {e}")
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self):
+        finished = sorted((j for j in self._jobs.values() if j.finished), key=lambda j: j.finished_at)
+        for job in finished[:max(0, len(finished) - self.keep)]:
+            del self._jobs[job.id]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def status(self, job_id):
+        job = self.get(job_id)
+        return job.to_dict() if job else None
+
+    def result(self, job_id):
+        job = self.get(job_id)
+        return job.result if job and job.status == DONE else None
+
+    def partial(self, job_id, start=0):
+        """
+        작업이 지금까지 publish한 부분 결과 (start번째부터)
+        """
+        job = self.get(job_id)
+        return list(job.partial[start:]) if job else []
+
+    def cancel(self, job_id):
+        """
+        대기 중인 작업은 바로 취소, 실행 중인 작업은 다음 진행률 보고 시점에 중단
+        """
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return False
+        job.cancel_requested.set()
+        if job.future is not None and job.future.cancel():
+            job.status = CANCELLED
+            job.finished_at = time.time()
+        return True
+
+    def list(self, owner=None):
+        with self._lock:
+            jobs = [j for j in self._jobs.values() if owner is None or j.owner == owner]
+        return [j.to_dict() for j in sorted(jobs, key=lambda j: j.created_at, reverse=True)]
+
+    def shutdown(self, wait=True):
+        for job in list(self._jobs.values()):
+            job.cancel_requested.set()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
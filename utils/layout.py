@@ -0,0 +1,276 @@
+import numpy as np
+
+LINE_TOLERANCE = 0.5    # 같은 줄: y 중심 차이가 글자 높이의 50% 이내
+MIN_GUTTER = 1.0        # 단 사이 여백 최소 폭 (글자 높이 배수)
+MAX_CROSSING = 0.1      # 여백을 가로지르는 줄(제목 등) 허용 비율 (x축 투영 최댓값 대비)
+MIN_FILL = 0.7          # 줄이 단 폭을 채우는 비율 (표의 칸과 본문 단을 구분)
+BLOCK_GAP = 1.5         # 블록 경계: 전체 폭에 걸친 세로 빈 간격이 글자 높이의 1.5배 초과
+
+
+def as_boxes(boxes):
+    """
+    bbox (N, 4) 또는 OCR 사각형 (N, 4, 2) → float64 (N, 4) [x0, y0, x1, y1]
+    """
+    boxes = np.asarray(boxes, dtype=np.float64)
+    if boxes.ndim == 3:
+        boxes = np.concatenate([boxes.min(axis=1), boxes.max(axis=1)], axis=1)
+    return boxes.reshape(-1, 4)
+
+
+def _aligned_ratio(ys, others, h):
+    # ys 중 others(정렬됨)의 어느 y와 같은 줄 높이에 있는 비율
+    idx = np.searchsorted(others, ys)
+    dy = np.minimum(np.abs(others[np.minimum(idx, len(others) - 1)] - ys),
+                    np.abs(others[np.maximum(idx - 1, 0)] - ys))
+    return (dy <= LINE_TOLERANCE * h).mean()
+
+
+def _is_table_gap(boxes, gutter, h):
+    """
+    여백 양쪽 줄들의 y 위치가 대부분 맞고 줄이 단 폭을 채우지 않으면 표의 칸 사이로 판단
+    - 행 정렬은 양쪽 중 더 잘 맞는 쪽 기준 (빈 칸이 많은 열도 표로 봄)
+    """
+    left = boxes[boxes[:, 2] <= gutter]
+    right = boxes[boxes[:, 0] >= gutter]
+    if not len(left) or not len(right):
+        return True
+    left_y = np.sort((left[:, 1] + left[:, 3]) / 2)
+    right_y = np.sort((right[:, 1] + right[:, 3]) / 2)
+    if max(_aligned_ratio(left_y, right_y, h), _aligned_ratio(right_y, left_y, h)) < 0.5:
+        return False
+    fill_left = np.median(left[:, 2] - left[:, 0]) / max(gutter - left[:, 0].min(), 1e-6)
+    fill_right = np.median(right[:, 2] - right[:, 0]) / max(right[:, 2].max() - gutter, 1e-6)
+    return min(fill_left, fill_right) < MIN_FILL
+
+
+def detect_columns(boxes):
+    """
+    줄(또는 OCR 박스) bbox 배열에서 단 경계 x 좌표 배열 반환 (단이 하나면 빈 배열)
+    - x축 투영(차분 배열 누적합)에서 글자 높이 이상 폭으로 거의 비어 있는 세로 여백을 단 경계로 봄
+    - 여백 양쪽이 행 단위로 맞춰진 짧은 칸이면(표) 단으로 나누지 않음 → 표는 행 순서 유지
+    """
+    boxes = as_boxes(boxes)
+    if len(boxes) < 4:
+        return np.empty(0)
+    h = float(np.median(boxes[:, 3] - boxes[:, 1])) or 1.0
+    left, right = boxes[:, 0].min(), boxes[:, 2].max()
+    step = max((right - left) / 2000, h / 8)
+    bins = int((right - left) / step) + 1
+    diff = (np.bincount(((boxes[:, 0] - left) / step).astype(np.int64), minlength=bins + 1)
+            - np.bincount(np.minimum(np.ceil((boxes[:, 2] - left) / step).astype(np.int64), bins), minlength=bins + 1))
+    coverage = np.cumsum(diff)[:bins]
+
+    empty = coverage <= MAX_CROSSING * coverage.max()
+    edges = np.diff(np.concatenate(([0], empty.astype(np.int8), [0])))
+    starts, stops = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    keep = ((stops - starts) * step >= MIN_GUTTER * h) & (starts > 0) & (stops < bins)
+    gutters = left + (starts[keep] + stops[keep]) / 2 * step
+    return np.array([g for g in gutters if not _is_table_gap(boxes, g, h)])
+
+
+def _crosses(boxes, gutters):
+    return bool(len(gutters)) and bool(((boxes[:, 0, None] < gutters) & (boxes[:, 2, None] > gutters)).any())
+
+
+def _same_gutters(a, b, h):
+    return len(a) == len(b) and bool((np.abs(a - b) <= 2 * h).all())
+
+
+def split_blocks(boxes):
+    """
+    전체 폭에 걸친 세로 빈 간격으로 박스를 위 → 아래 블록으로 나누고 블록별 단 경계 검출 → [(인덱스, 단 경계), ...]
+    - 블록마다 단 / 표 판정을 따로 해서, 다단 본문 아래의 표가 본문의 단 경계를 물려받지 않음
+    - 단 경계가 같은 이웃 블록은 합침 (두 단에 같은 높이의 빈 줄이 있어도 단 순서 유지)
+    - 박스가 너무 적어 단을 판단할 수 없는 블록은 앞 블록의 단 경계를 가로지르지 않으면 앞 블록에 붙임
+    """
+    boxes = as_boxes(boxes)
+    if not len(boxes):
+        return []
+    h = float(np.median(boxes[:, 3] - boxes[:, 1])) or 1.0
+    by_top = np.argsort(boxes[:, 1], kind="stable")
+    bottom = np.maximum.accumulate(boxes[by_top, 3])
+    cuts = np.flatnonzero(boxes[by_top[1:], 1] - bottom[:-1] > BLOCK_GAP * h) + 1
+
+    blocks = []
+    for idx in np.split(by_top, cuts):
+        gutters = detect_columns(boxes[idx])
+        if blocks:
+            prev_idx, prev_gutters = blocks[-1]
+            small = len(idx) < 4 and not _crosses(boxes[idx], prev_gutters)
+            if small or _same_gutters(gutters, prev_gutters, h):
+                blocks[-1] = (np.concatenate([prev_idx, idx]), prev_gutters)
+                continue
+        blocks.append((idx, gutters))
+    return blocks
+
+
+def _block_order(boxes, gutters):
+    """
+    한 블록 안의 읽기 순서 → (order, line_ids, column_ids)
+    """
+    n = len(boxes)
+    yc = (boxes[:, 1] + boxes[:, 3]) / 2
+    heights = boxes[:, 3] - boxes[:, 1]
+
+    xc = (boxes[:, 0] + boxes[:, 2]) / 2
+    column = np.searchsorted(gutters, xc)
+    crossing = ((boxes[:, 0, None] < gutters) & (boxes[:, 2, None] > gutters)).any(axis=1)
+    band = np.searchsorted(np.sort(yc[crossing]), yc, side="right")
+    column = np.where(crossing, -1, column)
+    if len(gutters):
+        # 띠 안에서 단 경계 양쪽이 표의 칸처럼 보이면 그 띠에서는 경계를 무시 (표는 행 순서로 읽음)
+        h = float(np.median(heights)) or 1.0
+        for b in np.unique(band[~crossing]).tolist():
+            in_band = (band == b) & ~crossing
+            sub = boxes[in_band]
+            active = [g for g in gutters.tolist()
+                      if not ((sub[:, 2] <= g).any() and (sub[:, 0] >= g).any() and _is_table_gap(sub, g, h))]
+            if len(active) < len(gutters):
+                column[in_band] = np.searchsorted(active, xc[in_band])
+
+    order = np.lexsort((yc, column, band))
+    same_group = (band[order][1:] == band[order][:-1]) & (column[order][1:] == column[order][:-1])
+    close = np.diff(yc[order]) <= LINE_TOLERANCE * np.minimum(heights[order][1:], heights[order][:-1])
+    new_line = np.concatenate(([True], ~(same_group & close)))
+    line = np.empty(n, dtype=np.int64)
+    line[order] = np.cumsum(new_line) - 1
+
+    order = np.lexsort((boxes[:, 0], line))
+    return order, line[order], column[order]
+
+
+def _order_blocks(boxes, blocks):
+    orders, lines, columns = [], [], []
+    offset = 0
+    for idx, gutters in blocks:
+        order, line, column = _block_order(boxes[idx], np.asarray(gutters, dtype=np.float64))
+        orders.append(idx[order])
+        lines.append(line + offset)
+        columns.append(column)
+        offset += int(line[-1]) + 1
+    return np.concatenate(orders), np.concatenate(lines), np.concatenate(columns)
+
+
+def _page_blocks(boxes, gutters):
+    # gutters를 직접 주면 페이지 전체를 한 블록으로 봄
+    if gutters is None:
+        return split_blocks(boxes)
+    return [(np.arange(len(boxes)), np.asarray(gutters, dtype=np.float64))]
+
+
+def reading_order(boxes, gutters=None):
+    """
+    bbox 배열의 읽기 순서 계산 → (order, line_ids, column_ids) (모두 읽기 순서 기준 배열)
+    - 페이지를 세로 빈 간격으로 블록으로 나눠 블록마다 단을 검출하고 위 블록부터 읽음 (split_blocks)
+    - 블록 안에서 단 경계를 가로지르는 줄(제목, 전체 폭 문단)은 띠(band)를 나누고, 띠 안에서는 단 → 줄 → x 순서
+    - 띠 안에서 단 경계 양쪽이 표의 칸이면 그 띠는 경계를 무시하고 행 순서로 읽음
+    - 같은 띠 / 단 안에서 y 중심 간격이 글자 높이의 절반 이하인 박스는 같은 줄
+      (column_ids는 블록 안의 단 번호, -1은 전체 폭 줄)
+    - gutters를 주면 블록을 나누지 않고 페이지 전체에 그 단 경계를 사용
+    """
+    boxes = as_boxes(boxes)
+    if len(boxes) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+    return _order_blocks(boxes, _page_blocks(boxes, gutters))
+
+
+def _line_starts(line_ids):
+    return np.flatnonzero(np.concatenate(([True], line_ids[1:] != line_ids[:-1])))
+
+
+def _union_boxes(boxes, starts):
+    # 정렬된 박스 배열을 starts 구간별로 합친 bbox (N구간, 4)
+    return np.stack([
+        np.minimum.reduceat(boxes[:, 0], starts), np.minimum.reduceat(boxes[:, 1], starts),
+        np.maximum.reduceat(boxes[:, 2], starts), np.maximum.reduceat(boxes[:, 3], starts),
+    ], axis=1)
+
+
+def _round(values):
+    return np.round(values, 1).tolist()
+
+
+def build_layout(boxes, texts, gutters=None):
+    """
+    박스별 텍스트를 읽기 순서로 재구성 → (text, layout, groups)
+    - text: 같은 줄은 공백, 줄 사이는 줄바꿈으로 이은 문자열
+    - layout: {"columns": 단 경계 x (블록별 경계를 합친 목록), "lines": [{"bbox", "column", "text"}, ...]}
+    - groups: 줄별 입력 박스 인덱스 리스트 (읽기 순서)
+    """
+    boxes = as_boxes(boxes)
+    if not len(boxes):
+        return "", {"columns": [], "lines": []}, []
+    blocks = _page_blocks(boxes, gutters)
+    order, line_ids, column_ids = _order_blocks(boxes, blocks)
+    gutters = np.unique(np.concatenate([np.asarray(g, dtype=np.float64) for _, g in blocks]))
+    starts = _line_starts(line_ids)
+    line_boxes = _union_boxes(boxes[order], starts)
+    bounds = np.append(starts, len(order)).tolist()
+    groups = [order[s:e].tolist() for s, e in zip(bounds[:-1], bounds[1:])]
+    line_texts = [" ".join(texts[i] for i in group if texts[i]) for group in groups]
+    lines = [
+        {"bbox": bbox, "column": column, "text": text}
+        for bbox, column, text in zip(_round(line_boxes), column_ids[starts].tolist(), line_texts)
+    ]
+    return "\n".join(line_texts), {"columns": _round(gutters), "lines": lines}, groups
+
+
+def page_layout(page, words=False):
+    """
+    PyMuPDF 페이지 텍스트를 한 번의 get_text("words") 호출로 구조화 추출 → (text, layout)
+    - PyMuPDF 줄(블록 / 줄 번호 기준) 단위로 bbox를 NumPy로 모아 단 / 읽기 순서 계산
+    - layout["blocks"]: 텍스트 블록 [{"bbox"}], layout["lines"]: 읽기 순서의 줄 [{"bbox", "column", "text"}]
+    - words=True 이면 줄마다 "words": [{"bbox", "text"}, ...] 포함
+    - 중첩 배열 없이 dict / 1차원 리스트만 사용 (Firestore에 그대로 저장 가능)
+    """
+    raw = page.get_text("words")
+    if not raw:
+        return "", {"columns": [], "blocks": [], "lines": []}
+    keys = np.array([w[5:8] for w in raw], dtype=np.int64)
+    word_order = np.lexsort((keys[:, 2], keys[:, 1], keys[:, 0]))
+    keys = keys[word_order]
+    word_boxes = np.array([raw[i][:4] for i in word_order.tolist()], dtype=np.float64)
+    word_texts = [raw[i][4] for i in word_order.tolist()]
+
+    # PyMuPDF 줄 단위 구간 / bbox
+    seg_starts = np.flatnonzero(np.concatenate(([True], (keys[1:, :2] != keys[:-1, :2]).any(axis=1))))
+    seg_bounds = np.append(seg_starts, len(keys)).tolist()
+    seg_boxes = _union_boxes(word_boxes, seg_starts)
+    seg_texts = [" ".join(word_texts[s:e]) for s, e in zip(seg_bounds[:-1], seg_bounds[1:])]
+
+    text, layout, groups = build_layout(seg_boxes, seg_texts)
+
+    block_starts = np.flatnonzero(np.concatenate(([True], keys[1:, 0] != keys[:-1, 0])))
+    layout["blocks"] = [{"bbox": bbox} for bbox in _round(_union_boxes(word_boxes, block_starts))]
+
+    if words:
+        rounded = _round(word_boxes)
+        for line, group in zip(layout["lines"], groups):
+            line["words"] = [
+                {"bbox": rounded[i], "text": word_texts[i]}
+                for seg in group
+                for i in range(seg_bounds[seg], seg_bounds[seg + 1])
+            ]
+    return text, layout
+
+
+def order_ocr_lines(lines):
+    """
+    OCR 줄 목록 [OcrLine, ...] 을 읽기 순서로 정렬 → (정렬된 줄, text, layout)
+    - layout 좌표는 ocr_data와 같은 렌더링 픽셀 좌표
+    """
+    if not lines:
+        return [], "", {"columns": [], "lines": []}
+    text, layout, groups = build_layout([line.box for line in lines], [line.text for line in lines])
+    return [lines[i] for group in groups for i in group], text, layout
+
+
+def ordered_text(items):
+    """
+    [(bbox, text), ...] 를 읽기 순서로 합친 문자열 (영역 OCR 결과와 내장 텍스트 병합용)
+    """
+    if not items:
+        return ""
+    text, _, _ = build_layout([bbox for bbox, _ in items], [t.strip() for _, t in items])
+    return text
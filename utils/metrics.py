@@ -0,0 +1,166 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key, extra=()):
+    items = list(key) + list(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+class MetricsRegistry:
+    """
+    프로세스 내 카운터 / 히스토그램 저장소 (Prometheus 텍스트 형식으로 내보내기)
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters = {}    # name → {label_key: value}
+        self._histograms = {}  # name → {label_key: [bucket_counts, sum, count]}
+        self._help = {}
+
+    def describe(self, name, help_text):
+        self._help[name] = help_text
+
+    def inc(self, name, value=1, **labels):
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            key = _label_key(labels)
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            key = _label_key(labels)
+            entry = series.get(key)
+            if entry is None:
+                entry = series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def snapshot(self):
+        """
+        현재 값을 딕셔너리로 반환 (UI 표시 / JSON 저장용)
+        """
+        with self._lock:
+            return {
+                "counters": {
+                    name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                    for name, series in self._counters.items()
+                },
+                "histograms": {
+                    name: [{"labels": dict(key), "sum": entry[1], "count": entry[2]} for key, entry in series.items()]
+                    for name, series in self._histograms.items()
+                },
+            }
+
+    def render_prometheus(self):
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(key)} {value}")
+            for name, series in sorted(self._histograms.items()):
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, (counts, total, count) in sorted(series.items()):
+                    for bound, bucket_count in zip(self.buckets, counts):
+                        lines.append(f"{name}_bucket{_format_labels(key, [('le', bound)])} {bucket_count}")
+                    lines.append(f"{name}_bucket{_format_labels(key, [('le', '+Inf')])} {count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {total:.6f}")
+                    lines.append(f"{name}_count{_format_labels(key)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """
+        node_exporter textfile collector 등에서 읽을 수 있도록 .prom 파일로 원자적 저장
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+REGISTRY = MetricsRegistry()
+REGISTRY.describe("pdf_stage_seconds", "Time spent per pipeline stage (per page or per document)")
+REGISTRY.describe("pdf_pages_total", "Pages processed by extraction method")
+REGISTRY.describe("pdf_documents_total", "Documents processed")
+REGISTRY.describe("pdf_triage_total", "Page triage decisions before rendering / OCR")
+
+
+@contextmanager
+def stage(timings, name):
+    """
+    with stage(timings, "render"): ... → timings["render"]에 경과 시간(초) 누적
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+
+
+def add_time(timings, name, seconds):
+    timings[name] = timings.get(name, 0.0) + seconds
+
+
+def record_page(timings, method, extraction_method, registry=REGISTRY):
+    """
+    페이지 단계별 시간을 히스토그램에, 페이지 수를 카운터에 기록
+    """
+    for stage_name, seconds in timings.items():
+        registry.observe("pdf_stage_seconds", seconds, stage=stage_name, method=method)
+    registry.inc("pdf_pages_total", method=method, extraction_method=extraction_method)
+
+
+def record_triage(triage, method, registry=REGISTRY):
+    """
+    페이지 분류 판정(text / ocr / blank)과 사유를 카운터에 기록 (판정 시간은 "triage" 단계 히스토그램)
+    """
+    registry.inc("pdf_triage_total", method=method, decision=triage["decision"], reason=triage["reason"])
+
+
+def record_document(timings, method, registry=REGISTRY):
+    for stage_name, seconds in timings.items():
+        registry.observe("pdf_stage_seconds", seconds, stage=stage_name, method=method, scope="document")
+    registry.inc("pdf_documents_total", method=method)
+
+
+def summarize(page_timings, document_timings=None):
+    """
+    페이지별 단계 시간 합계 + 문서 단위 단계 시간을 합쳐 {stage: 초} 반환
+    """
+    totals = {}
+    for timings in page_timings:
+        for name, seconds in timings.items():
+            totals[name] = totals.get(name, 0.0) + seconds
+    for name, seconds in (document_timings or {}).items():
+        totals[name] = totals.get(name, 0.0) + seconds
+    return {name: round(seconds, 4) for name, seconds in totals.items()}
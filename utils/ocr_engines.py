@@ -0,0 +1,401 @@
+"""
+OCR 엔진 추상화 (PaddleOCR / ONNX Runtime)
+
+- 모든 엔진은 ocr_pages(images)로 페이지별 [OcrLine, ...] 을 반환
+- configure_engine()으로 프로세스 기본 엔진을 고르고, get_engine()이 옵션 조합별로 하나씩 로드해 재사용
+- ONNX 엔진은 PaddleOCR 한국어 검출(det) / 인식(rec) / 방향 분류(cls, 선택) 모델을
+  paddle2onnx로 변환한 파일을 사용 (model_dir에 det.onnx, rec.onnx, cls.onnx, dict.txt)
+"""
+import os
+import math
+import time
+import threading
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+from utils.ocr_model import get_ocr_model
+
+
+class OcrLine(namedtuple("OcrLine", ["box", "text", "confidence"])):
+    """
+    엔진 공통 OCR 결과 한 줄
+    - box: 꼭짓점 4개 [[x, y], ...] (왼쪽 위부터 시계 방향, 원본 이미지 좌표)
+    """
+    __slots__ = ()
+
+    def to_dict(self):
+        return {"box": self.box, "text": self.text, "confidence": self.confidence}
+
+
+def _builtin_box(box):
+    return [[float(x), float(y)] for x, y in np.asarray(box, dtype=np.float64).reshape(4, 2)]
+
+
+def sorted_boxes(dt_boxes):
+    """
+    검출 박스를 위→아래, 왼→오른쪽 순서로 정렬 (PaddleOCR TextSystem과 동일한 규칙)
+    """
+    boxes = sorted(dt_boxes, key=lambda b: (b[0][1], b[0][0]))
+    for i in range(len(boxes) - 1):
+        for j in range(i, -1, -1):
+            if abs(boxes[j + 1][0][1] - boxes[j][0][1]) < 10 and boxes[j + 1][0][0] < boxes[j][0][0]:
+                boxes[j], boxes[j + 1] = boxes[j + 1], boxes[j]
+            else:
+                break
+    return boxes
+
+
+def crop_box(img, box):
+    """
+    4점 박스 영역을 원근 변환으로 잘라냄 (세로로 긴 라인은 90도 회전)
+    """
+    pts = np.asarray(box, dtype=np.float32)
+    width = int(max(np.linalg.norm(pts[0] - pts[1]), np.linalg.norm(pts[2] - pts[3])))
+    height = int(max(np.linalg.norm(pts[0] - pts[3]), np.linalg.norm(pts[1] - pts[2])))
+    dst = np.float32([[0, 0], [width, 0], [width, height], [0, height]])
+    matrix = cv2.getPerspectiveTransform(pts, dst)
+    crop = cv2.warpPerspective(img, matrix, (width, height),
+                               borderMode=cv2.BORDER_REPLICATE, flags=cv2.INTER_CUBIC)
+    if crop.shape[0] * 1.0 / max(crop.shape[1], 1) >= 1.5:
+        crop = np.rot90(crop)
+    return crop
+
+
+def ocr_input(img):
+    """
+    흑백(1채널) 렌더링은 OCR 직전에만 3채널로 변환 (대기열에서는 1/3 메모리로 유지)
+    """
+    if img.ndim == 3 and img.shape[2] == 1:
+        img = img[:, :, 0]
+    if img.ndim == 2:
+        return cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+    return img
+
+
+class OcrEngine:
+    """
+    OCR 엔진 공통 인터페이스
+    - ocr_pages(images): 페이지 이미지(ndarray, BGR / 흑백) 목록 → 페이지별 [OcrLine, ...]
+    - warm_up(): 작은 빈 이미지로 한 번 추론해 첫 페이지 지연 제거, 걸린 시간(초) 반환
+    - thread_safe: 여러 스레드에서 ocr_pages를 동시에 호출해도 되는지 (파이프라인 OCR 스레드 수 결정)
+    """
+    name = "base"
+    thread_safe = False
+
+    def ocr_pages(self, images):
+        raise NotImplementedError
+
+    def warm_up(self):
+        started = time.perf_counter()
+        self.ocr_pages([np.full((32, 128, 3), 255, dtype=np.uint8)])
+        return time.perf_counter() - started
+
+
+class PaddleEngine(OcrEngine):
+    """
+    PaddleOCR 엔진 (utils.ocr_model의 공유 인스턴스 사용)
+    - 텍스트 검출은 페이지별로, 인식은 모든 페이지의 라인을 모아 한 번의 배치 호출로 수행
+    - intra_op_threads → PaddleOCR cpu_threads (Paddle 추론기는 연산자 간 병렬 설정이 없어 inter_op_threads는 무시)
+    - 나머지 옵션은 PaddleOCR 생성자 인자로 전달
+    """
+    name = "paddle"
+
+    def __init__(self, intra_op_threads=None, inter_op_threads=None, **options):
+        if intra_op_threads:
+            options["cpu_threads"] = intra_op_threads
+        self.options = options
+
+    @property
+    def model(self):
+        return get_ocr_model(**self.options)
+
+    def ocr_pages(self, images):
+        model = self.model
+        images = [ocr_input(img) for img in images]
+        if len(images) == 1 or not hasattr(model, "text_recognizer"):
+            return [
+                [OcrLine(_builtin_box(box), text, float(confidence))
+                 for box, (text, confidence) in ((model.ocr(img) or [None])[0] or [])]
+                for img in images
+            ]
+
+        page_boxes = []
+        crops = []
+        for img in images:
+            dt_boxes, _ = model.text_detector(img)
+            boxes = sorted_boxes(list(dt_boxes)) if dt_boxes is not None else []
+            page_boxes.append(boxes)
+            crops.extend(crop_box(img, box) for box in boxes)
+
+        if not crops:
+            return [[] for _ in images]
+
+        if getattr(model, "use_angle_cls", False):
+            crops, _, _ = model.text_classifier(crops)
+        rec_res, _ = model.text_recognizer(crops)
+
+        drop_score = getattr(model, "drop_score", 0.5)
+        results = []
+        offset = 0
+        for boxes in page_boxes:
+            results.append([
+                OcrLine(_builtin_box(box), text, float(confidence))
+                for box, (text, confidence) in zip(boxes, rec_res[offset:offset + len(boxes)])
+                if confidence >= drop_score
+            ])
+            offset += len(boxes)
+        return results
+
+
+class OnnxEngine(OcrEngine):
+    """
+    ONNX Runtime CPU 엔진 (PaddleOCR 한국어 PP-OCR 모델을 ONNX로 변환해 사용)
+    - model_dir: det.onnx, rec.onnx, dict.txt (+ 선택 cls.onnx) / 개별 경로로 덮어쓸 수 있음
+    - int8=True 이면 det / rec 모델을 동적 int8 양자화한 사본(*.int8.onnx)을 만들어 사용 (처음 한 번만 생성)
+    - intra_op_threads: 연산자 내부 스레드 수, inter_op_threads: 연산자 간 병렬 스레드 수 (>1 이면 병렬 실행 모드)
+    - 전/후처리는 PaddleOCR 기본값과 동일 (검출 최대 변 960, DB 임계값 0.3 / 0.6, 인식 높이 48, CTC 그리디 디코딩)
+    """
+    name = "onnx"
+    thread_safe = True  # InferenceSession.run은 동시 호출 가능
+
+    DET_LIMIT_SIDE = 960
+    DET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+    DET_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+    DET_THRESH = 0.3
+    BOX_THRESH = 0.6
+    UNCLIP_RATIO = 1.5
+    MIN_BOX_SIZE = 3
+    MAX_CANDIDATES = 1000
+    REC_HEIGHT = 48
+    REC_MIN_WIDTH = 320
+    REC_BATCH = 16
+    CLS_SHAPE = (48, 192)
+    CLS_THRESH = 0.9
+
+    def __init__(self, model_dir=None, det_model=None, rec_model=None, cls_model=None, dict_path=None,
+                 int8=False, intra_op_threads=None, inter_op_threads=None, drop_score=0.5, use_space_char=True):
+        import onnxruntime as ort
+
+        def path(explicit, name):
+            if explicit:
+                return explicit
+            candidate = os.path.join(model_dir, name) if model_dir else None
+            return candidate if candidate and os.path.exists(candidate) else None
+
+        det_model, rec_model = path(det_model, "det.onnx"), path(rec_model, "rec.onnx")
+        cls_model, dict_path = path(cls_model, "cls.onnx"), path(dict_path, "dict.txt")
+        if not (det_model and rec_model and dict_path):
+            raise FileNotFoundError(f"ONNX OCR 모델을 찾을 수 없습니다 (det.onnx, rec.onnx, dict.txt): {model_dir}")
+        if int8:
+            det_model, rec_model = _quantized(det_model), _quantized(rec_model)
+
+        so = ort.SessionOptions()
+        so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            so.intra_op_num_threads = intra_op_threads
+        if inter_op_threads:
+            so.inter_op_num_threads = inter_op_threads
+        so.execution_mode = (ort.ExecutionMode.ORT_PARALLEL if (inter_op_threads or 1) > 1
+                             else ort.ExecutionMode.ORT_SEQUENTIAL)
+        providers = ["CPUExecutionProvider"]
+        self.det = ort.InferenceSession(det_model, so, providers=providers)
+        self.rec = ort.InferenceSession(rec_model, so, providers=providers)
+        self.cls = ort.InferenceSession(cls_model, so, providers=providers) if cls_model else None
+
+        with open(dict_path, "r", encoding="utf-8") as f:
+            chars = [line.rstrip("\r\n") for line in f]
+        self.characters = ["blank"] + chars + ([" "] if use_space_char else [])
+        self.drop_score = drop_score
+
+    # --- 검출 ---
+
+    def _det_input(self, img):
+        h, w = img.shape[:2]
+        ratio = min(1.0, self.DET_LIMIT_SIDE / max(h, w))
+        resize_h = max(int(round(h * ratio / 32) * 32), 32)
+        resize_w = max(int(round(w * ratio / 32) * 32), 32)
+        resized = cv2.resize(img, (resize_w, resize_h)).astype(np.float32) / 255.0
+        resized = (resized - self.DET_MEAN) / self.DET_STD
+        return resized.transpose(2, 0, 1)[None]
+
+    @staticmethod
+    def _mini_box(contour):
+        rect = cv2.minAreaRect(contour)
+        points = sorted(cv2.boxPoints(rect).tolist(), key=lambda p: p[0])
+        left = sorted(points[:2], key=lambda p: p[1])
+        right = sorted(points[2:], key=lambda p: p[1])
+        return np.array([left[0], right[0], right[1], left[1]], dtype=np.float32), min(rect[1])
+
+    @staticmethod
+    def _box_score(pred, box):
+        h, w = pred.shape
+        xmin, xmax = np.clip([np.floor(box[:, 0].min()), np.ceil(box[:, 0].max())], 0, w - 1).astype(int)
+        ymin, ymax = np.clip([np.floor(box[:, 1].min()), np.ceil(box[:, 1].max())], 0, h - 1).astype(int)
+        mask = np.zeros((ymax - ymin + 1, xmax - xmin + 1), dtype=np.uint8)
+        cv2.fillPoly(mask, [(box - [xmin, ymin]).astype(np.int32)], 1)
+        return cv2.mean(pred[ymin:ymax + 1, xmin:xmax + 1], mask)[0]
+
+    def _unclip(self, box):
+        # 사각형을 DB 논문의 offset 거리(면적 * ratio / 둘레)만큼 사방으로 확장 (pyclipper 없이 같은 결과)
+        rect = cv2.minAreaRect(box)
+        (cx, cy), (w, h), angle = rect
+        distance = w * h * self.UNCLIP_RATIO / max(2 * (w + h), 1e-6)
+        return cv2.boxPoints(((cx, cy), (w + 2 * distance, h + 2 * distance), angle))
+
+    def _detect(self, img):
+        pred = self.det.run(None, {self.det.get_inputs()[0].name: self._det_input(img)})[0][0, 0]
+        bitmap = (pred > self.DET_THRESH).astype(np.uint8) * 255
+        contours, _ = cv2.findContours(bitmap, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+        src_h, src_w = img.shape[:2]
+        scale = np.array([src_w / pred.shape[1], src_h / pred.shape[0]], dtype=np.float32)
+
+        boxes = []
+        for contour in contours[:self.MAX_CANDIDATES]:
+            box, short_side = self._mini_box(contour)
+            if short_side < self.MIN_BOX_SIZE or self._box_score(pred, box) < self.BOX_THRESH:
+                continue
+            box, short_side = self._mini_box(self._unclip(box).reshape(-1, 1, 2))
+            if short_side < self.MIN_BOX_SIZE + 2:
+                continue
+            box = np.clip(np.round(box * scale), 0, [src_w - 1, src_h - 1])
+            if np.linalg.norm(box[0] - box[1]) <= 3 or np.linalg.norm(box[0] - box[3]) <= 3:
+                continue
+            boxes.append(box)
+        return sorted_boxes(boxes)
+
+    # --- 방향 분류 / 인식 ---
+
+    @staticmethod
+    def _norm_resize(crop, height, width, max_width):
+        resized_w = min(max_width, int(math.ceil(height * crop.shape[1] / max(crop.shape[0], 1))))
+        resized = cv2.resize(crop, (max(resized_w, 1), height)).astype(np.float32) / 255.0
+        padded = np.zeros((3, height, width), dtype=np.float32)
+        padded[:, :, :resized.shape[1]] = ((resized - 0.5) / 0.5).transpose(2, 0, 1)
+        return padded
+
+    def _classify(self, crops):
+        h, w = self.CLS_SHAPE
+        name = self.cls.get_inputs()[0].name
+        for start in range(0, len(crops), self.REC_BATCH):
+            batch = np.stack([self._norm_resize(c, h, w, w) for c in crops[start:start + self.REC_BATCH]])
+            probs = self.cls.run(None, {name: batch})[0]
+            for i, prob in enumerate(probs):
+                if prob.argmax() == 1 and prob[1] > self.CLS_THRESH:
+                    crops[start + i] = cv2.rotate(crops[start + i], cv2.ROTATE_180)
+        return crops
+
+    def _decode(self, probs):
+        index, score = probs.argmax(axis=1), probs.max(axis=1)
+        keep = index != 0
+        keep[1:] &= index[1:] != index[:-1]
+        if not keep.any():
+            return "", 0.0
+        return "".join(self.characters[i] for i in index[keep]), float(score[keep].mean())
+
+    def _recognize(self, crops):
+        name = self.rec.get_inputs()[0].name
+        # 가로세로 비율이 비슷한 라인끼리 묶어 패딩 낭비를 줄임
+        order = np.argsort([c.shape[1] / max(c.shape[0], 1) for c in crops])
+        results = [None] * len(crops)
+        for start in range(0, len(crops), self.REC_BATCH):
+            chunk = order[start:start + self.REC_BATCH]
+            ratio = max(self.REC_MIN_WIDTH / self.REC_HEIGHT,
+                        max(crops[i].shape[1] / max(crops[i].shape[0], 1) for i in chunk))
+            width = int(self.REC_HEIGHT * ratio)
+            batch = np.stack([self._norm_resize(crops[i], self.REC_HEIGHT, width, width) for i in chunk])
+            probs = self.rec.run(None, {name: batch})[0]
+            for i, p in zip(chunk, probs):
+                results[i] = self._decode(p)
+        return results
+
+    def ocr_pages(self, images):
+        images = [ocr_input(img) for img in images]
+        page_boxes = [self._detect(img) for img in images]
+        crops = [crop_box(img, box) for img, boxes in zip(images, page_boxes) for box in boxes]
+        if not crops:
+            return [[] for _ in images]
+        if self.cls is not None:
+            crops = self._classify(crops)
+        rec_res = self._recognize(crops)
+
+        results = []
+        offset = 0
+        for boxes in page_boxes:
+            results.append([
+                OcrLine(_builtin_box(box), text, confidence)
+                for box, (text, confidence) in zip(boxes, rec_res[offset:offset + len(boxes)])
+                if confidence >= self.drop_score
+            ])
+            offset += len(boxes)
+        return results
+
+
+def _quantized(model_path):
+    """
+    동적 int8 양자화 모델 경로 (없으면 생성) - 가중치만 양자화하므로 보정 데이터가 필요 없음
+    """
+    out_path = os.path.splitext(model_path)[0] + ".int8.onnx"
+    if not os.path.exists(out_path) or os.path.getmtime(out_path) < os.path.getmtime(model_path):
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        # CPU ConvInteger 커널은 uint8 가중치만 지원
+        quantize_dynamic(model_path, out_path, weight_type=QuantType.QUInt8)
+    return out_path
+
+
+ENGINES = {
+    "paddle": PaddleEngine,
+    "onnx": OnnxEngine,
+}
+
+# 프로세스(또는 워커)당 옵션 조합별로 하나씩만 유지하는 엔진 인스턴스
+_engines = {}
+_lock = threading.Lock()
+_engine_config = {"engine": "paddle"}
+
+
+def configure_engine(engine=None, **options):
+    """
+    기본 OCR 엔진과 옵션 설정 (예: configure_engine("onnx", model_dir="models/ko", int8=True, intra_op_threads=4))
+    - 엔진을 바꾸면 이전 엔진 옵션은 지움
+    """
+    if engine is not None and engine != _engine_config["engine"]:
+        if engine not in ENGINES:
+            raise ValueError(f"알 수 없는 OCR 엔진: {engine} (사용 가능: {', '.join(ENGINES)})")
+        _engine_config.clear()
+        _engine_config["engine"] = engine
+    _engine_config.update(options)
+    return dict(_engine_config)
+
+
+def current_engine_config():
+    return dict(_engine_config)
+
+
+def get_engine(**overrides):
+    """
+    설정된 OCR 엔진 인스턴스 반환 (처음 호출될 때 로드)
+    """
+    options = {**_engine_config, **overrides}
+    key = tuple(sorted(options.items()))
+    engine = _engines.get(key)
+    if engine is not None:
+        return engine
+
+    with _lock:
+        engine = _engines.get(key)
+        if engine is None:
+            options = dict(options)
+            name = options.pop("engine")
+            started = time.perf_counter()
+            engine = ENGINES[name](**options)
+            _engines[key] = engine
+            if name != "paddle":  # PaddleOCR 로드 시간은 utils.ocr_model에서 출력
+                print(f"[✅ OCR 엔진 로드] {name} {options} ({time.perf_counter() - started:.2f}s)")
+    return engine
+
+
+def unload_engines():
+    with _lock:
+        _engines.clear()
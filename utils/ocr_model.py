@@ -0,0 +1,96 @@
+import sys
+import time
+import threading
+
+import numpy as np
+
+# 프로세스(또는 워커)당 옵션 조합별로 하나씩만 유지하는 PaddleOCR 인스턴스
+_models = {}
+_load_times = {}
+_lock = threading.Lock()
+
+_config = {
+    "lang": "korean",
+    "use_angle_cls": True,
+}
+
+
+def configure(**options):
+    """
+    기본 OCR 옵션 설정 (lang, use_angle_cls 및 PaddleOCR 생성자 인자)
+    - 이미 로드된 모델에는 영향을 주지 않고, 이후 get_ocr_model() 호출부터 적용
+    """
+    _config.update(options)
+    return dict(_config)
+
+
+def current_config():
+    return dict(_config)
+
+
+def _model_key(options):
+    return tuple(sorted(options.items()))
+
+
+def get_ocr_model(**overrides):
+    """
+    공유 PaddleOCR 인스턴스 반환 (처음 호출될 때 로드)
+    - paddleocr 임포트와 모델 로드를 실제로 OCR이 필요한 시점까지 미룸
+    """
+    options = {**_config, **overrides}
+    key = _model_key(options)
+
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _lock:
+        model = _models.get(key)
+        if model is None:
+            started = time.perf_counter()
+            from paddleocr import PaddleOCR
+            model = PaddleOCR(**options)
+            _load_times[key] = time.perf_counter() - started
+            _models[key] = model
+            print(f"[✅ OCR 모델 로드] {options} ({_load_times[key]:.2f}s)")
+    return model
+
+
+def warm_up(**overrides):
+    """
+    모델을 미리 로드하고 작은 빈 이미지로 한 번 추론해 첫 페이지 지연을 없앰
+    """
+    model = get_ocr_model(**overrides)
+    started = time.perf_counter()
+    model.ocr(np.full((32, 128, 3), 255, dtype=np.uint8))
+    return time.perf_counter() - started
+
+
+def is_loaded(**overrides):
+    return _model_key({**_config, **overrides}) in _models
+
+
+def load_times():
+    """
+    로드된 모델별 로드 시간(초) 반환
+    """
+    return {str(dict(key)): seconds for key, seconds in _load_times.items()}
+
+
+def unload():
+    with _lock:
+        _models.clear()
+        _load_times.clear()
+
+
+if __name__ == "__main__":
+    # 콜드 스타트 측정: python -m utils.ocr_model
+    started = time.perf_counter()
+    import utils.ocr_processor  # noqa: F401
+    print(f"utils.ocr_processor import: {time.perf_counter() - started:.2f}s "
+          f"(paddleocr loaded: {'paddleocr' in sys.modules})")
+
+    started = time.perf_counter()
+    get_ocr_model()
+    print(f"PaddleOCR load: {time.perf_counter() - started:.2f}s")
+    print(f"warm-up inference: {warm_up():.2f}s")
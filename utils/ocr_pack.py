@@ -0,0 +1,136 @@
+import json
+import base64
+
+import numpy as np
+
+PACKED_FORMAT = "packed-v1"
+INT16_MAX = np.iinfo(np.int16).max
+
+
+def _b64(array):
+    return base64.b64encode(np.ascontiguousarray(array).tobytes()).decode("ascii")
+
+
+def _unb64(data, dtype):
+    return np.frombuffer(base64.b64decode(data), dtype=dtype)
+
+
+def pack_ocr_data(ocr_data):
+    """
+    OCR 줄 목록 [{"box", "text", "confidence"}, ...] 을 배열 몇 개로 압축
+    - boxes: 줄마다 꼭짓점 4개 (x, y) → int16 (N, 8), 좌표가 int16 범위를 넘으면 int32
+    - confidence: float32 (N,)
+    - texts: 줄 텍스트를 이어 붙인 문자열 + 줄별 시작 위치 offsets int32 (N + 1,)
+    - 배열은 little-endian 바이트를 base64로 JSON에 기록
+    """
+    n = len(ocr_data)
+    boxes = np.rint(np.asarray([line["box"] for line in ocr_data], dtype=np.float32).reshape(n, 8))
+    box_dtype = "<i2" if n == 0 or np.abs(boxes).max() <= INT16_MAX else "<i4"
+    texts = [line["text"] for line in ocr_data]
+    offsets = np.zeros(n + 1, dtype="<i4")
+    np.cumsum([len(t) for t in texts], out=offsets[1:])
+    return {
+        "count": n,
+        "box_dtype": box_dtype,
+        "boxes": _b64(boxes.astype(box_dtype)),
+        "confidence": _b64(np.asarray([line["confidence"] for line in ocr_data], dtype="<f4")),
+        "texts": "".join(texts),
+        "text_offsets": _b64(offsets),
+    }
+
+
+class PackedOcrData:
+    """
+    압축된 OCR 결과의 가벼운 뷰 (배열은 디코딩한 버퍼를 복사 없이 참조)
+    - boxes: (N, 4, 2) 정수 배열, confidence: (N,) float32, texts: 줄 텍스트 (필요할 때 잘라냄)
+    - 인덱싱 / 순회하면 기존 형식의 줄 dict를 하나씩 만들어 반환
+    """
+
+    def __init__(self, packed):
+        self.count = packed["count"]
+        self.boxes = _unb64(packed["boxes"], packed["box_dtype"]).reshape(self.count, 4, 2)
+        self.confidence = _unb64(packed["confidence"], "<f4")
+        self.offsets = _unb64(packed["text_offsets"], "<i4")
+        self._texts = packed["texts"]
+
+    def __len__(self):
+        return self.count
+
+    def text(self, i):
+        return self._texts[self.offsets[i]:self.offsets[i + 1]]
+
+    @property
+    def texts(self):
+        return [self.text(i) for i in range(self.count)]
+
+    def __getitem__(self, i):
+        if not -self.count <= i < self.count:
+            raise IndexError(i)
+        i %= self.count
+        return {"box": self.boxes[i].tolist(), "text": self.text(i), "confidence": float(self.confidence[i])}
+
+    def __iter__(self):
+        return (self[i] for i in range(self.count))
+
+    def to_list(self):
+        return list(self)
+
+
+def _pack_entry(entry):
+    entry = dict(entry)
+    if "ocr_data" in entry:
+        entry["ocr_packed"] = pack_ocr_data(entry.pop("ocr_data"))
+    return entry
+
+
+def pack_page(page_info):
+    """
+    page_info의 ocr_data (예전 영역 OCR 결과면 regions[*].ocr_data 포함)를 ocr_packed로 바꾼 사본 반환
+    """
+    page_info = _pack_entry(page_info)
+    if "regions" in page_info:
+        page_info["regions"] = [_pack_entry(region) for region in page_info["regions"]]
+    return page_info
+
+
+def pack_result(result):
+    """
+    추출 결과 전체의 OCR 데이터를 압축 형식으로 바꾼 사본 반환 (ocr_format="packed-v1")
+    """
+    packed = {k: v for k, v in result.items() if k != "pages"}
+    packed["ocr_format"] = PACKED_FORMAT
+    packed["pages"] = {key: pack_page(page_info) for key, page_info in result["pages"].items()}
+    for key in ("ocr_pages_count", "timings"):  # 기존 결과와 같은 필드 순서 유지
+        if key in packed:
+            packed[key] = packed.pop(key)
+    return packed
+
+
+def _unpack_entry(entry, lazy):
+    if "ocr_packed" in entry:
+        data = PackedOcrData(entry.pop("ocr_packed"))
+        entry["ocr_data"] = data if lazy else data.to_list()
+
+
+def unpack_result(result, lazy=True):
+    """
+    압축 형식 결과의 ocr_packed를 ocr_data로 복원 (제자리 변경)
+    - lazy=True 이면 PackedOcrData 뷰, False 이면 기존과 같은 dict 리스트
+    """
+    for page_info in result.get("pages", {}).values():
+        _unpack_entry(page_info, lazy)
+        for region in page_info.get("regions", ()):
+            _unpack_entry(region, lazy)
+    result.pop("ocr_format", None)
+    return result
+
+
+def load_result(json_path, lazy=True):
+    """
+    추출 결과 JSON 읽기 (기존 형식 / 압축 형식 모두 지원)
+    """
+    with open(json_path, "r", encoding="utf-8") as f:
+        result = json.load(f)
+    if result.get("ocr_format") == PACKED_FORMAT:
+        unpack_result(result, lazy)
+    return result
@@ -1,25 +1,50 @@
 import os, json
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import cv2
 import numpy as np
-from pdf2image import convert_from_path
-from paddleocr import PaddleOCR
-from PIL import Image
 import fitz  # PyMuPDF
-import pdfplumber  # 추가
 
-# PaddleOCR 초기화
-ocr_model = PaddleOCR(use_angle_cls=True, lang='korean')
-
-
-def pdf_to_images(pdf_path, image_dir, dpi=200):
+from utils.ocr_model import configure, current_config, get_ocr_model
+from utils.ocr_engines import ENGINES, configure_engine, current_engine_config, get_engine
+from utils.extract_cache import config_fingerprint, text_key, ocr_key
+from utils.result_writer import StreamingResultWriter, is_ocr_page
+from utils.pdf_source import open_fitz, open_plumber, source_sha256, source_label, spilled_path
+from utils.regions import text_blocks, find_ocr_regions, merge_region_text, offset_boxes
+from utils.layout import page_layout, order_ocr_lines, ordered_text
+from utils.triage import triage_page
+from utils.render import (adaptive_dpi, plumber_adaptive_dpi, cap_dpi, render_page, iter_page_images,
+                          pixels_for_budget, release_plumber_page, DEFAULT_MAX_PIXELS)
+from utils.metrics import stage, add_time, record_page, record_document, record_triage, summarize
+from utils.ocr_pack import PACKED_FORMAT, pack_page, pack_result
+from utils.pipeline import Pipeline, Stage, aiter_callback
+
+
+def __getattr__(name):
+    # 기존 코드 호환용: ocr_processor.ocr_model 접근 시점에 모델 로드
+    if name == "ocr_model":
+        return get_ocr_model()
+    raise AttributeError(name)
+
+
+def iter_pdf_images(pdf_path, image_dir, dpi=200, max_page_bytes=None):
+    """
+    페이지를 한 장씩 렌더링 → JPEG 저장 → 이미지 해제 후 경로 반환 (run_ocr에 바로 넘길 수 있음)
+    - 메모리에는 항상 한 페이지만 있으므로 500페이지 스캔본도 페이지 수와 관계없이 메모리 사용이 일정함
+    - max_page_bytes: 페이지 한 장의 래스터 메모리 상한 (넘는 페이지는 DPI를 낮춰 렌더링)
+    """
     os.makedirs(image_dir, exist_ok=True)
-    images = convert_from_path(pdf_path, dpi=dpi)
-    image_paths = []
-    for idx, img in enumerate(images):
-        path = os.path.join(image_dir, f'page_{idx+1}.jpg')
+    for page_number, img in iter_page_images(pdf_path, dpi, max_pixels=pixels_for_budget(max_page_bytes)):
+        path = os.path.join(image_dir, f'page_{page_number}.jpg')
         img.save(path, 'JPEG')
-        image_paths.append(path)
-    return image_paths
+        img.close()
+        yield path
+
+
+def pdf_to_images(pdf_path, image_dir, dpi=200, max_page_bytes=None):
+    return list(iter_pdf_images(pdf_path, image_dir, dpi, max_page_bytes))
 
 
 def to_builtin(obj):
@@ -41,24 +66,11 @@ def run_ocr(image_paths, output_path):
 
     for path in image_paths:
         try:
-            ocr_result = ocr_model.ocr(path)
-            cleaned_result = []
-
-            for line in ocr_result[0]:
-                try:
-                    box, (text, confidence) = line[:2]  # 첫 2개 요소만 추출
-                    if isinstance(box, np.ndarray):
-                        box = box.tolist()
-                    cleaned_result.append({
-                        'box': box,
-                        'text': text,
-                        'confidence': float(confidence)
-                    })
-                except Exception as e:
-                    print(f"[⚠️ 경고] line unpack 실패 - {line}: {str(e)}")
-                    continue
-
-            result[os.path.basename(path)] = cleaned_result
+            img = cv2.imread(path)
+            if img is None:
+                raise ValueError(f"이미지를 읽을 수 없습니다: {path}")
+            lines = ocr_images([img])[0]
+            result[os.path.basename(path)] = [line.to_dict() for line in lines]
             print(f"[✅ OCR 성공] {path}")
 
         except Exception as e:
@@ -71,14 +83,149 @@ def run_ocr(image_paths, output_path):
     return output_path
 
 
-def hybrid_extract(pdf_path, image_dir, output_json_path, min_chars=20, dpi=200):
+class _PixmapArray:
+    # ndarray의 base로 남아 픽스맵이 배열보다 먼저 해제되지 않게 붙잡아 둠
+    def __init__(self, pix):
+        self.pix = pix
+        self.__array_interface__ = {
+            "shape": (pix.height, pix.width, pix.n),
+            "typestr": "|u1",
+            "data": (pix.samples_ptr, False),
+            "strides": (pix.stride, pix.n, 1),
+            "version": 3,
+        }
+
+
+def pixmap_to_array(pix):
     """
-    PyMuPDF 기반 하이브리드 텍스트 + OCR 추출
+    fitz.Pixmap 버퍼를 복사 없이 (H, W, C) uint8 배열로 감쌈
+    - 배열이 픽스맵을 참조하므로 배열이 쓰이는 동안 픽스맵 버퍼가 유지됨
+    - PyMuPDF는 RGB 순서지만 문서 OCR은 채널 순서에 둔감하므로 BGR 변환(복사)은 생략
     """
-    os.makedirs(os.path.dirname(output_json_path), exist_ok=True)
-    doc = fitz.open(pdf_path)
-    total_pages = len(doc)
+    return np.asarray(_PixmapArray(pix))
+
+
+# 동시 호출을 지원하지 않는 엔진(thread_safe=False, PaddleOCR)은 프로세스 안에서 한 번에 하나씩만 OCR
+# (앱의 동시 작업 / 배치 실행의 여러 문서 스레드가 같은 엔진 인스턴스를 공유)
+_ocr_lock = threading.Lock()
+
+
+def ocr_images(images):
+    """
+    여러 페이지 이미지(ndarray)를 설정된 OCR 엔진으로 한 번에 OCR 해서 페이지별 [OcrLine, ...] 반환
+    (엔진 선택: utils.ocr_engines.configure_engine)
+    - thread_safe가 아닌 엔진은 _ocr_lock으로 호출을 직렬화
+    """
+    engine = get_engine()
+    if engine.thread_safe:
+        return engine.ocr_pages(images)
+    with _ocr_lock:
+        return engine.ocr_pages(images)
+
+
+def _fill_ocr_fields(page_info, lines, img_path=None, ordered=False):
+    """
+    OCR 줄을 page_info에 기록
+    - ordered=True 이면 줄을 읽기 순서(단 / 줄 / x)로 정렬해 줄 단위 줄바꿈으로 텍스트 구성
+      (페이지 단위 결과에는 layout도 기록, 영역 결과에는 생략)
+    """
+    if ordered:
+        lines, ocr_text, layout = order_ocr_lines(lines)
+        if "extraction_method" in page_info:
+            page_info["layout"] = layout
+    else:
+        ocr_text = " ".join(line.text for line in lines)
+
+    page_info["text"] = ocr_text.strip()
+    page_info["ocr_data"] = [line.to_dict() for line in lines]
+    if img_path:
+        page_info["image_path"] = img_path
+
+
+def _flush_ocr(pending, ordered=False):
+    """
+    대기 중인 OCR 페이지들을 배치 OCR 하고 page_info에 결과 기록
+    - pending: (page_info, image, img_path) 리스트
+    - ordered=True 이면 OCR 줄을 읽기 순서로 정렬 (구조화 추출 모드)
+    - 배치 호출이 실패하면 페이지별로 다시 시도해서 실패한 페이지만 에러로 남김
+    - OCR에 성공한 page_info 리스트 반환
+    """
+    if not pending:
+        return []
+
+    done = []
+    started = time.perf_counter()
+    try:
+        batch_lines = ocr_images([image for _, image, _ in pending])
+        # 배치 OCR 시간은 배치에 포함된 이미지 수로 나눠 각 페이지에 배분
+        share = (time.perf_counter() - started) / len(pending)
+        for page_info, _, _ in pending:
+            if "_timings" in page_info:
+                add_time(page_info["_timings"], "ocr", share)
+        for (page_info, _, img_path), lines in zip(pending, batch_lines):
+            _fill_ocr_fields(page_info, lines, img_path, ordered)
+            done.append(page_info)
+    except Exception as batch_error:
+        if len(pending) == 1:
+            page_info = pending[0][0]
+            page_info["error"] = str(batch_error)
+            print(f"[에러] OCR 실패 - 페이지 {page_info['page_number']}: {str(batch_error)}")
+        else:
+            for item in pending:
+                done.extend(_flush_ocr([item], ordered))
+
+    pending.clear()
+    return done
+
+
+def _page_chunks(total_pages, workers, align=1):
+    """
+    페이지 범위를 (start, stop) 구간으로 분할 (워커 수의 4배 정도로 잘게 나눠 부하 분산)
+    - 구간 크기를 align의 배수로 맞춰 OCR 배치 구성이 직렬 처리와 같아지도록 함
+    """
+    chunk_size = max(1, -(-total_pages // (workers * 4)))
+    chunk_size = -(-chunk_size // align) * align
+    return [(start, min(start + chunk_size, total_pages)) for start in range(0, total_pages, chunk_size)]
+
+
+def _init_worker(ocr_options, engine_options):
+    configure(**ocr_options)
+    configure_engine(**engine_options)
+
+
+def make_process_pool(workers):
+    """
+    페이지 처리용 프로세스 풀 생성
+    - 여러 문서가 한 풀을 함께 쓰려면 hybrid_extract(..., executor=pool) 로 전달
+    """
+    ctx = multiprocessing.get_context("spawn")
+    engine_options = current_engine_config()
+    # 스레드 수를 정하지 않았으면 코어를 워커끼리 나눠 써서 과다 구독 방지
+    engine_options.setdefault("intra_op_threads", max(1, (os.cpu_count() or 1) // max(workers, 1)))
+    return ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                               initializer=_init_worker, initargs=(current_config(), engine_options))
+
+
+def _iter_parallel(worker_fn, pdf_path, total_pages, workers, opts, executor=None):
+    """
+    페이지 구간을 프로세스 풀에 분배하고 페이지 순서대로 결과를 하나씩 반환
+    - 각 워커는 PDF를 직접 열기 때문에 fitz/pdfplumber 객체는 pickle 되지 않음
+    - 워커 프로세스는 풀이 살아 있는 동안 유지되므로 OCR 모델도 워커당 하나만 로드됨
+      (OCR 옵션만 워커에 전달하고, 모델은 OCR이 필요한 첫 페이지에서 로드)
+    - executor를 주면 그 풀을 공유하고, 없으면 이 문서용 풀을 만들어 씀
+    """
+    if executor is None:
+        with make_process_pool(workers) as executor:
+            yield from _iter_parallel(worker_fn, pdf_path, total_pages, workers, opts, executor)
+        return
+
+    chunks = _page_chunks(total_pages, workers, align=opts["ocr_batch_size"])
+    futures = [executor.submit(worker_fn, pdf_path, start, stop, opts) for start, stop in chunks]
+    for future in futures:  # submit 순서대로 받으므로 페이지 순서 유지
+        yield from future.result()
 
+
+def _build_result(pdf_path, total_pages, min_chars, dpi, page_infos):
     result = {
         "pdf_path": pdf_path,
         "total_pages": total_pages,
@@ -88,120 +235,732 @@ def hybrid_extract(pdf_path, image_dir, output_json_path, min_chars=20, dpi=200)
         "ocr_pages_count": 0
     }
 
-    for page_num in range(total_pages):
-        page = doc.load_page(page_num)
-        text = page.get_text()
-        char_count = len(text.strip())
-
-        page_info = {
-            "page_number": page_num + 1,
-            "char_count": char_count,
-            "extraction_method": "text" if char_count >= min_chars else "ocr",
-            "text": text if char_count >= min_chars else ""
-        }
-
-        if char_count < min_chars:
+    for page_info in page_infos:
+        if is_ocr_page(page_info):
             result["ocr_pages_count"] += 1
+        result["pages"][f"page_{page_info['page_number']}"] = page_info
+
+    return result
+
+
+def _make_page_info(page_number, text, min_chars, timings=None):
+    char_count = len(text.strip())
+    page_info = {
+        "page_number": page_number,
+        "char_count": char_count,
+        "extraction_method": "text" if char_count >= min_chars else "ocr",
+        "text": text if char_count >= min_chars else ""
+    }
+    if timings is not None:
+        page_info["_timings"] = timings  # 단계별 시간 (결과 정리 시 제거되거나 "timings"로 기록)
+    return page_info
+
+
+def _cached_entry(opts, page_number, extract):
+    """
+    페이지 텍스트 레이어 추출 결과 dict (캐시가 있으면 캐시 우선)
+    """
+    cache = opts.get("cache")
+    if cache is None:
+        return extract()
+    key = text_key(opts["pdf_hash"], opts["method"], page_number)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    entry = extract()
+    cache.put(key, entry)
+    return entry
+
+
+def _cached_text(opts, page_number, extract):
+    return _cached_entry(opts, page_number, lambda: {"text": extract()})["text"]
+
+
+def _cached_layout(opts, page_number, page):
+    """
+    구조화 추출 모드의 페이지 텍스트 + layout (get_text("words") 한 번으로 추출, 캐시 우선)
+    """
+    def extract():
+        text, layout = page_layout(page)
+        return {"text": text, "layout": layout}
+    entry = _cached_entry(opts, page_number, extract)
+    return entry["text"], entry["layout"]
+
+
+def _cached_ocr(opts, page_info):
+    """
+    캐시된 OCR 결과가 있으면 page_info에 채우고 True 반환
+    """
+    cache = opts.get("cache")
+    if cache is None:
+        return False
+    cached = cache.get(ocr_key(opts["pdf_hash"], opts["method"], page_info["page_number"], opts["dpi"],
+                               opts.get("ocr_config")))
+    if cached is None:
+        return False
+    if "dpi" in cached:
+        page_info["dpi"] = cached["dpi"]
+    page_info["text"] = cached["text"]
+    page_info["ocr_data"] = cached["ocr_data"]
+    if "layout" in cached:
+        page_info["layout"] = cached["layout"]
+    return True
+
+
+def _store_ocr(opts, page_infos):
+    cache = opts.get("cache")
+    if cache is None:
+        return
+    for page_info in page_infos:
+        if page_info.get("extraction_method") != "ocr":  # 영역 OCR 결과는 페이지 캐시 대상이 아님
+            continue
+        entry = {"text": page_info["text"], "ocr_data": page_info["ocr_data"]}
+        if "dpi" in page_info:
+            entry["dpi"] = page_info["dpi"]
+        if "layout" in page_info:
+            entry["layout"] = page_info["layout"]
+        cache.put(ocr_key(opts["pdf_hash"], opts["method"], page_info["page_number"], opts["dpi"],
+                          opts.get("ocr_config")), entry)
+
+
+def _apply_triage(page, page_info, text, min_chars):
+    """
+    렌더링 / OCR 전에 페이지를 분류해 page_info["triage"]에 판정과 비용 기록
+    - 빈 페이지: extraction_method="blank" (렌더링 / OCR 생략, 텍스트 레이어는 그대로)
+    - 깨진 텍스트 레이어: extraction_method="ocr" (텍스트 레이어 대신 OCR 결과 사용)
+    """
+    triage = triage_page(page, text, min_chars)
+    page_info["triage"] = triage
+    if triage["decision"] == "blank":
+        page_info["extraction_method"] = "blank"
+        page_info["text"] = text.strip()
+    elif triage["reason"] == "garbled_text":
+        page_info["extraction_method"] = "ocr"
+        page_info["text"] = ""
+
+
+def _page_dpi(page, page_info, opts):
+    """
+    페이지 OCR 렌더링 DPI 결정
+    - dpi="auto": 미리보기로 글자 크기를 추정해 페이지별 DPI 선택 (page_info["dpi"]에 기록)
+    - max_pixels가 있으면 렌더링 픽셀 수 제한
+    """
+    if "dpi" in page_info:
+        return page_info["dpi"]
+    if opts["dpi"] == "auto":
+        dpi = adaptive_dpi(page, opts["max_pixels"])
+    else:
+        dpi = cap_dpi(page.rect.width, page.rect.height, opts["dpi"], opts["max_pixels"])
+    if opts["dpi"] == "auto" or dpi != opts["dpi"]:
+        page_info["dpi"] = dpi
+    return dpi
+
+
+def _plan_regions(page, page_info, opts):
+    """
+    영역 OCR 모드에서 OCR할 영역 목록 반환 (없으면 None → 기존 페이지 단위 처리)
+    - 텍스트 레이어가 조금이라도 있고 이미지 영역이 페이지 대부분을 덮지 않을 때만 영역 OCR
+    """
+    if opts.get("ocr_mode") != "region" or page_info["char_count"] == 0:
+        return None
+    if page_info.get("triage", {}).get("reason") in ("no_ink", "garbled_text"):  # 빈 페이지 / 페이지 전체 OCR
+        return None
+    with stage(page_info["_timings"], "layout"):
+        if "layout" in page_info:  # 구조화 추출 모드: 텍스트 레이어를 다시 추출하지 않고 줄 bbox 사용
+            blocks = [(fitz.Rect(line["bbox"]), line["text"]) for line in page_info["layout"]["lines"]]
+        else:
+            blocks = text_blocks(page)
+        regions = find_ocr_regions(page, blocks)
+    if not regions:
+        return None
+    area_ratio = sum(r.get_area() for r in regions) / page.rect.get_area()
+    if page_info["extraction_method"] == "ocr" and area_ratio >= 0.8:
+        return None
+    return blocks, regions, area_ratio
+
+
+def _queue_regions(page, page_info, plan, opts, pending):
+    """
+    OCR 영역만 잘라서 렌더링해 배치 OCR 대기열에 추가
+    """
+    blocks, regions, area_ratio = plan
+    dpi = _page_dpi(page, page_info, opts)
+    page_info["extraction_method"] = "mixed"
+    page_info["ocr_area_ratio"] = round(area_ratio, 4)
+    page_info["regions"] = []
+    timings = page_info["_timings"]
+    for index, rect in enumerate(regions):
+        with stage(timings, "render"):
+            pix = render_page(page, dpi, opts["grayscale"], clip=rect)
+        region = {
+            "page_number": page_info["page_number"],
+            "bbox": [round(v, 2) for v in (rect.x0, rect.y0, rect.x1, rect.y1)],
+            "_offset": (pix.x, pix.y),
+            "_timings": timings,
+        }
+        img_path = None
+        if opts["save_images"]:
+            os.makedirs(opts["image_dir"], exist_ok=True)
+            img_path = os.path.join(opts["image_dir"], f"page_{page_info['page_number']}_region_{index + 1}.jpg")
+            with stage(timings, "save_image"):
+                pix.save(img_path)
+        page_info["regions"].append(region)
+        pending.append((region, pixmap_to_array(pix), img_path))
+    page_info["_blocks"] = blocks
+
+
+def _finish_regions(page_info):
+    """
+    영역 OCR 결과를 페이지 좌표로 옮기고 내장 텍스트와 합침
+    - OCR 줄은 페이지 ocr_data에 한 번만 두고, 영역에는 그 구간 [시작, 끝) 만 기록 (region["ocr_lines"])
+    """
+    if "_blocks" not in page_info:
+        return
+    ocr_data = []
+    for region in page_info["regions"]:
+        region.pop("page_number", None)
+        region.pop("_timings", None)
+        dx, dy = region.pop("_offset")
+        lines = offset_boxes(region.pop("ocr_data", []), dx, dy)
+        region["ocr_lines"] = [len(ocr_data), len(ocr_data) + len(lines)]
+        ocr_data.extend(lines)
+    blocks = page_info.pop("_blocks")
+    if "layout" in page_info:
+        items = [(tuple(rect), text) for rect, text in blocks]
+        items += [(region["bbox"], region.get("text", "")) for region in page_info["regions"]]
+        page_info["text"] = ordered_text(items)
+    else:
+        page_info["text"] = merge_region_text(blocks, page_info["regions"])
+    page_info["ocr_data"] = ocr_data
+
+
+def _prepare_hybrid_page(doc, page_num, opts):
+    """
+    OCR 전 단계: 텍스트 레이어 추출 → (분류) → OCR할 페이지 / 영역 렌더링
+    - (page_info, [(OCR 결과를 기록할 dict, 이미지, 이미지 경로), ...]) 반환
+    """
+    image_dir = opts["image_dir"]
+    ordered = opts.get("layout", False)
+    pending = []
+    timings = {}
+    with stage(timings, "text"):
+        page = doc.load_page(page_num)
+        if ordered:
+            text, layout = _cached_layout(opts, page_num + 1, page)
+        else:
+            text = _cached_text(opts, page_num + 1, page.get_text)
+    page_info = _make_page_info(page_num + 1, text, opts["min_chars"], timings)
+    if ordered:
+        page_info["layout"] = layout
+    if opts.get("triage"):
+        with stage(timings, "triage"):
+            _apply_triage(page, page_info, text, opts["min_chars"])
+    plan = _plan_regions(page, page_info, opts)
+
+    if plan is not None:
+        page_info["text"] = text
+        _queue_regions(page, page_info, plan, opts, pending)
+    elif page_info["extraction_method"] == "ocr" and not _cached_ocr(opts, page_info):
+        with stage(timings, "render"):
+            pix = render_page(page, _page_dpi(page, page_info, opts), opts["grayscale"])
+        img_path = None
+        if opts["save_images"]:
             os.makedirs(image_dir, exist_ok=True)
-            pix = page.get_pixmap(matrix=fitz.Matrix(dpi/72, dpi/72))
             img_path = os.path.join(image_dir, f"page_{page_num + 1}.jpg")
-            pix.save(img_path)
+            with stage(timings, "save_image"):
+                pix.save(img_path)
+        pending.append((page_info, pixmap_to_array(pix), img_path))
+    return page_info, pending
 
-            try:
-                ocr_result = ocr_model.ocr(img_path)
-                ocr_text = ""
-                ocr_data = []
 
-                if ocr_result and ocr_result[0]:
-                    for line in ocr_result[0]:
-                        box, (text, confidence) = line
-                        ocr_text += text + " "
-                        ocr_data.append({
-                            'box': to_builtin(box),
-                            'text': text,
-                            'confidence': float(confidence)
-                        })
+def _complete_pages(page_infos, pending, opts):
+    """
+    OCR 단계: 대기 중인 이미지를 배치 OCR 하고 캐시 기록 / 영역 결과 병합까지 마침
+    """
+    _store_ocr(opts, _flush_ocr(pending, opts.get("layout", False)))
+    for page_info in page_infos:
+        _finish_regions(page_info)
+    return page_infos
+
+
+def _iter_hybrid_pages(pdf_path, start, stop, opts):
+    """
+    PyMuPDF로 [start, stop) 구간 페이지를 처리해 완료된 page_info를 페이지 순서대로 반환
+    - opts["skip_pages"]에 있는 페이지(이전 실행에서 완료된 페이지)는 건너뜀
+    - OCR 대상 페이지는 픽스맵 버퍼를 그대로 OCR 엔진에 넘기고 ocr_batch_size 페이지 단위로 배치 OCR
+    - save_images=True 일 때만 디버깅용 이미지를 image_dir에 저장
+    - ocr_mode="region" 이면 텍스트가 있는 페이지의 이미지 영역만 잘라서 OCR
+    - opts["layout"] 이면 텍스트 레이어 / OCR 줄을 읽기 순서로 재구성하고 page_info["layout"] 기록
+    - opts["triage"] 이면 렌더링 전에 빈 페이지(OCR 생략)와 깨진 텍스트 레이어(OCR 대상)를 가려냄
+    - opts["pipeline"] 이면 렌더링과 OCR을 별도 스레드 단계로 겹쳐서 실행 (_iter_pipelined_pages)
+    """
+    if opts.get("pipeline"):
+        yield from _iter_pipelined_pages(pdf_path, start, stop, opts)
+        return
+
+    batch_size = opts["ocr_batch_size"]
+    skip_pages = opts.get("skip_pages") or ()
+    doc = open_fitz(pdf_path)
+    page_infos = []
+    pending = []
+
+    for page_num in range(start, stop):
+        if page_num + 1 in skip_pages:
+            continue
+        page_info, page_pending = _prepare_hybrid_page(doc, page_num, opts)
+        page_infos.append(page_info)
+        pending.extend(page_pending)
+
+        # 배치 경계는 절대 페이지 번호 기준 (병렬 구간 분할과 무관하게 같은 배치 구성)
+        if (page_num + 1) % batch_size == 0:
+            yield from _complete_pages(page_infos, pending, opts)
+            page_infos.clear()
+
+    doc.close()
+    yield from _complete_pages(page_infos, pending, opts)
 
-                page_info["text"] = ocr_text.strip()
-                page_info["ocr_data"] = ocr_data
-                page_info["image_path"] = img_path
 
-            except Exception as e:
-                page_info["error"] = str(e)
-                print(f"[에러] OCR 실패 - 페이지 {page_num + 1}: {str(e)}")
+def _ocr_workers(requested):
+    # 동시 호출을 지원하지 않는 엔진(PaddleOCR)은 OCR 스레드를 하나로 제한
+    engine_cls = ENGINES[current_engine_config()["engine"]]
+    return max(1, requested) if engine_cls.thread_safe else 1
 
-        result["pages"][f"page_{page_num + 1}"] = page_info
 
+def _iter_pipelined_pages(pdf_path, start, stop, opts):
+    """
+    렌더링 → OCR → 기록 단계를 크기 제한 큐로 연결해 겹쳐서 실행 (utils.pipeline.Pipeline)
+    - 렌더링 단계: 텍스트 추출 / 분류 / 렌더링 (PyMuPDF는 멀티스레드를 지원하지 않으므로 스레드 하나)
+    - OCR 단계: opts["ocr_workers"]개 스레드, 도착해 있는 페이지를 ocr_batch_size개까지 모아 배치 OCR
+    - 기록 단계: 이 제너레이터를 순회하는 쪽 (직렬화 / NDJSON 기록) - 페이지 순서대로 받음
+    - 큐 크기(opts["queue_size"]) 만큼만 앞서 렌더링하므로 OCR이 밀려도 메모리 사용은 제한됨
+    - 단계별 처리 / 대기 시간은 opts["_pipeline_stats"]에 누적 (timings=True 이면 결과 JSON에 기록)
+    """
+    skip_pages = opts.get("skip_pages") or ()
+    doc = open_fitz(pdf_path)
+
+    def render(page_num):
+        page_info, pending = _prepare_hybrid_page(doc, page_num, opts)
+        # 픽스맵은 렌더링 스레드에서 해제되도록 이미지를 복사해서 넘김
+        return page_info, [(target, np.array(image), img_path) for target, image, img_path in pending]
+
+    def ocr(works):
+        return _complete_pages([page_info for page_info, _ in works],
+                               [item for _, pending in works for item in pending], opts)
+
+    batch = opts["ocr_batch_size"]
+    pipeline = Pipeline([
+        Stage("render", render),
+        # batch=1 단계는 항목 하나로 호출되므로 리스트로 감싸서 넘김
+        Stage("ocr", ocr if batch > 1 else lambda work: ocr([work])[0],
+              workers=_ocr_workers(opts.get("ocr_workers", 1)), batch=batch),
+    ], queue_size=opts.get("queue_size", 4))
+    try:
+        yield from pipeline.run(n for n in range(start, stop) if n + 1 not in skip_pages)
+    finally:
+        doc.close()
+        stats = opts.setdefault("_pipeline_stats", {})
+        for name, stage_stats in pipeline.stats.items():
+            total = stats.setdefault(name, {"busy": 0.0, "blocked": 0.0, "items": 0})
+            for key, value in stage_stats.items():
+                total[key] += value
+
+
+def _hybrid_pages(pdf_path, start, stop, opts):
+    return list(_iter_hybrid_pages(pdf_path, start, stop, opts))
+
+
+def _iter_pdfplumber_pages(pdf_path, start, stop, opts):
+    """
+    pdfplumber로 [start, stop) 구간 페이지를 처리해 완료된 page_info를 페이지 순서대로 반환
+    """
+    image_dir, dpi, batch_size = opts["image_dir"], opts["dpi"], opts["ocr_batch_size"]
+    skip_pages = opts.get("skip_pages") or ()
+    doc = open_plumber(pdf_path)
+    page_infos = []
+    pending = []
+
+    for i in range(start, stop):
+        if i + 1 in skip_pages:
+            continue
+        timings = {}
+        with stage(timings, "text"):
+            page = doc.pages[i]
+            text = _cached_text(opts, i + 1, lambda: page.extract_text() or "")
+        page_info = _make_page_info(i + 1, text, opts["min_chars"], timings)
+
+        if page_info["extraction_method"] == "ocr" and not _cached_ocr(opts, page_info):
+            if dpi == "auto":
+                page_info["dpi"] = plumber_adaptive_dpi(page, opts["max_pixels"])
+            else:
+                page_dpi = cap_dpi(float(page.width), float(page.height), dpi, opts["max_pixels"])
+                if page_dpi != dpi:
+                    page_info["dpi"] = page_dpi
+            with stage(timings, "render"):
+                page_image = page.to_image(resolution=page_info.get("dpi", dpi)).original
+                page_image = page_image.convert("L" if opts["grayscale"] else "RGB")
+            img_path = None
+            if opts["save_images"]:
+                os.makedirs(image_dir, exist_ok=True)
+                img_path = os.path.join(image_dir, f"page_{i+1}.jpg")
+                with stage(timings, "save_image"):
+                    page_image.save(img_path, format="JPEG")
+            pending.append((page_info, np.asarray(page_image), img_path))
+
+        release_plumber_page(page)
+        page_infos.append(page_info)
+
+        if (i + 1) % batch_size == 0:
+            _store_ocr(opts, _flush_ocr(pending))
+            yield from page_infos
+            page_infos.clear()
+
+    _store_ocr(opts, _flush_ocr(pending))
     doc.close()
+    yield from page_infos
 
-    with open(output_json_path, 'w', encoding='utf-8') as f:
-        json.dump(result, f, ensure_ascii=False, indent=2)
 
-    return output_json_path, result["ocr_pages_count"]
+def _pdfplumber_pages(pdf_path, start, stop, opts):
+    return list(_iter_pdfplumber_pages(pdf_path, start, stop, opts))
+
 
+def _iter_parallel_source(worker_fn, pdf_path, total_pages, workers, opts, executor=None):
+    # 워커 프로세스는 메모리 버퍼를 공유할 수 없으므로 버퍼는 한 번만 임시 파일로 기록해 경로로 전달
+    with spilled_path(pdf_path) as path:
+        yield from _iter_parallel(worker_fn, path, total_pages, workers, opts, executor)
 
-def pdfplumber_extract(pdf_path, image_dir, output_json_path, min_chars=20, dpi=200):
+
+def _iter_pages(worker_fn, iter_fn, pdf_path, total_pages, opts, workers, executor=None, on_page=None):
+    # on_page는 워커 프로세스로 넘기지 않고 결과를 받는 이 프로세스에서만 호출
+    if (workers > 1 or executor is not None) and total_pages > 1:
+        pages = _iter_parallel_source(worker_fn, pdf_path, total_pages, max(workers, 1), opts, executor)
+    else:
+        pages = iter_fn(pdf_path, 0, total_pages, opts)
+    try:
+        for page_info in pages:
+            page_info = _collect_timings(page_info, opts)
+            if on_page is not None:
+                on_page(page_info)
+            yield page_info
+    finally:
+        # 중간에 멈춰도(예외 / 순회 중단) 파이프라인 스레드와 워커 작업이 바로 정리되도록 닫아 줌
+        pages.close()
+
+
+def _collect_timings(page_info, opts):
     """
-    pdfplumber 기반 하이브리드 텍스트 + OCR 추출
+    페이지 단계별 시간을 메트릭에 기록하고, timings=True 일 때만 결과에 "timings"로 남김
+    (병렬 워커에서 측정한 시간도 결과와 함께 돌아오므로 부모 프로세스에서 집계)
     """
-    os.makedirs(image_dir, exist_ok=True)
-    doc = pdfplumber.open(pdf_path)
-    total_pages = len(doc.pages)
+    timings = page_info.pop("_timings", None)
+    if timings is None:
+        return page_info
+    record_page(timings, opts.get("method", ""), page_info["extraction_method"])
+    if "triage" in page_info:
+        record_triage(page_info["triage"], opts.get("method", ""))
+    opts["_page_timings"].append(timings)
+    if opts.get("timings"):
+        page_info["timings"] = {name: round(seconds, 4) for name, seconds in timings.items()}
+    return page_info
+
+
+def _document_timings(opts, document_timings, started):
+    """
+    문서 단위 시간(직렬화 등)을 기록하고 결과 메타데이터용 요약 반환
+    """
+    record_document(document_timings, opts.get("method", ""))
+    summary = {
+        "stages": summarize(opts["_page_timings"], document_timings),
+        "total": round(time.perf_counter() - started, 4),
+    }
+    if opts.get("_pipeline_stats"):
+        summary["pipeline"] = {
+            name: {key: round(value, 4) if isinstance(value, float) else value for key, value in stats.items()}
+            for name, stats in opts["_pipeline_stats"].items()
+        }
+    return summary if opts.get("timings") else None
 
-    result = {
-        "pdf_path": pdf_path,
+
+# 결과에는 영향이 없는 실행 옵션 (스레드 수) - 설정 지문에서 제외
+_RUNTIME_OPTIONS = {"intra_op_threads", "inter_op_threads", "cpu_threads"}
+
+
+def ocr_config_fingerprint(opts):
+    """
+    OCR 결과에 영향을 주는 설정의 지문 (캐시 키 / 스트리밍 체크포인트에 사용)
+    - OCR 엔진과 옵션(모델 경로, int8 등), PaddleOCR 옵션(lang 등), 흑백 렌더링, 최대 픽셀 수
+    """
+    config = {
+        "engine": {k: v for k, v in current_engine_config().items() if k not in _RUNTIME_OPTIONS},
+        "model": {k: v for k, v in current_config().items() if k not in _RUNTIME_OPTIONS},
+        "grayscale": opts.get("grayscale"),
+        "max_pixels": opts.get("max_pixels"),
+    }
+    return config_fingerprint(config)
+
+
+def _without_timings(result):
+    # 캐시에는 실행 시간 정보를 남기지 않음
+    result = {k: v for k, v in result.items() if k != "timings"}
+    result["pages"] = {
+        key: {k: v for k, v in page_info.items() if k != "timings"}
+        for key, page_info in result["pages"].items()
+    }
+    return result
+
+
+def _extract_streaming(method, worker_fn, iter_fn, pdf_path, output_json_path, opts, workers, total_pages, started,
+                       executor=None, on_page=None):
+    """
+    완료된 페이지를 바로 NDJSON에 기록하고, 마지막에 통합 JSON 생성
+    - 같은 PDF / 파라미터로 다시 실행하면 체크포인트에 기록된 페이지는 건너뜀
+    """
+    header = {
+        "pdf_path": source_label(pdf_path, opts.get("pdf_name")),
         "total_pages": total_pages,
-        "min_chars_threshold": min_chars,
+        "min_chars_threshold": opts["min_chars"],
+        "dpi": opts["dpi"],
+    }
+    if opts.get("compact_ocr"):
+        header["ocr_format"] = PACKED_FORMAT
+    params = {
+        "pdf_sha256": opts.get("pdf_hash") or source_sha256(pdf_path),
+        "method": method,
+        "min_chars": opts["min_chars"],
+        "dpi": opts["dpi"],
+        "ocr_config": opts["ocr_config"],
+        "total_pages": total_pages,
+    }
+    if opts.get("compact_ocr"):
+        params["ocr_format"] = PACKED_FORMAT
+
+    writer = StreamingResultWriter(output_json_path)
+    opts["skip_pages"] = writer.resume(params)
+    document_timings = {}
+    try:
+        for page_info in _iter_pages(worker_fn, iter_fn, pdf_path, total_pages, opts, workers, executor, on_page):
+            with stage(document_timings, "serialize"):
+                writer.write_page(pack_page(page_info) if opts.get("compact_ocr") else page_info)
+    finally:
+        writer.close()
+
+    # 문서 단위 시간은 finalize 직전까지 측정 (통합 JSON 작성 시간은 메트릭에만 기록)
+    trailer = {}
+    summary = _document_timings(opts, dict(document_timings), started)
+    if summary is not None:
+        trailer["timings"] = summary
+    with stage(document_timings, "finalize"):
+        ocr_pages_count = writer.finalize(header, trailer)
+    record_document({"finalize": document_timings["finalize"]}, method)
+    return output_json_path, ocr_pages_count
+
+
+def _extract(method, worker_fn, iter_fn, count_pages, pdf_path, output_json_path, opts, workers, stream=False,
+             executor=None, on_page=None):
+    """
+    hybrid_extract / pdfplumber_extract 공통 흐름
+    - 캐시가 있으면 문서 단위 결과부터 조회하고, 없으면 페이지 단위 캐시를 활용해 추출
+    - stream=True 이면 페이지 단위로 기록하는 재시작 가능한 모드로 추출
+    - 단계별 시간은 항상 메트릭(utils.metrics.REGISTRY)에 기록하고, timings=True 이면 결과 JSON에도 기록
+    - on_page(page_info): 페이지가 완료될 때마다 페이지 순서대로 호출 (문서 캐시 적중 시에는 캐시된 페이지로 호출)
+    """
+    started = time.perf_counter()
+    opts["method"] = method
+    opts["ocr_config"] = ocr_config_fingerprint(opts)
+    opts["_page_timings"] = []
+    cache = opts.get("cache")
+    result = None
+    if cache is not None:
+        opts["pdf_hash"] = source_sha256(pdf_path)
+        result = cache.get_document(opts["pdf_hash"], method, opts["min_chars"], opts["dpi"], opts["ocr_config"])
+        if result is not None:
+            result["pdf_path"] = source_label(pdf_path, opts.get("pdf_name"))
+            if on_page is not None:
+                for page_info in result["pages"].values():
+                    on_page(page_info)
+
+    if result is None:
+        total_pages = count_pages(pdf_path)
+        if stream:
+            return _extract_streaming(method, worker_fn, iter_fn, pdf_path, output_json_path, opts, workers,
+                                      total_pages, started, executor, on_page)
+
+        page_infos = list(_iter_pages(worker_fn, iter_fn, pdf_path, total_pages, opts, workers, executor, on_page))
+        result = _build_result(source_label(pdf_path, opts.get("pdf_name")), total_pages, opts["min_chars"], opts["dpi"],
+                               page_infos)
+        if cache is not None and not any("error" in p for p in page_infos):
+            cache.put_document(opts["pdf_hash"], method, opts["min_chars"], opts["dpi"], _without_timings(result),
+                               opts["ocr_config"])
+
+    document_timings = {}
+    summary = _document_timings(opts, document_timings, started)
+    if summary is not None:
+        result["timings"] = summary
+
+    with stage(document_timings, "serialize"):
+        if opts.get("compact_ocr"):
+            result = pack_result(result)
+        with open(output_json_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    record_document(document_timings, method)
+
+    return output_json_path, result["ocr_pages_count"]
+
+
+def _count_fitz_pages(pdf_path):
+    with open_fitz(pdf_path) as doc:
+        return len(doc)
+
+
+def _count_pdfplumber_pages(pdf_path):
+    with open_plumber(pdf_path) as doc:
+        return len(doc.pages)
+
+
+def _render_options(dpi, max_pixels, grayscale):
+    auto = dpi == "auto"
+    return {
+        "max_pixels": max_pixels if max_pixels is not None else (DEFAULT_MAX_PIXELS if auto else None),
+        "grayscale": grayscale if grayscale is not None else auto,
+    }
+
+
+def hybrid_extract(pdf_path, image_dir, output_json_path, min_chars=20, dpi=200, workers=1,
+                   save_images=False, ocr_batch_size=4, cache=None, stream=False, ocr_mode="page",
+                   max_pixels=None, grayscale=None, timings=False, executor=None, pdf_name=None,
+                   compact_ocr=False, layout=False, triage=False, pipeline=False, ocr_workers=1, queue_size=4,
+                   on_page=None):
+    """
+    PyMuPDF 기반 하이브리드 텍스트 + OCR 추출
+    - workers > 1 이면 페이지 구간을 프로세스 풀에서 병렬 처리 (결과 JSON은 직렬 처리와 동일)
+    - OCR은 메모리 상의 이미지로 수행하며, save_images=True 일 때만 image_dir에 이미지 저장
+    - cache(ExtractionCache)를 주면 같은 PDF 재업로드 시 캐시된 결과를 바로 사용
+    - stream=True 이면 페이지마다 <output>.pages.ndjson 에 기록하고, 중단 후 재실행 시 이어서 처리
+    - ocr_mode="region" 이면 텍스트 레이어가 있는 페이지의 스캔 이미지 영역만 OCR 해서 내장 텍스트와 합침
+      (extraction_method="mixed", 영역별 bbox / 텍스트는 page_info["regions"], OCR 줄은 페이지 ocr_data의
+      region["ocr_lines"] 구간 - utils.regions.region_ocr_data)
+    - dpi="auto" 이면 페이지별로 글자 크기에 맞춘 DPI를 골라 흑백으로 렌더링 (선택된 DPI는 page_info["dpi"])
+    - max_pixels: 페이지 렌더링 최대 픽셀 수 (dpi="auto" 기본값 12MP), grayscale: 흑백 렌더링 (dpi="auto" 기본값 True)
+    - timings=True 이면 페이지별 / 문서별 단계 시간(text, render, ocr, serialize ...)을 결과 JSON에 기록
+    - executor: make_process_pool()로 만든 공유 프로세스 풀 (여러 문서를 한 풀에서 처리할 때)
+    - pdf_path 대신 PDF 바이트(bytes / memoryview)를 줄 수 있음 (디스크 기록 없이 메모리에서 처리,
+      병렬 처리 시에만 임시 파일로 한 번 기록 후 삭제) - pdf_name은 이때 결과 JSON의 pdf_path로 기록할 이름
+    - compact_ocr=True 이면 OCR 줄 정보를 페이지별 압축 배열(ocr_packed)로 기록
+      (utils.ocr_pack.load_result로 읽으면 ocr_data 뷰로 복원)
+    - layout=True 이면 구조화 추출: 텍스트 레이어는 get_text("words") 한 번으로 추출해 다단 / 표의 읽기 순서로
+      재구성하고, OCR 줄도 같은 순서로 정렬 (줄 / 단 / bbox는 page_info["layout"], utils.layout 참고)
+    - triage=True 이면 렌더링 전에 페이지를 분류 (utils.triage): 썸네일에 잉크가 거의 없는 빈 페이지는
+      extraction_method="blank"로 OCR 생략, 깨진 텍스트 레이어(mojibake)는 OCR로 처리
+      (판정 / 지표 / 비용은 page_info["triage"], 단계 시간은 "triage")
+    - pipeline=True 이면 렌더링 → OCR → 기록 단계를 크기 제한 큐(queue_size)로 연결해 겹쳐서 실행
+      (OCR 단계 스레드 수는 ocr_workers, 스레드 동시 호출을 지원하는 엔진(onnx)에서만 2 이상 적용)
+    - on_page(page_info): 페이지가 끝날 때마다 페이지 순서대로 호출 (asyncio에서는 hybrid_extract_async)
+    """
+    os.makedirs(os.path.dirname(output_json_path), exist_ok=True)
+    opts = {
+        "image_dir": image_dir,
+        "min_chars": min_chars,
         "dpi": dpi,
-        "pages": {},
-        "ocr_pages_count": 0
+        "save_images": save_images,
+        "ocr_batch_size": max(1, ocr_batch_size),
+        "cache": cache,
+        "ocr_mode": ocr_mode,
+        "timings": timings,
+        "pdf_name": pdf_name,
+        "compact_ocr": compact_ocr,
+        "layout": layout,
+        "triage": triage,
+        "pipeline": pipeline,
+        "ocr_workers": ocr_workers,
+        "queue_size": queue_size,
+        **_render_options(dpi, max_pixels, grayscale),
     }
+    method = "PyMuPDF" if ocr_mode == "page" else f"PyMuPDF:{ocr_mode}"
+    if layout:
+        method += "+layout"
+    if triage:
+        method += "+triage"
+    return _extract(method, _hybrid_pages, _iter_hybrid_pages, _count_fitz_pages,
+                    pdf_path, output_json_path, opts, workers, stream, executor, on_page)
 
-    for i, page in enumerate(doc.pages):
-        text = page.extract_text() or ""
-        char_count = len(text.strip())
 
-        page_info = {
-            "page_number": i + 1,
-            "char_count": char_count,
-            "extraction_method": "text" if char_count >= min_chars else "ocr",
-            "text": text if char_count >= min_chars else ""
-        }
+def hybrid_extract_async(pdf_path, image_dir, output_json_path, **options):
+    """
+    hybrid_extract를 스레드에서 실행하면서 완료된 page_info를 페이지 순서대로 돌려주는 async 제너레이터
+    - 옵션은 hybrid_extract와 같음 (보통 pipeline=True와 함께 사용), 순회가 끝나면 결과 JSON도 기록된 상태
+    - 순회를 중간에 멈추거나 aclose() / 취소하면 다음 페이지 완료 시점에 추출을 중단
+      (제너레이터를 감싸지 않고 그대로 반환해야 aclose()가 추출 스레드까지 전달됨)
 
-        if char_count < min_chars:
-            result["ocr_pages_count"] += 1
-            img_path = os.path.join(image_dir, f"page_{i+1}.jpg")
-            page_image = page.to_image(resolution=dpi).original
-            page_image = page_image.convert("RGB")
-            page_image.save(img_path, format="JPEG")
-
-            try:
-                ocr_result = ocr_model.ocr(img_path)
-                ocr_text = ""
-                ocr_data = []
-
-                if ocr_result and ocr_result[0]:
-                    for line in ocr_result[0]:
-                        box, (text_part, confidence) = line
-                        ocr_text += text_part + " "
-                        ocr_data.append({
-                            'box': to_builtin(box),
-                            'text': text_part,
-                            'confidence': float(confidence)
-                        })
-
-                page_info["text"] = ocr_text.strip()
-                page_info["ocr_data"] = ocr_data
-                page_info["image_path"] = img_path
-
-            except Exception as e:
-                page_info["error"] = str(e)
-
-        result["pages"][f"page_{i+1}"] = page_info
+        async for page_info in hybrid_extract_async(pdf_bytes, image_dir, json_path, pipeline=True):
+            show(page_info)
+    """
+    return aiter_callback(hybrid_extract, pdf_path, image_dir, output_json_path, **options)
 
-    doc.close()
 
-    with open(output_json_path, 'w', encoding='utf-8') as f:
-        json.dump(result, f, ensure_ascii=False, indent=2)
+def pdfplumber_extract(pdf_path, image_dir, output_json_path, min_chars=20, dpi=200, workers=1,
+                       save_images=False, ocr_batch_size=4, cache=None, stream=False,
+                       max_pixels=None, grayscale=None, timings=False, executor=None, pdf_name=None,
+                       compact_ocr=False):
+    """
+    pdfplumber 기반 하이브리드 텍스트 + OCR 추출
+    - workers > 1 이면 페이지 구간을 프로세스 풀에서 병렬 처리 (결과 JSON은 직렬 처리와 동일)
+    - OCR은 메모리 상의 이미지로 수행하며, save_images=True 일 때만 image_dir에 이미지 저장
+    - cache(ExtractionCache)를 주면 같은 PDF 재업로드 시 캐시된 결과를 바로 사용
+    - stream=True 이면 페이지마다 <output>.pages.ndjson 에 기록하고, 중단 후 재실행 시 이어서 처리
+    - dpi="auto" 이면 페이지별로 글자 크기에 맞춘 DPI를 골라 흑백으로 렌더링 (선택된 DPI는 page_info["dpi"])
+    - max_pixels: 페이지 렌더링 최대 픽셀 수 (dpi="auto" 기본값 12MP), grayscale: 흑백 렌더링 (dpi="auto" 기본값 True)
+    - timings=True 이면 페이지별 / 문서별 단계 시간(text, render, ocr, serialize ...)을 결과 JSON에 기록
+    - executor: make_process_pool()로 만든 공유 프로세스 풀 (여러 문서를 한 풀에서 처리할 때)
+    - pdf_path 대신 PDF 바이트(bytes / memoryview)를 줄 수 있음 (디스크 기록 없이 메모리에서 처리,
+      병렬 처리 시에만 임시 파일로 한 번 기록 후 삭제) - pdf_name은 이때 결과 JSON의 pdf_path로 기록할 이름
+    - compact_ocr=True 이면 OCR 줄 정보를 페이지별 압축 배열(ocr_packed)로 기록
+      (utils.ocr_pack.load_result로 읽으면 ocr_data 뷰로 복원)
+    """
+    opts = {
+        "image_dir": image_dir,
+        "min_chars": min_chars,
+        "dpi": dpi,
+        "save_images": save_images,
+        "ocr_batch_size": max(1, ocr_batch_size),
+        "cache": cache,
+        "timings": timings,
+        "pdf_name": pdf_name,
+        "compact_ocr": compact_ocr,
+        **_render_options(dpi, max_pixels, grayscale),
+    }
+    return _extract("pdfplumber", _pdfplumber_pages, _iter_pdfplumber_pages, _count_pdfplumber_pages,
+                    pdf_path, output_json_path, opts, workers, stream, executor)
 
-    return output_json_path, result["ocr_pages_count"]
+
+def text_extract(pdf_path, output_json_path, engine="PyMuPDF", pdf_name=None, layout=False):
+    """
+    OCR 없이 내장 텍스트만 추출 (app.py 텍스트 추출과 같은 JSON 형태: pages는 리스트)
+    - pdf_path 대신 PDF 바이트를 줄 수 있음 (pdf_name: 결과 JSON에 기록할 이름)
+    - layout=True (PyMuPDF만): 읽기 순서로 재구성한 텍스트 + 페이지별 "layout" (utils.layout.page_layout)
+    """
+    timings = {}
+    with stage(timings, "text"):
+        if engine == "PyMuPDF":
+            with open_fitz(pdf_path) as doc:
+                pages = []
+                for i, page in enumerate(doc):
+                    if layout:
+                        text, page_layout_info = page_layout(page)
+                        pages.append({"page_number": i+1, "char_count": len(text), "text": text,
+                                      "layout": page_layout_info})
+                        continue
+                    text = page.get_text()
+                    pages.append({"page_number": i+1, "char_count": len(text), "text": text.strip()})
+        else:
+            with open_plumber(pdf_path) as doc:
+                pages = []
+                for i, page in enumerate(doc.pages):
+                    text = page.extract_text() or ""
+                    pages.append({"page_number": i+1, "char_count": len(text), "text": text})
+                    release_plumber_page(page)
+
+    with stage(timings, "serialize"):
+        with open(output_json_path, 'w', encoding='utf-8') as f:
+            json.dump({"pdf_path": source_label(pdf_path, pdf_name), "pages": pages}, f, ensure_ascii=False, indent=2)
+    record_document(timings, f"text-{engine}")
+
+    return output_json_path, 0
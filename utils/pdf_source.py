@@ -0,0 +1,75 @@
+import io
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+import fitz  # PyMuPDF
+import pdfplumber
+
+from utils.extract_cache import file_sha256, bytes_sha256
+
+MEMORY_LABEL = "<memory>"
+
+
+def is_buffer(source):
+    """
+    PDF가 파일 경로가 아니라 메모리 상의 바이트(bytes / bytearray / memoryview)인지 여부
+    """
+    return isinstance(source, (bytes, bytearray, memoryview))
+
+
+def _stream(source):
+    # PyMuPDF는 memoryview를 stream으로 받지 않으므로 bytes로 변환
+    return bytes(source) if isinstance(source, memoryview) else source
+
+
+def open_fitz(source):
+    """
+    경로 또는 메모리 버퍼에서 PyMuPDF 문서 열기 (버퍼는 디스크에 쓰지 않음)
+    """
+    if is_buffer(source):
+        return fitz.open(stream=_stream(source), filetype="pdf")
+    return fitz.open(source)
+
+
+def open_plumber(source):
+    """
+    경로 또는 메모리 버퍼에서 pdfplumber 문서 열기 (버퍼는 BytesIO로 감싸서 사용)
+    """
+    if is_buffer(source):
+        return pdfplumber.open(io.BytesIO(source))
+    return pdfplumber.open(source)
+
+
+def source_sha256(source):
+    return bytes_sha256(source) if is_buffer(source) else file_sha256(source)
+
+
+def source_label(source, name=None):
+    """
+    결과 JSON의 pdf_path에 기록할 이름 (버퍼이면 name, 없으면 "<memory>")
+    """
+    if is_buffer(source):
+        return name or MEMORY_LABEL
+    return source
+
+
+@contextmanager
+def spilled_path(source, suffix=".pdf"):
+    """
+    파일 경로가 꼭 필요한 경우(프로세스 풀 워커, pdf2image 등)에만 버퍼를 임시 디렉터리에 기록
+    - 경로가 들어오면 그대로 반환
+    - 임시 디렉터리는 블록을 벗어날 때(예외 포함) 항상 삭제
+    """
+    if not is_buffer(source):
+        yield source
+        return
+    tmp_dir = tempfile.mkdtemp(prefix="pdf_spill_")
+    try:
+        path = os.path.join(tmp_dir, f"source{suffix}")
+        with open(path, "wb") as f:
+            f.write(source)
+        yield path
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
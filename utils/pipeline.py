@@ -0,0 +1,204 @@
+import time
+import queue
+import asyncio
+import threading
+from collections import namedtuple
+
+_END = object()
+POLL_SECONDS = 0.1
+
+
+class Stage(namedtuple("Stage", ["name", "fn", "workers", "batch"])):
+    """
+    파이프라인 단계
+    - fn(item) → item (batch > 1 이면 fn([item, ...]) → [item, ...], 대기 중인 항목을 최대 batch개까지 모아 호출)
+    - workers: 이 단계를 실행할 스레드 수 (같은 fn을 동시에 호출해도 안전할 때만 2 이상)
+    """
+
+    def __new__(cls, name, fn, workers=1, batch=1):
+        return super().__new__(cls, name, fn, max(1, workers), max(1, batch))
+
+
+class PipelineCancelled(Exception):
+    """소비자가 결과를 더 받지 않아 파이프라인을 중단함"""
+
+
+class _Failure:
+    def __init__(self, error):
+        self.error = error
+
+
+class Pipeline:
+    """
+    단계별 스레드 + 크기 제한 큐로 연결한 생산자 / 소비자 파이프라인
+    - 입력 → stages[0] → stages[1] → ... → 순회하는 쪽(마지막 기록 단계)으로 흘러가며 단계끼리 겹쳐서 실행
+    - 큐가 가득 차면 앞 단계가 기다림 (backpressure: 느린 단계 앞에 쌓이는 항목 수는 queue_size로 제한)
+    - 결과는 입력 순서대로 반환 (여러 스레드가 처리해도 순서 유지)
+    - 단계에서 예외가 나면 나머지 단계를 멈추고 순회하는 쪽에서 다시 발생
+    - stats: 단계별 처리 시간(busy) / 다음 단계를 기다린 시간(blocked) / 처리 항목 수 (가장 느린 단계 확인용)
+    """
+
+    def __init__(self, stages, queue_size=4):
+        self.stages = list(stages)
+        self.queue_size = max(1, queue_size)
+        self.stats = {stage.name: {"busy": 0.0, "blocked": 0.0, "items": 0} for stage in self.stages}
+        self._stop = threading.Event()
+        self._stats_lock = threading.Lock()
+
+    def _put(self, q, item):
+        # 다음 단계 큐에 빈자리가 날 때까지 대기 (중단 요청이 오면 포기)
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q):
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                continue
+        return _END
+
+    def _feed(self, items, out_q):
+        try:
+            for seq, item in enumerate(items):
+                if not self._put(out_q, (seq, item)):
+                    return
+        except Exception as e:
+            self._put(out_q, (-1, _Failure(e)))
+        self._put(out_q, _END)
+
+    def _take(self, in_q, batch):
+        # 첫 항목은 기다리고, 나머지는 이미 도착한 것만 batch개까지 모음
+        first = self._get(in_q)
+        if first is _END:
+            return first, []
+        items = [first]
+        while len(items) < batch:
+            try:
+                item = in_q.get_nowait()
+            except queue.Empty:
+                break
+            if item is _END:
+                self._put(in_q, item)  # 종료 표시는 같은 단계의 다른 스레드도 봐야 하므로 되돌려 놓음
+                break
+            items.append(item)
+        return None, items
+
+    def _work(self, stage, in_q, out_q, remaining):
+        stats = self.stats[stage.name]
+        while True:
+            end, items = self._take(in_q, stage.batch)
+            if end is _END:
+                break
+            ready = [(seq, item) for seq, item in items if not isinstance(item, _Failure)]
+            failed = [(seq, item) for seq, item in items if isinstance(item, _Failure)]
+            if ready:
+                started = time.perf_counter()
+                try:
+                    if stage.batch > 1:
+                        outputs = list(zip((seq for seq, _ in ready), stage.fn([item for _, item in ready])))
+                    else:
+                        outputs = [(ready[0][0], stage.fn(ready[0][1]))]
+                except Exception as e:
+                    outputs = [(seq, _Failure(e)) for seq, _ in ready]
+                busy = time.perf_counter() - started
+            else:
+                outputs, busy = [], 0.0
+            started = time.perf_counter()
+            for output in failed + outputs:
+                if not self._put(out_q, output):
+                    return
+            with self._stats_lock:
+                stats["busy"] += busy
+                stats["blocked"] += time.perf_counter() - started
+                stats["items"] += len(ready)
+
+        self._put(in_q, _END)  # 같은 단계의 다른 스레드에게 종료 전달
+        with remaining[1]:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            self._put(out_q, _END)
+
+    def run(self, items):
+        """
+        items를 파이프라인에 흘려 마지막 단계 결과를 입력 순서대로 반환하는 제너레이터
+        (순회를 중간에 멈추면 모든 단계 스레드를 정리)
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        threads = [threading.Thread(target=self._feed, args=(items, queues[0]), name="pipeline-feed", daemon=True)]
+        for index, stage in enumerate(self.stages):
+            remaining = [stage.workers, threading.Lock()]
+            threads += [
+                threading.Thread(target=self._work, args=(stage, queues[index], queues[index + 1], remaining),
+                                 name=f"pipeline-{stage.name}-{n}", daemon=True)
+                for n in range(stage.workers)
+            ]
+        for thread in threads:
+            thread.start()
+
+        pending = {}
+        next_seq = 0
+        try:
+            while True:
+                entry = self._get(queues[-1])
+                if entry is _END:
+                    break
+                seq, item = entry
+                if isinstance(item, _Failure):
+                    raise item.error
+                pending[seq] = item
+                while next_seq in pending:
+                    yield pending.pop(next_seq)
+                    next_seq += 1
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+
+
+async def aiter_callback(fn, *args, callback="on_page", max_pending=1, **kwargs):
+    """
+    fn(..., on_page=콜백) 을 스레드에서 실행하면서 콜백으로 전달된 항목을 async for로 하나씩 반환
+    - fn이 끝나면 순회도 끝나고, fn의 예외는 그대로 전달
+    - 콜백은 소비자가 가져갈 때까지 기다림 (max_pending개까지만 먼저 쌓임) → 순회를 멈추면 fn도 멈춤
+    - 제너레이터를 닫거나(aclose, break 후 정리) 취소하면 다음 콜백 호출에서 PipelineCancelled를 발생시켜 fn을 중단
+    """
+    loop = asyncio.get_running_loop()
+    items = asyncio.Queue(maxsize=max(1, max_pending))
+    cancelled = threading.Event()
+
+    def emit(item):
+        if cancelled.is_set():
+            raise PipelineCancelled()
+        asyncio.run_coroutine_threadsafe(items.put(item), loop).result()
+
+    future = loop.run_in_executor(None, lambda: fn(*args, **{**kwargs, callback: emit}))
+    try:
+        while True:
+            getter = asyncio.ensure_future(items.get())
+            await asyncio.wait({getter, future}, return_when=asyncio.FIRST_COMPLETED)
+            if getter.done():
+                yield getter.result()
+                continue
+            getter.cancel()
+            # fn이 끝났으면 모든 콜백의 put도 끝난 상태 → 남은 항목을 마저 반환
+            while not items.empty():
+                yield items.get_nowait()
+            await future
+            break
+    finally:
+        if not future.done():
+            cancelled.set()
+            # 기다리고 있는 콜백을 풀어 줘야 fn이 다음 콜백에서 중단됨
+            while not items.empty():
+                items.get_nowait()
+            try:
+                await future
+            except PipelineCancelled:
+                pass
@@ -0,0 +1,93 @@
+import fitz  # PyMuPDF
+
+
+def _merge_rects(rects, gap=4):
+    """
+    겹치거나 gap(pt) 이내로 붙어 있는 사각형을 하나로 합침
+    """
+    merged = [fitz.Rect(r) for r in rects]
+    changed = True
+    while changed:
+        changed = False
+        result = []
+        while merged:
+            current = merged.pop()
+            grown = fitz.Rect(current.x0 - gap, current.y0 - gap, current.x1 + gap, current.y1 + gap)
+            for other in merged[:]:
+                if grown.intersects(other):
+                    current |= other
+                    merged.remove(other)
+                    changed = True
+            result.append(current)
+        merged = result
+    return merged
+
+
+def text_blocks(page):
+    """
+    페이지의 텍스트 블록 [(Rect, text), ...] (빈 블록 제외)
+    """
+    return [
+        (fitz.Rect(block[:4]), block[4])
+        for block in page.get_text("blocks")
+        if block[6] == 0 and block[4].strip()
+    ]
+
+
+def find_ocr_regions(page, blocks=None, min_area_ratio=0.01, max_text_coverage=0.25, gap=4):
+    """
+    텍스트 레이어가 없는 이미지 영역(스캔된 표, 도장 등)을 OCR 대상 영역으로 찾음
+    - 페이지 레이아웃의 이미지 블록 bbox를 페이지 안으로 자르고 가까운 것끼리 병합
+    - 페이지 면적의 min_area_ratio 미만인 작은 이미지(아이콘, 선)는 제외
+    - 텍스트 블록이 max_text_coverage 이상 덮고 있는 영역(텍스트가 이미 있는 배경 이미지)은 제외
+    """
+    page_rect = page.rect
+    page_area = page_rect.get_area()
+    if blocks is None:
+        blocks = text_blocks(page)
+
+    rects = []
+    for info in page.get_image_info():
+        rect = fitz.Rect(info["bbox"]) & page_rect
+        if rect.is_empty or rect.get_area() < page_area * min_area_ratio:
+            continue
+        rects.append(rect)
+
+    regions = []
+    for rect in _merge_rects(rects, gap):
+        area = rect.get_area()
+        covered = sum((rect & block_rect).get_area() for block_rect, _ in blocks if rect.intersects(block_rect))
+        if covered / area < max_text_coverage:
+            regions.append(rect)
+
+    return sorted(regions, key=lambda r: (r.y0, r.x0))
+
+
+def merge_region_text(blocks, regions):
+    """
+    내장 텍스트 블록과 OCR 영역 텍스트를 위→아래, 왼→오른쪽 순서로 합침
+    - blocks: [(Rect, text)], regions: [{"bbox": [x0, y0, x1, y1], "text": ...}]
+    """
+    items = [(rect.y0, rect.x0, text.strip()) for rect, text in blocks]
+    items += [(r["bbox"][1], r["bbox"][0], r.get("text", "").strip()) for r in regions]
+    return "\n".join(text for _, _, text in sorted(items) if text)
+
+
+def offset_boxes(ocr_data, dx, dy):
+    """
+    잘라낸 영역 기준 픽셀 좌표를 전체 페이지 렌더링 기준 픽셀 좌표로 이동
+    """
+    return [
+        {**line, "box": [[x + dx, y + dy] for x, y in line["box"]]}
+        for line in ocr_data
+    ]
+
+
+def region_ocr_data(page_info, region):
+    """
+    영역의 OCR 줄 목록 (페이지 ocr_data의 region["ocr_lines"] 구간, 예전 결과는 region["ocr_data"])
+    """
+    if "ocr_lines" in region:
+        start, end = region["ocr_lines"]
+        return page_info.get("ocr_data", [])[start:end]
+    return region.get("ocr_data", [])
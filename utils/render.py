@@ -0,0 +1,150 @@
+import math
+
+import numpy as np
+import fitz  # PyMuPDF
+from PIL import Image
+
+from utils.pdf_source import open_fitz
+
+PREVIEW_DPI = 50
+TARGET_LINE_PX = 40        # OCR 인식 입력(높이 48px)에 맞춘 텍스트 줄 높이 목표
+MIN_DPI = 100
+MAX_DPI = 300
+FALLBACK_DPI = 200
+MAX_LINE_PT = 72            # 이보다 긴 잉크 구간은 글자가 아닌 괘선 / 테두리 / 그림으로 봄
+DEFAULT_MAX_PIXELS = 12_000_000
+
+
+def _drop_long_runs(ink, max_len):
+    """
+    세로 방향(axis 0)으로 max_len px보다 긴 잉크 연속 구간을 지운 마스크
+    - 열마다 앞뒤에 빈 칸을 붙여 펼친 뒤 차분으로 구간을 찾고, 긴 구간만 누적합으로 다시 칠해서 제거
+    """
+    h, w = ink.shape
+    flat = np.zeros((w, h + 2), dtype=np.int8)
+    flat[:, 1:-1] = ink.T
+    flat = flat.ravel()
+    edges = np.diff(flat)
+    starts, stops = np.flatnonzero(edges == 1) + 1, np.flatnonzero(edges == -1) + 1
+    long = stops - starts > max_len
+    marks = (np.bincount(starts[long], minlength=flat.size + 1)
+             - np.bincount(stops[long], minlength=flat.size + 1))
+    drop = np.cumsum(marks)[:flat.size].reshape(w, h + 2)[:, 1:-1].T > 0
+    return ink & ~drop
+
+
+def estimate_line_height(gray, preview_dpi=PREVIEW_DPI):
+    """
+    저해상도 흑백 미리보기에서 텍스트 줄 높이(pt) 추정
+    - 잉크가 있는 행의 연속 구간 높이의 중앙값을 사용
+    - 세로 / 가로로 MAX_LINE_PT보다 긴 잉크 구간(테두리, 표 괘선 - 기울어진 스캔 포함)은 투영 전에 제거,
+      1px 구간(가로선, 잡음)과 MAX_LINE_PT보다 높은 구간(사진 등)도 제외
+    - 잉크가 없거나 추정값이 MAX_LINE_PT를 넘으면 None (기본 DPI 사용)
+    """
+    if gray.ndim == 3:
+        gray = gray[:, :, 0]
+    ink = gray < 160
+    if not ink.any():
+        return None
+    max_len = int(MAX_LINE_PT * preview_dpi / 72)
+    ink = _drop_long_runs(ink, max_len)
+    ink = _drop_long_runs(ink.T, max_len).T
+
+    rows = np.concatenate(([0], ink.any(axis=1).astype(np.int8), [0]))
+    edges = np.diff(rows)
+    heights = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+    heights = heights[(heights >= 2) & (heights <= max_len)]
+    if not len(heights):
+        return None
+    line_height = float(np.median(heights)) * 72 / preview_dpi
+    return line_height if line_height <= MAX_LINE_PT else None
+
+
+def choose_dpi(line_height_pt, target_px=TARGET_LINE_PX, min_dpi=MIN_DPI, max_dpi=MAX_DPI):
+    """
+    텍스트 줄 높이가 target_px 정도가 되는 DPI (10 단위로 반올림, [min_dpi, max_dpi] 범위)
+    """
+    if not line_height_pt:
+        return FALLBACK_DPI
+    dpi = target_px * 72 / line_height_pt
+    return int(min(max_dpi, max(min_dpi, round(dpi / 10) * 10)))
+
+
+def cap_dpi(width_pt, height_pt, dpi, max_pixels=None):
+    """
+    렌더링 결과가 max_pixels를 넘지 않도록 DPI를 낮춤
+    """
+    if not max_pixels:
+        return dpi
+    limit = 72 * math.sqrt(max_pixels / max(width_pt * height_pt, 1))
+    return min(dpi, int(limit))
+
+
+def page_preview(page, preview_dpi=PREVIEW_DPI):
+    pix = page.get_pixmap(matrix=fitz.Matrix(preview_dpi / 72, preview_dpi / 72), colorspace=fitz.csGRAY)
+    return np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width)
+
+
+def adaptive_dpi(page, max_pixels=DEFAULT_MAX_PIXELS):
+    """
+    PyMuPDF 페이지의 OCR 렌더링 DPI 선택 (미리보기로 글자 크기 추정 → 최대 픽셀 수 제한)
+    """
+    dpi = choose_dpi(estimate_line_height(page_preview(page)))
+    return cap_dpi(page.rect.width, page.rect.height, dpi, max_pixels)
+
+
+def render_page(page, dpi, grayscale=False, clip=None):
+    """
+    OCR용 픽스맵 렌더링 (grayscale=True 이면 1채널로 렌더링해 메모리/시간 절약)
+    """
+    colorspace = fitz.csGRAY if grayscale else fitz.csRGB
+    return page.get_pixmap(matrix=fitz.Matrix(dpi / 72, dpi / 72), colorspace=colorspace, clip=clip)
+
+
+def plumber_adaptive_dpi(page, max_pixels=DEFAULT_MAX_PIXELS):
+    """
+    pdfplumber 페이지용 adaptive_dpi
+    """
+    preview = page.to_image(resolution=PREVIEW_DPI).original.convert("L")
+    dpi = choose_dpi(estimate_line_height(np.asarray(preview)))
+    return cap_dpi(float(page.width), float(page.height), dpi, max_pixels)
+
+
+def pixels_for_budget(max_bytes, grayscale=False):
+    """
+    페이지 한 장의 래스터 메모리 상한(바이트)을 렌더링 최대 픽셀 수로 변환
+    """
+    if not max_bytes:
+        return None
+    return int(max_bytes // (1 if grayscale else 3))
+
+
+def iter_page_images(pdf_path, dpi=FALLBACK_DPI, grayscale=False, max_pixels=None, start=0, stop=None):
+    """
+    PDF 페이지를 한 장씩 렌더링해 (page_number, PIL.Image) 반환
+    - 한 번에 한 페이지만 메모리에 두므로 문서 길이와 관계없이 메모리 사용이 일정함
+    - max_pixels를 주면 큰 페이지는 DPI를 낮춰 페이지당 래스터 크기를 제한
+    - 반환된 이미지는 다음 페이지로 넘어가기 전에 저장 / 처리하고 참조를 놓아야 함
+    """
+    doc = open_fitz(pdf_path)
+    try:
+        for i in range(start, doc.page_count if stop is None else min(stop, doc.page_count)):
+            page = doc.load_page(i)
+            pix = render_page(page, cap_dpi(page.rect.width, page.rect.height, dpi, max_pixels), grayscale)
+            image = Image.frombytes("L" if grayscale else "RGB", (pix.width, pix.height), pix.samples)
+            del pix, page
+            yield i + 1, image
+    finally:
+        doc.close()
+
+
+def release_plumber_page(page):
+    """
+    pdfplumber 페이지의 파싱 캐시(문자 / 객체 / 레이아웃) 해제
+    - pdfplumber는 한 번 읽은 페이지의 캐시를 문서가 닫힐 때까지 유지하므로 페이지를 다 쓰면 바로 해제
+    """
+    close = getattr(page, "close", None)  # pdfplumber >= 0.11
+    if close is not None:
+        close()
+    else:
+        page.flush_cache()
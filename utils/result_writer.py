@@ -0,0 +1,145 @@
+import os
+import json
+
+# ocr_pages_count에 세는 추출 방식 (mixed: 텍스트 레이어 + 영역 OCR)
+OCR_METHODS = ("ocr", "mixed")
+
+
+def is_ocr_page(page_info):
+    return page_info.get("extraction_method") in OCR_METHODS
+
+
+def _dump_line(obj):
+    return json.dumps(obj, ensure_ascii=False) + "\n"
+
+
+def _write_json_atomic(path, obj):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+class StreamingResultWriter:
+    """
+    페이지 단위 스트리밍 결과 저장 (NDJSON + 체크포인트 매니페스트)
+    - 완료된 페이지를 한 줄씩 <output>.pages.ndjson 에 추가하고 바로 flush
+    - <output>.manifest.json 에 추출 파라미터와 완료 페이지 목록을 기록
+      → 같은 파라미터로 다시 실행하면 완료된 페이지는 건너뜀
+    - finalize()가 NDJSON을 한 페이지씩 읽어 기존과 같은 형태의 통합 JSON을 생성
+    """
+
+    def __init__(self, output_json_path):
+        self.output_json_path = output_json_path
+        self.pages_path = output_json_path + ".pages.ndjson"
+        self.manifest_path = output_json_path + ".manifest.json"
+        self.manifest = None
+        self._file = None
+
+    def resume(self, params):
+        """
+        체크포인트를 읽어 이미 완료된 페이지 번호 집합 반환
+        - 파라미터가 다르거나 체크포인트가 없으면 처음부터 시작
+        - 중간에 끊겨 잘린 마지막 줄은 버림
+        """
+        manifest = None
+        if os.path.exists(self.manifest_path) and os.path.exists(self.pages_path):
+            try:
+                with open(self.manifest_path, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                manifest = None
+
+        if manifest is None or manifest.get("params") != params:
+            self.manifest = {"params": params, "done_pages": [], "finalized": False}
+            open(self.pages_path, "w", encoding="utf-8").close()
+            _write_json_atomic(self.manifest_path, self.manifest)
+            return set()
+
+        done = set()
+        valid_bytes = 0
+        with open(self.pages_path, "rb") as f:
+            for raw in f:
+                try:
+                    page_info = json.loads(raw.decode("utf-8"))
+                except ValueError:
+                    break
+                if not raw.endswith(b"\n"):
+                    break
+                done.add(page_info["page_number"])
+                valid_bytes += len(raw)
+        with open(self.pages_path, "r+b") as f:
+            f.truncate(valid_bytes)
+
+        manifest["done_pages"] = sorted(done)
+        manifest["finalized"] = False
+        self.manifest = manifest
+        _write_json_atomic(self.manifest_path, manifest)
+        if done:
+            print(f"[↩️ 이어서 처리] 완료된 페이지 {len(done)}개 건너뜀 - {self.output_json_path}")
+        return done
+
+    def write_page(self, page_info):
+        if self._file is None:
+            self._file = open(self.pages_path, "a", encoding="utf-8")
+        self._file.write(_dump_line(page_info))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+        self.manifest["done_pages"].append(page_info["page_number"])
+        _write_json_atomic(self.manifest_path, self.manifest)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def iter_pages(self):
+        """
+        NDJSON의 페이지를 페이지 번호 순서로 하나씩 반환 (병렬 처리로 순서가 섞여도 정렬)
+        """
+        offsets = []
+        with open(self.pages_path, "rb") as f:
+            offset = 0
+            for raw in f:
+                number = json.loads(raw.decode("utf-8"))["page_number"]
+                offsets.append((number, offset))
+                offset += len(raw)
+            for _, offset in sorted(offsets):
+                f.seek(offset)
+                yield json.loads(f.readline().decode("utf-8"))
+
+    def finalize(self, header, trailer=None):
+        """
+        통합 JSON 생성 (json.dump(..., indent=2) 와 같은 형식을 페이지 단위로 써서 메모리 사용을 일정하게 유지)
+        - header: pages / ocr_pages_count 를 제외한 최상위 필드
+        - trailer: ocr_pages_count 뒤에 붙일 최상위 필드 (예: timings)
+        - ocr_pages_count 반환
+        """
+        self.close()
+        ocr_pages_count = 0
+        tmp_path = self.output_json_path + ".tmp"
+
+        with open(tmp_path, "w", encoding="utf-8") as out:
+            out.write("{\n")
+            for key, value in header.items():
+                out.write(f"  {json.dumps(key, ensure_ascii=False)}: {json.dumps(value, ensure_ascii=False)},\n")
+            out.write('  "pages": {')
+            first = True
+            for page_info in self.iter_pages():
+                if is_ocr_page(page_info):
+                    ocr_pages_count += 1
+                body = json.dumps(page_info, ensure_ascii=False, indent=2).replace("\n", "\n    ")
+                out.write(("\n" if first else ",\n") + f'    "page_{page_info["page_number"]}": {body}')
+                first = False
+            out.write("\n  }" if not first else "}")
+            out.write(f',\n  "ocr_pages_count": {ocr_pages_count}')
+            for key, value in (trailer or {}).items():
+                body = json.dumps(value, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+                out.write(f",\n  {json.dumps(key, ensure_ascii=False)}: {body}")
+            out.write("\n}")
+
+        os.replace(tmp_path, self.output_json_path)
+        self.manifest["finalized"] = True
+        _write_json_atomic(self.manifest_path, self.manifest)
+        return ocr_pages_count
@@ -0,0 +1,353 @@
+"""
+추출 결과 JSON 전문 검색 색인 (한글 글자 바이그램 + BM25, 페이지 단위 검색)
+
+    python -m utils.search_index add output/batch/**/*.json --index-dir output/search
+    python -m utils.search_index query "공동수급체 운영협약서" --index-dir output/search
+"""
+import os
+import re
+import sys
+import json
+import zlib
+import glob
+import math
+import time
+import sqlite3
+import hashlib
+import argparse
+import threading
+import unicodedata
+from collections import Counter
+
+import numpy as np
+
+from utils.firestore_uploader import iter_pages
+
+K1 = 1.2
+B = 0.75
+SNIPPET_CHARS = 60
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize(text):
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def tokenize(text):
+    """
+    형태소 분석 없이 단어(연속된 글자/숫자)마다 글자 바이그램으로 분해
+    - "운영협약서" → 운영, 영협, 협약, 약서 / 한 글자 단어는 그대로 사용
+    - 조사가 붙거나 복합명사로 붙여 써도 공통 바이그램으로 검색됨
+    """
+    tokens = []
+    for word in _WORD_RE.findall(normalize(text)):
+        if len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+# 게시 항목: 페이지 ID(uint32) + 출현 횟수(uint16) = 6바이트
+POSTING_DTYPE = np.dtype([("page", "<u4"), ("tf", "<u2")])
+
+
+def _pack_postings(postings):
+    packed = np.empty(len(postings), dtype=POSTING_DTYPE)
+    packed["page"] = [page for page, _ in postings]
+    packed["tf"] = [min(n, 65535) for _, n in postings]
+    return packed.tobytes()
+
+
+def _starts_cluster(ch):
+    # 결합 문자(악센트), 한글 중성 / 종성 자모, 반각 탁점은 앞 글자와 함께 정규화해야 NFKC 합성 결과가 같음
+    return not (unicodedata.combining(ch) or "\u1160" <= ch <= "\u11ff" or "\ud7b0" <= ch <= "\ud7ff"
+                or ch in "\uff9e\uff9f")
+
+
+def normalize_with_offsets(text):
+    """
+    normalize(text)와 정규화된 글자마다 원문 위치 [start, end) 를 함께 반환
+    - 전각 / 호환 문자처럼 정규화로 길이가 바뀌어도 정규화된 텍스트의 위치를 원문 위치로 되돌릴 수 있음
+    """
+    pieces, starts, ends = [], [], []
+    begin = 0
+    for i in range(1, len(text) + 1):
+        if i < len(text) and not _starts_cluster(text[i]):
+            continue
+        piece = normalize(text[begin:i])
+        pieces.append(piece)
+        starts.extend([begin] * len(piece))
+        ends.extend([i] * len(piece))
+        begin = i
+    return "".join(pieces), starts, ends
+
+
+def _snippet(text, query_words, terms, width=SNIPPET_CHARS):
+    """
+    질의 단어(없으면 바이그램)가 처음 나오는 위치 주변을 잘라 **굵게** 표시
+    - 정규화된 텍스트에서 찾은 위치를 원문 위치로 바꿔서 원문을 자름
+    """
+    lowered, starts, ends = normalize_with_offsets(text)
+    pos, length = -1, 0
+    for needle in sorted(query_words, key=len, reverse=True) + sorted(terms, key=len, reverse=True):
+        pos = lowered.find(needle) if needle else -1
+        if pos >= 0:
+            length = len(needle)
+            break
+    if pos < 0:
+        return text[:width * 2].replace("\n", " ")
+    hit_start, hit_end = starts[pos], ends[pos + length - 1]
+    start, end = max(0, hit_start - width), min(len(text), hit_end + width)
+    snippet = f"{text[start:hit_start]}**{text[hit_start:hit_end]}**{text[hit_end:end]}".replace("\n", " ")
+    return ("…" if start > 0 else "") + snippet + ("…" if end < len(text) else "")
+
+
+class SearchIndex:
+    """
+    페이지 단위 역색인 (SQLite 단일 파일)
+    - 게시 목록은 (바이그램, 문서)마다 한 행: (페이지 ID, 출현 횟수) 배열을 BLOB으로 저장
+      → 질의 시 한 바이그램의 BLOB을 이어 붙여 NumPy 배열 하나로 읽음
+    - 문서 단위로 추가 / 교체 / 삭제 (내용 해시가 같으면 다시 색인하지 않음)
+    - 페이지 길이는 메모리 배열로 들고 있어 질의는 바이그램 수만큼의 조회 + NumPy 연산
+    - 다른 프로세스(CLI)가 색인을 바꾸면 다음 질의에서 자동으로 다시 읽음
+    """
+
+    def __init__(self, index_dir):
+        self.index_dir = index_dir
+        self.path = os.path.join(index_dir, "search_index.sqlite3")
+        self._conn = None
+        self._lock = threading.Lock()
+        self._data_version = None
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(self.index_dir, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS docs ("
+                " id INTEGER PRIMARY KEY, doc_id TEXT UNIQUE NOT NULL, title TEXT,"
+                " content_hash TEXT NOT NULL, first_page INTEGER NOT NULL, page_count INTEGER NOT NULL,"
+                " indexed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                " id INTEGER PRIMARY KEY, doc INTEGER NOT NULL, page_number INTEGER NOT NULL,"
+                " length INTEGER NOT NULL, text BLOB NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS pages_doc ON pages (doc)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS postings ("
+                " term TEXT NOT NULL, doc INTEGER NOT NULL, data BLOB NOT NULL,"
+                " PRIMARY KEY (term, doc)) WITHOUT ROWID"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                self._data_version = None
+
+    # --- 메모리 상의 페이지 통계 ---
+
+    def _load_stats(self, conn):
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version:
+            return
+        rows = np.array(conn.execute("SELECT id, page_number, length FROM pages").fetchall(),
+                        dtype=np.int64).reshape(-1, 3)
+        size = int(rows[:, 0].max()) + 1 if len(rows) else 1
+        self._page_len = np.zeros(size, dtype=np.float32)
+        self._page_no = np.zeros(size, dtype=np.int64)
+        self._page_len[rows[:, 0]] = rows[:, 2]
+        self._page_no[rows[:, 0]] = rows[:, 1]
+        self._page_total = len(rows)
+        self._avg_len = float(rows[:, 2].mean()) if len(rows) else 0.0
+        self._data_version = version
+
+    def _invalidate(self):
+        # 이 연결에서 쓴 변경은 data_version에 반영되지 않으므로 직접 무효화
+        self._data_version = None
+
+    # --- 색인 ---
+
+    def add_document(self, doc_id, json_data, title=None):
+        """
+        결과 JSON(app.py 리스트 형식 / hybrid_extract 딕셔너리 형식) 한 건을 색인
+        - 이미 같은 내용으로 색인된 문서면 건너뛰고 False 반환
+        """
+        pages = [(p["page_number"], p.get("text") or "") for p in iter_pages(json_data)]
+        content_hash = hashlib.sha256(
+            json.dumps(pages, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT content_hash FROM docs WHERE doc_id = ?", (doc_id,)).fetchone()
+            if row is not None and row[0] == content_hash:
+                return False
+
+            with conn:
+                self._delete(conn, doc_id)
+                # 페이지 ID는 계속 증가 (삭제된 문서의 ID는 재사용하지 않음)
+                first_page = (conn.execute("SELECT MAX(id) FROM pages").fetchone()[0] or 0) + 1
+                postings = {}
+                page_rows = []
+                for index, (page_number, text) in enumerate(pages):
+                    counts = Counter(tokenize(text))
+                    for term, count in counts.items():
+                        postings.setdefault(term, []).append((first_page + index, count))
+                    page_rows.append((page_number, sum(counts.values()), zlib.compress(text.encode("utf-8"))))
+
+                cur = conn.execute(
+                    "INSERT INTO docs (doc_id, title, content_hash, first_page, page_count, indexed_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (doc_id, title or json_data.get("pdf_path"), content_hash, first_page, len(pages), time.time()),
+                )
+                doc = cur.lastrowid
+                conn.executemany(
+                    "INSERT INTO pages (id, doc, page_number, length, text) VALUES (?, ?, ?, ?, ?)",
+                    [(first_page + i, doc, *page_row) for i, page_row in enumerate(page_rows)],
+                )
+                conn.executemany(
+                    "INSERT INTO postings (term, doc, data) VALUES (?, ?, ?)",
+                    [(term, doc, _pack_postings(items)) for term, items in postings.items()],
+                )
+            self._invalidate()
+            return True
+
+    def add_file(self, json_path, doc_id=None):
+        """
+        결과 JSON 파일 색인 (doc_id 기본값: 파일 이름) - pages가 없는 JSON(매니페스트 등)은 건너뜀
+        """
+        with open(json_path, "r", encoding="utf-8") as f:
+            json_data = json.load(f)
+        if not isinstance(json_data, dict) or "pages" not in json_data:
+            return False
+        return self.add_document(doc_id or os.path.splitext(os.path.basename(json_path))[0], json_data)
+
+    def _delete(self, conn, doc_id):
+        row = conn.execute("SELECT id FROM docs WHERE doc_id = ?", (doc_id,)).fetchone()
+        if row is None:
+            return False
+        conn.execute("DELETE FROM postings WHERE doc = ?", row)
+        conn.execute("DELETE FROM pages WHERE doc = ?", row)
+        conn.execute("DELETE FROM docs WHERE id = ?", row)
+        return True
+
+    def remove_document(self, doc_id):
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                removed = self._delete(conn, doc_id)
+            self._invalidate()
+            return removed
+
+    def stats(self):
+        with self._lock:
+            conn = self._connect()
+            docs, = conn.execute("SELECT COUNT(*) FROM docs").fetchone()
+            pages, = conn.execute("SELECT COUNT(*) FROM pages").fetchone()
+            terms, = conn.execute("SELECT COUNT(DISTINCT term) FROM postings").fetchone()
+        size = sum(os.path.getsize(p) for p in glob.glob(self.path + "*"))
+        return {"documents": docs, "pages": pages, "terms": terms, "bytes": size}
+
+    # --- 검색 ---
+
+    def search(self, query, limit=20):
+        """
+        BM25 점수 순으로 페이지 단위 검색 결과 반환
+        - [{"doc_id", "title", "page_number", "score", "snippet"}, ...]
+        """
+        terms = Counter(tokenize(query))
+        if not terms:
+            return []
+
+        with self._lock:
+            conn = self._connect()
+            self._load_stats(conn)
+            if not self._page_total:
+                return []
+
+            scores = np.zeros(len(self._page_len), dtype=np.float32)
+            norm = K1 * (1 - B + B * self._page_len / max(self._avg_len, 1e-9))
+            for term, query_tf in terms.items():
+                rows = conn.execute("SELECT data FROM postings WHERE term = ?", (term,)).fetchall()
+                if not rows:
+                    continue
+                postings = np.frombuffer(b"".join(row[0] for row in rows), dtype=POSTING_DTYPE)
+                ids, tf = postings["page"].astype(np.int64), postings["tf"].astype(np.float32)
+                df = len(ids)
+                idf = math.log(1 + (self._page_total - df + 0.5) / (df + 0.5))
+                scores[ids] += query_tf * idf * tf * (K1 + 1) / (tf + norm[ids])
+
+            hits = np.flatnonzero(scores)
+            if not len(hits):
+                return []
+            if len(hits) > limit:
+                hits = hits[np.argpartition(scores[hits], -limit)[-limit:]]
+            hits = hits[np.argsort(-scores[hits], kind="stable")]
+
+            placeholders = ",".join("?" * len(hits))
+            rows = {
+                page: (doc_id, title, zlib.decompress(text).decode("utf-8"))
+                for page, doc_id, title, text in conn.execute(
+                    f"SELECT pages.id, docs.doc_id, docs.title, pages.text FROM pages"
+                    f" JOIN docs ON docs.id = pages.doc WHERE pages.id IN ({placeholders})",
+                    [int(h) for h in hits],
+                )
+            }
+
+        words = _WORD_RE.findall(normalize(query))
+        results = []
+        for page in hits:
+            doc_id, title, text = rows[int(page)]
+            results.append({
+                "doc_id": doc_id,
+                "title": title,
+                "page_number": int(self._page_no[page]),
+                "score": round(float(scores[page]), 4),
+                "snippet": _snippet(text, words, list(terms)),
+            })
+        return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="추출 결과 JSON 전문 검색 색인")
+    parser.add_argument("--index-dir", default=os.path.join("output", "search"))
+    sub = parser.add_subparsers(dest="command", required=True)
+    add = sub.add_parser("add", help="결과 JSON 색인 (파일 / glob 패턴)")
+    add.add_argument("paths", nargs="+")
+    query = sub.add_parser("query", help="검색")
+    query.add_argument("text")
+    query.add_argument("--limit", type=int, default=10)
+    sub.add_parser("stats", help="색인 통계")
+    args = parser.parse_args(argv)
+
+    index = SearchIndex(args.index_dir)
+    try:
+        if args.command == "add":
+            paths = sorted({p for pattern in args.paths for p in glob.glob(pattern, recursive=True)})
+            added = sum(index.add_file(p) for p in paths if p.endswith(".json"))
+            print(f"색인 {added}건 (변경 없음 {len(paths) - added}건)")
+        elif args.command == "query":
+            started = time.perf_counter()
+            hits = index.search(args.text, args.limit)
+            print(f"{len(hits)}건 ({(time.perf_counter() - started) * 1000:.1f} ms)")
+            for hit in hits:
+                print(f"  {hit['score']:7.3f}  {hit['doc_id']} p.{hit['page_number']}  {hit['snippet']}")
+        else:
+            print(json.dumps(index.stats(), ensure_ascii=False, indent=2))
+    finally:
+        index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
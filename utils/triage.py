@@ -0,0 +1,95 @@
+import numpy as np
+import fitz  # PyMuPDF
+
+THUMB_DPI = 24               # A4 기준 약 200 x 280 px
+THUMB_MARGIN = 0.03          # 스캔 가장자리 그림자 / 펀치 구멍 제외 비율
+INK_CONTRAST = 32            # 배경(중앙값)보다 이만큼 어두운 픽셀을 잉크로 봄
+BLANK_INK_RATIO = 0.0005     # 잉크 비율이 이보다 작으면 빈 페이지
+MIN_VALID_RATIO = 0.7        # 정상 문자 비율이 이보다 낮으면 깨진 텍스트 레이어
+MAX_REPLACEMENT_RATIO = 0.02
+MAX_HANJA_ONLY_RATIO = 0.5   # 한글 / 가나 없이 한자만 가득한 텍스트 (CID 매핑이 깨진 한글 글꼴의 전형적인 증상)
+
+# 정상 문자 범위 (시작점 순으로 정렬, 겹치지 않음) - 한글 음절 / 호환 자모, ASCII, 라틴 악센트 문자, 일반 구두점,
+# 한자, 가나, 전각 / 반각 기호, 원문자 등
+_VALID_RANGES = np.array([
+    (0x20, 0x7E), (0xA0, 0x17F),
+    (0x2010, 0x206F), (0x2100, 0x22FF), (0x2460, 0x24FF), (0x2500, 0x25FF),
+    (0x3000, 0x30FF), (0x3131, 0x318E), (0x3200, 0x32FF), (0x3400, 0x4DBF), (0x4E00, 0x9FFF),
+    (0xAC00, 0xD7A3), (0xF900, 0xFAFF), (0xFF01, 0xFF5E), (0xFF65, 0xFF9F),
+], dtype=np.uint32)
+_HANGUL = (0xAC00, 0xD7A3)
+_HANJA = (0x4E00, 0x9FFF)
+_KANA = (0x3040, 0x30FF)
+_REPLACEMENT = 0xFFFD
+
+
+def _in_range(codes, low, high):
+    return (codes >= low) & (codes <= high)
+
+
+def text_quality(text):
+    """
+    텍스트 레이어 품질 지표 (코드포인트 배열을 NumPy로 한 번에 분류)
+    - valid_ratio: 정상 문자 범위 비율, hangul_ratio: 한글 음절 비율, hanja_ratio: 한자 비율,
+      replacement_ratio: U+FFFD 비율 (공백 제외 기준)
+    - garbled: 정상 문자 비율이 낮거나, U+FFFD가 많거나, 한글 / 가나 없이 한자만 가득하면 True
+    """
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype="<u4")
+    codes = codes[(codes != 0x20) & (codes != 0x0A) & (codes != 0x09) & (codes != 0x0D)]
+    if not len(codes):
+        return {"valid_ratio": 1.0, "hangul_ratio": 0.0, "hanja_ratio": 0.0, "replacement_ratio": 0.0,
+                "garbled": False}
+    # 범위 시작점 기준 searchsorted로 각 문자가 속할 수 있는 범위를 찾아 끝점과 비교
+    slot = np.searchsorted(_VALID_RANGES[:, 0], codes, side="right") - 1
+    valid = (slot >= 0) & (codes <= _VALID_RANGES[np.maximum(slot, 0), 1])
+    n = len(codes)
+    quality = {
+        "valid_ratio": float(valid.sum()) / n,
+        "hangul_ratio": float(_in_range(codes, *_HANGUL).sum()) / n,
+        "hanja_ratio": float(_in_range(codes, *_HANJA).sum()) / n,
+        "replacement_ratio": float((codes == _REPLACEMENT).sum()) / n,
+    }
+    quality["garbled"] = bool(
+        quality["valid_ratio"] < MIN_VALID_RATIO
+        or quality["replacement_ratio"] > MAX_REPLACEMENT_RATIO
+        or (quality["hanja_ratio"] > MAX_HANJA_ONLY_RATIO and quality["hangul_ratio"] == 0
+            and not _in_range(codes, *_KANA).any())
+    )
+    return quality
+
+
+def ink_coverage(page, thumb_dpi=THUMB_DPI):
+    """
+    작은 흑백 썸네일에서 잉크(배경보다 충분히 어두운 픽셀) 비율 추정
+    - 배경 밝기는 중앙값으로 잡아 누렇거나 어두운 스캔 배경에도 동작
+    - 가장자리 THUMB_MARGIN은 제외 (스캔 테두리 그림자)
+    """
+    pix = page.get_pixmap(matrix=fitz.Matrix(thumb_dpi / 72, thumb_dpi / 72), colorspace=fitz.csGRAY, alpha=False)
+    gray = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.stride)[:, :pix.width]
+    dy, dx = int(pix.height * THUMB_MARGIN), int(pix.width * THUMB_MARGIN)
+    gray = gray[dy:pix.height - dy, dx:pix.width - dx]
+    if not gray.size:
+        return 0.0
+    background = int(np.median(gray))
+    return float((gray < background - INK_CONTRAST).mean())
+
+
+def triage_page(page, text, min_chars):
+    """
+    렌더링 / OCR 전에 페이지 처리 방식을 결정 → {"decision", "reason", 지표...}
+    - 텍스트 레이어가 충분하면 품질만 검사: 정상 → "text", 깨짐 → "ocr" (reason="garbled_text")
+    - 텍스트 레이어가 부족하면 썸네일 잉크 비율 검사: 거의 없음 → "blank" (렌더링 / OCR 생략), 있으면 "ocr"
+    - 판정 시간은 결과에 넣지 않음 (실행마다 달라지므로 호출하는 쪽의 "triage" 단계 시간으로 기록)
+    """
+    stripped = text.strip()
+    if len(stripped) >= min_chars:
+        quality = text_quality(stripped)
+        garbled = quality.pop("garbled")
+        result = {"decision": "ocr" if garbled else "text", "reason": "garbled_text" if garbled else "text_layer",
+                  **{k: round(v, 4) for k, v in quality.items()}}
+    else:
+        ink = ink_coverage(page)
+        blank = ink < BLANK_INK_RATIO
+        result = {"decision": "blank" if blank else "ocr", "reason": "no_ink" if blank else "no_text_layer",
+                  "ink_ratio": round(ink, 5)}
+    return result